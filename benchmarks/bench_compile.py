@@ -0,0 +1,186 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Headless compile/render benchmarks for TextualBuilder.
+
+Runs synthetic pages (see pages.py) inside Textual's headless run_test()
+pilot and measures, per scenario (median of --repeat runs, in milliseconds):
+
+    build   - recipe: building the page Bag
+    compile - TextualBuilder.compile(): widget creation and mount requests
+    mount   - until Textual has processed all pending mounts
+    paint   - until the next screen refresh (time to first paint)
+
+Usage:
+    python benchmarks/bench_compile.py
+    python benchmarks/bench_compile.py -s wide -s tabs --size tabs=200
+    python benchmarks/bench_compile.py -o results.json
+    python benchmarks/bench_compile.py --save-baseline
+    python benchmarks/bench_compile.py --baseline benchmarks/baseline.json \\
+        --threshold 0.25 --metric-threshold paint=0.5
+
+With --baseline the exit status is 1 if any metric is slower than baseline
+by more than its threshold (relative) and by more than --min-delta ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from genro_bag import Bag
+from pages import SCENARIOS
+
+from genro_pygui import TextualApp, TextualBuilder
+from genro_pygui.textual_app import TextualWrapperApp
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+METRICS = ("build", "compile", "mount", "paint")
+
+
+class BenchApp(TextualApp):
+    """Empty app: the benchmark page is compiled explicitly once running."""
+
+
+async def measure(scenario: str, size: int) -> dict[str, float]:
+    """Run one scenario once and return its timings in milliseconds."""
+    recipe, _ = SCENARIOS[scenario]
+    owner = BenchApp()
+    textual_app = TextualWrapperApp(owner)
+    owner._textual_app = textual_app
+
+    async with textual_app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+
+        t0 = time.perf_counter()
+        page = Bag(builder=TextualBuilder)
+        recipe(page, size)
+        t1 = time.perf_counter()
+        owner._page = page
+        page.builder.compile(page, textual_app.root)
+        t2 = time.perf_counter()
+        await pilot.pause()
+        t3 = time.perf_counter()
+        painted = asyncio.Event()
+        textual_app.call_after_refresh(painted.set)
+        await painted.wait()
+        t4 = time.perf_counter()
+
+    return {
+        "build": (t1 - t0) * 1000,
+        "compile": (t2 - t1) * 1000,
+        "mount": (t3 - t2) * 1000,
+        "paint": (t4 - t3) * 1000,
+    }
+
+
+async def run_suite(scenarios: list[str], sizes: dict[str, int], repeat: int) -> dict[str, Any]:
+    """Run every scenario repeat times and keep the median of each metric."""
+    results: dict[str, Any] = {}
+    for scenario in scenarios:
+        size = sizes.get(scenario, SCENARIOS[scenario][1])
+        runs = [await measure(scenario, size) for _ in range(repeat)]
+        results[scenario] = {"size": size}
+        for metric in METRICS:
+            results[scenario][metric] = round(statistics.median(r[metric] for r in runs), 3)
+    return results
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    metric_thresholds: dict[str, float],
+    min_delta: float,
+) -> list[str]:
+    """Return a line per metric slower than baseline beyond its threshold."""
+    regressions = []
+    for scenario, current in results.items():
+        reference = baseline.get(scenario)
+        if reference is None or reference.get("size") != current["size"]:
+            continue
+        for metric in METRICS:
+            old, new = reference.get(metric), current[metric]
+            if not old:
+                continue
+            limit = metric_thresholds.get(metric, threshold)
+            if new - old > min_delta and (new - old) / old > limit:
+                regressions.append(
+                    f"{scenario}.{metric}: {old:.2f} -> {new:.2f} ms "
+                    f"(+{(new - old) / old:.0%}, limit {limit:.0%})"
+                )
+    return regressions
+
+
+def _parse_pairs(pairs: list[str], cast: type) -> dict[str, Any]:
+    """Parse name=value options."""
+    parsed = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        parsed[name] = cast(value)
+    return parsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TextualBuilder compile/render benchmarks")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--size", action="append", default=[], help="scenario=size")
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="compare against this baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write {BASELINE_FILE}")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio")
+    parser.add_argument(
+        "--metric-threshold", action="append", default=[], help="metric=ratio override"
+    )
+    parser.add_argument("--min-delta", type=float, default=1.0, help="ignore deltas below ms")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or list(SCENARIOS)
+    results = asyncio.run(run_suite(scenarios, _parse_pairs(args.size, int), args.repeat))
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "textual": _textual_version(),
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+    if args.save_baseline:
+        BASELINE_FILE.write_text(text + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        regressions = compare(
+            results,
+            baseline,
+            args.threshold,
+            _parse_pairs(args.metric_threshold, float),
+            args.min_delta,
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+def _textual_version() -> str:
+    from importlib.metadata import version
+
+    return version("textual")
+
+
+if __name__ == "__main__":
+    main()
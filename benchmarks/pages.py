@@ -0,0 +1,56 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Synthetic page recipes for the compile/render benchmarks.
+
+Each recipe takes the page root and a size and builds a page stressing one
+dimension of TextualBuilder.compile().
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from genro_bag import Bag
+
+
+def wide_page(root: Bag, size: int) -> None:
+    """size sibling widgets directly under the root."""
+    for i in range(size):
+        if i % 2:
+            root.button(f"Button {i}")
+        else:
+            root.static(f"Static {i}")
+
+
+def deep_page(root: Bag, size: int) -> None:
+    """size nested vertical containers, one static per level."""
+    current = root
+    for i in range(size):
+        current = current.vertical()
+        current.static(f"Level {i}")
+
+
+def datatable_page(root: Bag, size: int) -> None:
+    """One DataTable with 5 columns and size rows."""
+    table = root.datatable()
+    for name in ("id", "name", "city", "amount", "status"):
+        table.column(name)
+    for i in range(size):
+        table.row([str(i), f"name {i}", f"city {i % 50}", f"{i * 1.5:.2f}", "ok"])
+
+
+def tabs_page(root: Bag, size: int) -> None:
+    """One TabbedContent with size panes, three widgets per pane."""
+    tabs = root.tabbedcontent()
+    for i in range(size):
+        pane = tabs.tabpane(title=f"Tab {i}")
+        pane.static(f"Pane {i}")
+        pane.input(placeholder=f"field {i}")
+        pane.button(f"Save {i}")
+
+
+SCENARIOS: dict[str, tuple[Callable[[Bag, int], None], int]] = {
+    "wide": (wide_page, 1000),
+    "deep": (deep_page, 40),
+    "datatable": (datatable_page, 1000),
+    "tabs": (tabs_page, 50),
+}
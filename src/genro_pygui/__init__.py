@@ -1,8 +1,29 @@
 # Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
 """Terminal UI for Genro Bag visualization and interaction."""
 
-from genro_pygui.remote import connect
-from genro_pygui.textual_app import TextualApp
-from genro_pygui.textual_builder import TextualBuilder
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from genro_pygui.remote import connect
+    from genro_pygui.textual_app import TextualApp
+    from genro_pygui.textual_builder import TextualBuilder
 
 __all__ = ["TextualApp", "TextualBuilder", "connect"]
+
+# Exports are resolved lazily so that light entry points (CLI, warm client,
+# remote clients) do not pay the Textual import cost.
+_EXPORTS = {
+    "TextualApp": "genro_pygui.textual_app",
+    "TextualBuilder": "genro_pygui.textual_builder",
+    "connect": "genro_pygui.remote",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'genro_pygui' has no attribute '{name}'")
+    return getattr(import_module(module_name), name)
@@ -0,0 +1,452 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""BagTree - a Textual Tree over a Bag hierarchy, populated on demand.
+
+    root.bagtree("^.catalog", label="Catalog", page_size=200)
+
+Only what is on screen exists as tree nodes:
+
+    - a branch is materialized when it is opened, page_size children at a
+      time; a trailing "… N more" node loads the next page when it is
+      reached with the cursor or selected
+    - collapsing a branch releases its children (release_collapsed=False
+      keeps them), so memory is bounded by the open branches, not by the
+      size of the Bag
+    - nodes with a resolver are evaluated on a ResolverPool (the app's,
+      see resolver_pool.py) as soon as they are shown, with a "…"
+      placeholder until the value arrives; values are cached by the pool,
+      and invalidated when the node changes. With resolve_visible=False
+      they are shown as closed branches, resolved when opened
+
+A Bag with millions of nodes therefore opens in O(page_size). Changes to the
+source Bag refresh only the loaded branch that contains them; assigning a new
+Bag to source (or rebinding its data path) resets the tree.
+
+search filters the tree through a BagSearchIndex built in the background on
+the first query; matches are listed flat, by path, page by page:
+
+    root.input(value="^.query")
+    root.bagtree("^.catalog", search="^.query")
+
+A filtered view is recomputed when the query changes and once the index has
+finished building.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from genro_bag import Bag
+from rich.text import Text
+from textual.widgets import Tree
+from textual.widgets.tree import UnknownNodeID
+
+from genro_pygui.resolver_pool import ResolverPool, shared_pool
+from genro_pygui.search_index import BagSearchIndex
+
+if TYPE_CHECKING:
+    from genro_bag.bagnode import BagNode
+    from textual.widgets.tree import TreeNode
+
+DEFAULT_PAGE_SIZE = 200
+VALUE_WIDTH = 60
+
+
+class _More:
+    """Data of the "… N more" node closing a partially loaded branch."""
+
+    __slots__ = ("offset",)
+
+    def __init__(self, offset: int) -> None:
+        self.offset = offset
+
+
+class _Loading:
+    """Data of the placeholder shown while a resolver runs."""
+
+    __slots__ = ()
+
+
+_LOADING = _Loading()
+
+
+class BagTree(Tree):
+    """Tree over a Bag, materialized one page per branch as branches open."""
+
+    def __init__(
+        self,
+        source: Bag | None = None,
+        label: str = "",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        label_attr: str | None = None,
+        show_values: bool = True,
+        release_collapsed: bool = True,
+        search: str = "",
+        resolve_visible: bool = True,
+        *,
+        resolvers: ResolverPool | None = None,
+        name: str | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+        disabled: bool = False,
+    ) -> None:
+        if page_size <= 0:
+            raise ValueError(f"page_size must be positive, got {page_size}")
+        super().__init__(Text(label), name=name, id=id, classes=classes, disabled=disabled)
+        self.page_size = page_size
+        self.label_attr = label_attr
+        self.show_values = show_values
+        self.release_collapsed = release_collapsed
+        self.resolve_visible = resolve_visible
+        self.resolvers = resolvers if resolvers is not None else shared_pool()
+        # id(bag node) -> tree node waiting for its resolver
+        self._waiting: dict[int, TreeNode] = {}
+        self._source: Bag | None = None
+        # id(bag) -> tree node whose children show that Bag (loaded branches only)
+        self._branches: dict[int, TreeNode] = {}
+        self._stale: dict[int, TreeNode] = {}
+        self._subscription = f"_bagtree_{hex(object.__hash__(self))}"
+        self._label = label
+        # Search: index built on first query, matches as a flat list of entry ids
+        self._search = (search or "").strip()
+        self._index: BagSearchIndex | None = None
+        self._matches: list[int] | None = None
+        self._query_gen = 0
+        self.source = source
+
+    # -------------------------------------------------------------------------
+    # Source
+    # -------------------------------------------------------------------------
+
+    @property
+    def source(self) -> Bag | None:
+        """The Bag shown by the tree; assigning a new one resets the tree."""
+        return self._source
+
+    @source.setter
+    def source(self, source: Bag | None) -> None:
+        if not isinstance(source, Bag):
+            source = None
+        if source is self._source:
+            return
+        if self._source is not None:
+            self._source.unsubscribe(self._subscription, any=True)
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        self._source = source
+        self._matches = None
+        if source is not None:
+            source.subscribe(self._subscription, any=self._on_source_change)
+        self._show_source()
+        if self._search and self.is_mounted:
+            self._run_search()
+
+    def _show_source(self) -> None:
+        """Show the source Bag from its first level (no search)."""
+        self._branches.clear()
+        self._stale.clear()
+        self.clear()
+        self.root.set_label(Text(self._label))
+        if self._source is None:
+            return
+        self._load(self.root, self._source, 0)
+        self.root.expand()
+
+    def on_mount(self) -> None:
+        if self._search:
+            self._run_search()
+
+    def on_unmount(self) -> None:
+        if self._source is not None:
+            self._source.unsubscribe(self._subscription, any=True)
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    @property
+    def search(self) -> str:
+        """Query filtering the tree (see search_index.py); "" shows the whole Bag."""
+        return self._search
+
+    @search.setter
+    def search(self, query: str | None) -> None:
+        query = (query or "").strip()
+        if query == self._search:
+            return
+        self._search = query
+        if self.is_mounted:
+            self._run_search()
+
+    def _run_search(self) -> None:
+        """Query the index in a worker thread; the last query wins."""
+        self._query_gen += 1
+        if not self._search or self._source is None:
+            if self._matches is not None:
+                self._matches = None
+                self._show_source()
+            return
+        if self._index is None:
+            self._index = BagSearchIndex(self._source)
+            # A build finita si rilancia la query: i risultati parziali si completano
+            self._index.on_ready = lambda: self.app.call_from_thread(self._run_search)
+            self._index.start()
+
+        index = self._index
+        query = self._search
+        generation = self._query_gen
+
+        def work() -> None:
+            eids = index.search_ids(query)
+            self.app.call_from_thread(self._show_matches, generation, eids)
+
+        self.run_worker(work, thread=True, group="bagtree_search", exit_on_error=False)
+
+    def _show_matches(self, generation: int, eids: list[int]) -> None:
+        if generation != self._query_gen or self._index is None:
+            return
+        self._matches = eids
+        self._branches.clear()
+        self._stale.clear()
+        self.clear()
+        self.root.set_label(
+            Text.assemble(self._label, (f"  {len(eids):,} matches", "dim italic"))
+        )
+        self._load_matches(0)
+        self.root.expand()
+
+    def _load_matches(self, offset: int) -> None:
+        """Add a page of search results (labelled with their path) under the root."""
+        eids = self._matches
+        stop = min(offset + self.page_size, len(eids))
+        index = self._index
+        for bag_node in index.nodes(eids[offset:stop]):
+            self._add_bag_node(self.root, bag_node, self.node_label(bag_node, index.path(bag_node)))
+        remaining = len(eids) - stop
+        if remaining > 0:
+            self.root.add_leaf(Text(f"… {remaining:,} more", style="dim italic"), _More(stop))
+
+    # -------------------------------------------------------------------------
+    # Materialization
+    # -------------------------------------------------------------------------
+
+    def node_label(self, bag_node: BagNode, label: str | None = None) -> Text:
+        """Label of the tree node showing bag_node (override to customize)."""
+        if label is None:
+            label = bag_node.label
+        if self.label_attr is not None:
+            label = str(bag_node.attr.get(self.label_attr, label))
+        if bag_node.resolver is not None:
+            return Text(label)
+        return self._value_label(Text(label), bag_node.get_value(static=True))
+
+    def _value_label(self, label: Text, value: Any) -> Text:
+        if isinstance(value, Bag) or not self.show_values:
+            return label
+        text = repr(value) if isinstance(value, str) else str(value)
+        if len(text) > VALUE_WIDTH:
+            text = f"{text[: VALUE_WIDTH - 1]}…"
+        return Text.assemble(label, (" = ", "dim"), text)
+
+    def _load(self, tree_node: TreeNode, bag: Bag, offset: int) -> None:
+        """Add the page of bag's children starting at offset under tree_node."""
+        self._branches[id(bag)] = tree_node
+        # bag.nodes copia l'intera lista: si accede per indice al contenitore
+        nodes = bag._nodes
+        stop = min(offset + self.page_size, len(bag))
+        for i in range(offset, stop):
+            bag_node = nodes[i]
+            self._add_bag_node(tree_node, bag_node, self.node_label(bag_node))
+        remaining = len(bag) - stop
+        if remaining > 0:
+            tree_node.add_leaf(Text(f"… {remaining:,} more", style="dim italic"), _More(stop))
+
+    def _add_bag_node(self, tree_node: TreeNode, bag_node: BagNode, label: Text) -> None:
+        if bag_node.resolver is not None:
+            child = tree_node.add(label, bag_node)
+            if self.resolve_visible:
+                self._resolve(child, bag_node)
+        elif isinstance(bag_node.get_value(static=True), Bag):
+            tree_node.add(label, bag_node)
+        else:
+            tree_node.add_leaf(label, bag_node)
+
+    def _release(self, tree_node: TreeNode) -> None:
+        """Drop the children of tree_node and forget it and the branches below it."""
+        released = {tree_node}
+        stack = list(tree_node.children)
+        while stack:
+            child = stack.pop()
+            if child.children:
+                released.add(child)
+                stack.extend(child.children)
+        # Per tree node e non per Bag: il valore del nodo può essere già cambiato
+        for bag_id in [k for k, v in self._branches.items() if v in released]:
+            del self._branches[bag_id]
+            self._stale.pop(bag_id, None)
+        tree_node.remove_children()
+
+    def _branch_bag(self, tree_node: TreeNode) -> Bag | None:
+        """Bag whose children tree_node shows, None if not loaded yet."""
+        if tree_node is self.root:
+            return self._source
+        bag_node = tree_node.data
+        if isinstance(bag_node, (_More, _Loading)) or bag_node is None:
+            return None
+        if bag_node.resolver is not None:
+            value = self.resolvers.cached(bag_node)[1]
+        else:
+            value = bag_node.get_value(static=True)
+        return value if isinstance(value, Bag) else None
+
+    def _load_more(self, tree_node: TreeNode) -> None:
+        """Replace a "… N more" node with the next page."""
+        parent = tree_node.parent
+        if parent is self.root and self._matches is not None:
+            offset = tree_node.data.offset
+            tree_node.data = None
+            tree_node.remove()
+            self._load_matches(offset)
+            return
+        bag = self._branch_bag(parent) if parent is not None else None
+        if bag is None:
+            return
+        offset = tree_node.data.offset
+        # Highlighted e Selected arrivano entrambi: il nodo va consumato una volta
+        tree_node.data = None
+        tree_node.remove()
+        self._load(parent, bag, offset)
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        tree_node = event.node
+        if event.control is not self or tree_node.children or tree_node is self.root:
+            return
+        bag_node = tree_node.data
+        if bag_node is None or isinstance(bag_node, (_More, _Loading)):
+            return
+        if bag_node.resolver is not None:
+            if id(bag_node) in self._waiting:
+                # Valutazione già in corso: il ramo si riempie all'arrivo
+                tree_node.add_leaf(Text("loading…", style="dim italic"), _LOADING)
+            else:
+                self._resolve(tree_node, bag_node)
+            return
+        value = bag_node.get_value(static=True)
+        if isinstance(value, Bag):
+            self._load(tree_node, value, 0)
+
+    def on_tree_node_collapsed(self, event: Tree.NodeCollapsed) -> None:
+        tree_node = event.node
+        if event.control is not self or not self.release_collapsed or tree_node is self.root:
+            return
+        if any(isinstance(child.data, _Loading) for child in tree_node.children):
+            return
+        self._release(tree_node)
+
+    def on_tree_node_highlighted(self, event: Tree.NodeHighlighted) -> None:
+        if event.control is self and isinstance(event.node.data, _More):
+            self._load_more(event.node)
+
+    def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
+        if event.control is self and isinstance(event.node.data, _More):
+            self._load_more(event.node)
+
+    # -------------------------------------------------------------------------
+    # Resolvers
+    # -------------------------------------------------------------------------
+
+    def _resolve(self, tree_node: TreeNode, bag_node: BagNode) -> None:
+        """Get bag_node's value from the resolver pool, then update tree_node."""
+        ready, value = self.resolvers.resolve(bag_node, self._on_resolved)
+        if ready:
+            self._resolved(tree_node, bag_node, value)
+            return
+        self._waiting[id(bag_node)] = tree_node
+        if tree_node.is_expanded:
+            tree_node.add_leaf(Text("loading…", style="dim italic"), _LOADING)
+        else:
+            tree_node.set_label(Text.assemble(self.node_label(bag_node), (" …", "dim")))
+
+    def _on_resolved(self, bag_node: BagNode, value: Any, error: Exception | None) -> None:
+        """ResolverPool callback (worker thread)."""
+        try:
+            self.app.call_from_thread(self._delivered, bag_node, value, error)
+        except RuntimeError:
+            # App già chiusa
+            pass
+
+    def _delivered(self, bag_node: BagNode, value: Any, error: Exception | None) -> None:
+        tree_node = self._waiting.pop(id(bag_node), None)
+        if tree_node is None or not self._is_live(tree_node) or tree_node.data is not bag_node:
+            return
+        if error is not None:
+            self._resolve_failed(tree_node, error)
+        else:
+            self._resolved(tree_node, bag_node, value)
+
+    def _is_live(self, tree_node: TreeNode) -> bool:
+        """True if tree_node is still in this tree (not released or cleared)."""
+        try:
+            return self.get_node_by_id(tree_node.id) is tree_node
+        except UnknownNodeID:
+            return False
+
+    def _resolved(self, tree_node: TreeNode, bag_node: BagNode, value: Any) -> None:
+        tree_node.remove_children()
+        label = self.node_label(bag_node)
+        if isinstance(value, Bag):
+            tree_node.set_label(label)
+            tree_node.allow_expand = True
+            if tree_node.is_expanded:
+                self._load(tree_node, value, 0)
+            return
+        tree_node.allow_expand = False
+        tree_node.set_label(self._value_label(label, value))
+
+    def _resolve_failed(self, tree_node: TreeNode, error: Exception) -> None:
+        tree_node.remove_children()
+        tree_node.set_label(self.node_label(tree_node.data))
+        tree_node.add_leaf(Text(f"⚠ {error}", style="red"), _LOADING)
+
+    # -------------------------------------------------------------------------
+    # Live updates
+    # -------------------------------------------------------------------------
+
+    def _on_source_change(self, node: BagNode, evt: str, **kw: Any) -> None:
+        """Source Bag subscriber: refresh the loaded branch holding node."""
+        # Bag.clear() manda un solo del con la lista dei nodi rimossi
+        nodes = node if isinstance(node, list) else [node]
+        if not nodes:
+            return
+        for changed in nodes:
+            if changed.resolver is not None:
+                self.resolvers.invalidate(changed)
+        parent_bag = nodes[0].parent_bag
+        tree_node = self._branches.get(id(parent_bag)) if parent_bag is not None else None
+        if tree_node is None:
+            return
+        if not self._stale:
+            # Una sola rigenerazione per tutti gli eventi dello stesso giro
+            self.call_later(self._refresh_stale)
+        self._stale[id(parent_bag)] = tree_node
+
+    def _refresh_stale(self) -> None:
+        stale = self._stale
+        self._stale = {}
+        for bag_id, tree_node in stale.items():
+            if self._branches.get(bag_id) is not tree_node:
+                continue
+            bag = self._branch_bag(tree_node)
+            if bag is None:
+                continue
+            loaded = sum(1 for child in tree_node.children if not isinstance(child.data, _More))
+            self._release(tree_node)
+            self._load(tree_node, bag, 0)
+            while loaded > self.page_size and tree_node.children and isinstance(
+                tree_node.children[-1].data, _More
+            ):
+                loaded -= self.page_size
+                self._load_more(tree_node.children[-1])
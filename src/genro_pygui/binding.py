@@ -0,0 +1,385 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Data binding between the page (UI structure) and the data Bag.
+
+Attributes in the recipe can reference the data Bag:
+
+    root.vertical(datapath="cliente")
+        .input(value="^.nome")      # two-way, follows cliente.nome
+        .static("=.titolo")         # read once at compile time
+    .static("==f'{n} pezzi'", n="^.qta")   # formula, see formula.py
+
+Paths are resolved to absolute data paths ONCE, at compile time, using the
+datapath chain of the node's ancestors (see docs/data-binding-architecture.md).
+Bindings are kept in an index keyed by absolute path, so a change in the data
+Bag costs O(bound widgets) property sets instead of a walk of the page:
+
+    - node      : the exact bound path changed      -> _by_path lookup
+    - container : an ancestor of the bound path was
+                  replaced or deleted               -> _by_prefix lookup
+
+While the app runs, affected bindings are handed to the UpdateScheduler and
+applied once per frame (see scheduler.py).
+
+With a ResolverPool (binder.resolvers, set by TextualApp) bound paths that go
+through a resolver are evaluated on the pool instead of the UI thread: the
+widget is created with a placeholder and updated when the value arrives.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from types import CodeType
+from typing import TYPE_CHECKING, Any
+
+from textual.visual import Visual
+
+if TYPE_CHECKING:
+    from genro_bag import Bag
+    from genro_bag.bagnode import BagNode
+    from textual.widget import Widget
+
+    from genro_pygui.formula import Formula, FormulaEngine
+    from genro_pygui.resolver_pool import ResolverPool
+    from genro_pygui.scheduler import UpdateScheduler
+
+TRIGGER = "^"
+VALUE = "="
+FORMULA = "=="
+DATA_ROOT = "#DATA"
+# Mostrato al posto di un valore con resolver in valutazione
+PLACEHOLDER = "…"
+# Proprietà di sola visualizzazione: le altre (value, source...) ricevono None
+PLACEHOLDER_PROPS = frozenset({"content", "label", "renderable"})
+
+
+def resolve_path(path: str, datapath: str = "") -> str:
+    """Resolve a (possibly relative) data path against datapath.
+
+    ".nome" -> "<datapath>.nome", "." -> datapath, "#DATA.x" -> "x",
+    anything else is already absolute.
+    """
+    if path == ".":
+        return datapath
+    if path.startswith("."):
+        return f"{datapath}{path}" if datapath else path[1:]
+    if path == DATA_ROOT:
+        return ""
+    if path.startswith(f"{DATA_ROOT}."):
+        return path[len(DATA_ROOT) + 1 :]
+    return path
+
+
+def parse_binding(value: Any) -> tuple[str, str] | None:
+    """Return (mode, path) for "^path" / "=path" attribute values, else None."""
+    if not isinstance(value, str) or not value or value.startswith(FORMULA):
+        return None
+    if value[0] in (TRIGGER, VALUE):
+        return value[0], value[1:]
+    return None
+
+
+def is_formula(value: Any) -> bool:
+    """True for "==expr" attribute values."""
+    return isinstance(value, str) and value.startswith(FORMULA)
+
+
+def _code_names(code: CodeType) -> set[str]:
+    """Names read by a compiled expression, nested scopes included."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names.update(_code_names(const))
+    return names
+
+
+def set_widget_property(widget: Widget, prop: str, value: Any) -> None:
+    """Set a bound property on a widget (content goes through update())."""
+    if prop == "content" and hasattr(widget, "update"):
+        if value is None:
+            value = ""
+        elif not isinstance(value, (str, Visual)) and not hasattr(value, "__rich_console__"):
+            # Scalari (int, Decimal, date...) mostrati come testo
+            value = str(value)
+        widget.update(value)
+        return
+    if value is None and isinstance(getattr(widget, prop, None), str):
+        value = ""
+    setattr(widget, prop, value)
+
+
+class Binding:
+    """A widget property bound to an absolute data path."""
+
+    __slots__ = ("path", "widget", "prop")
+
+    def __init__(self, path: str, widget: Widget, prop: str) -> None:
+        self.path = path
+        self.widget = widget
+        self.prop = prop
+
+
+class DataBinder:
+    """Index of ^path bindings, updated from the data Bag's events."""
+
+    def __init__(self, data: Bag) -> None:
+        self._data = data
+        self._by_path: dict[str, list[Binding]] = {}
+        self._by_prefix: dict[str, set[str]] = {}
+        self._by_widget: dict[int, list[Binding]] = {}
+        self._formulas_by_widget: dict[int, list[Formula]] = {}
+        self.scheduler: UpdateScheduler | None = None
+        self.formulas: FormulaEngine | None = None
+        self.resolvers: ResolverPool | None = None
+        self._resolved_paths: list[str] = []
+        self._resolved_lock = threading.Lock()
+        data.subscribe("_databinder", any=self._on_data_change)
+
+    def __len__(self) -> int:
+        return sum(len(bindings) for bindings in self._by_widget.values())
+
+    # -------------------------------------------------------------------------
+    # Compile time
+    # -------------------------------------------------------------------------
+
+    def node_datapath(self, node: BagNode) -> str:
+        """Absolute datapath of a page node, cached in node.compiled."""
+        compiled = node.compiled
+        if "datapath" in compiled:
+            return compiled["datapath"]
+
+        parent_node = node.parent_node
+        base = self.node_datapath(parent_node) if parent_node is not None else ""
+        own = node.attr.get("datapath")
+        datapath = resolve_path(own, base) if own else base
+        compiled["datapath"] = datapath
+        return datapath
+
+    def prepare(
+        self,
+        node: BagNode,
+        attr: dict[str, Any],
+        value: Any = None,
+        value_prop: str | None = None,
+    ) -> tuple[dict[str, Any], Any, list[tuple[str, Any]]]:
+        """Replace bound attribute values (and node value) with current data.
+
+        Returns the resolved attributes, the resolved node value and the
+        (prop, absolute path | Formula) pairs to subscribe once the widget
+        exists. Attributes used as formula variables are not bound themselves.
+        """
+        datapath = self.node_datapath(node)
+        formulas = {}
+        if self.formulas is not None:
+            formulas = {key: v[len(FORMULA) :] for key, v in attr.items() if is_formula(v)}
+            if value_prop is not None and is_formula(value):
+                formulas[value_prop] = value[len(FORMULA) :]
+        variables = self._formula_variables(formulas, attr) if formulas else set()
+
+        resolved = {}
+        pending: list[tuple[str, Any]] = []
+        for key, attr_value in attr.items():
+            if key == "datapath" or key in formulas:
+                continue
+            parsed = parse_binding(attr_value)
+            if parsed is None:
+                resolved[key] = attr_value
+                continue
+            mode, path = parsed
+            abs_path = resolve_path(path, datapath)
+            resolved[key] = self._read(abs_path)[1]
+            if mode == TRIGGER and key not in variables:
+                pending.append((key, abs_path))
+
+        parsed = parse_binding(value)
+        if parsed is not None and value_prop is not None:
+            mode, path = parsed
+            abs_path = resolve_path(path, datapath)
+            ready, value = self._read(abs_path)
+            if not ready and value_prop in PLACEHOLDER_PROPS:
+                value = PLACEHOLDER
+            if mode == TRIGGER:
+                pending.append((value_prop, abs_path))
+
+        for prop, expr in formulas.items():
+            formula = self.make_formula(expr, attr, datapath)
+            result = self.formulas.evaluate(formula)
+            if prop == value_prop and is_formula(value):
+                value = result
+            else:
+                resolved[prop] = result
+            pending.append((prop, formula))
+        return resolved, value, pending
+
+    def make_formula(self, expr: str, attr: dict[str, Any], datapath: str) -> Formula:
+        """Create a formula whose variables are the node attributes it uses."""
+        code = self.formulas.compile(expr)
+        variables: dict[str, tuple[str | None, Any]] = {}
+        for name in _code_names(code):
+            if name not in attr or name == "datapath":
+                continue
+            parsed = parse_binding(attr[name])
+            if parsed is None:
+                variables[name] = (None, attr[name])
+            else:
+                mode, path = parsed
+                variables[name] = (mode, resolve_path(path, datapath))
+        return self.formulas.create(expr, variables)
+
+    def _formula_variables(self, formulas: dict[str, str], attr: dict[str, Any]) -> set[str]:
+        """Attribute names referenced by the node's formulas."""
+        names: set[str] = set()
+        for expr in formulas.values():
+            names.update(_code_names(self.formulas.compile(expr)))
+        return names & attr.keys()
+
+    def bind(self, widget: Widget, pending: list[tuple[str, Any]]) -> None:
+        """Register the bindings returned by prepare() for a created widget."""
+        for prop, target in pending:
+            if not isinstance(target, str):
+                target.widget = widget
+                target.prop = prop
+                self.formulas.register(target)
+                self._formulas_by_widget.setdefault(id(widget), []).append(target)
+                continue
+            path = target
+            binding = Binding(path, widget, prop)
+            self._by_path.setdefault(path, []).append(binding)
+            self._by_widget.setdefault(id(widget), []).append(binding)
+            parts = path.split(".")
+            for i in range(1, len(parts)):
+                self._by_prefix.setdefault(".".join(parts[:i]), set()).add(path)
+
+    def unbind(self, widget: Widget) -> None:
+        """Drop all bindings of a widget (called when it is destroyed)."""
+        if self.scheduler is not None:
+            self.scheduler.discard(widget)
+        for formula in self._formulas_by_widget.pop(id(widget), ()):
+            self.formulas.unregister(formula)
+        for binding in self._by_widget.pop(id(widget), ()):
+            bindings = self._by_path.get(binding.path)
+            if bindings is None:
+                continue
+            bindings.remove(binding)
+            if bindings:
+                continue
+            del self._by_path[binding.path]
+            parts = binding.path.split(".")
+            for i in range(1, len(parts)):
+                prefix = ".".join(parts[:i])
+                paths = self._by_prefix.get(prefix)
+                if paths is not None:
+                    paths.discard(binding.path)
+                    if not paths:
+                        del self._by_prefix[prefix]
+
+    # -------------------------------------------------------------------------
+    # Run time
+    # -------------------------------------------------------------------------
+
+    def affected(self, path: str) -> list[Binding]:
+        """Bindings to refresh when the data at path changes."""
+        result = list(self._by_path.get(path, ()))
+        for bound_path in self._by_prefix.get(path, ()):
+            result.extend(self._by_path.get(bound_path, ()))
+        return result
+
+    def _on_data_change(
+        self, node: BagNode, pathlist: list | None, evt: str, reason: Any = None, **kw: Any
+    ) -> None:
+        """Data Bag subscriber: refresh widgets bound to the changed path."""
+        if isinstance(node, list):
+            # Bag.clear(): un solo del con la lista dei nodi rimossi
+            bindings = {}
+            for removed in node:
+                path = ".".join([*(pathlist or []), removed.label])
+                for binding in self.affected(path):
+                    bindings[id(binding)] = binding
+            self._refresh(bindings.values(), reason)
+            return
+        if evt == "upd_attrs" and node.resolver is None:
+            # Gli attributi di un nodo con resolver ne cambiano il valore
+            return
+        if evt in ("ins", "del"):
+            path = ".".join([*(pathlist or []), node.label])
+        else:
+            path = ".".join(pathlist or [])
+        self._refresh(self.affected(path), reason)
+
+    def _refresh(self, bindings: Iterable[Binding], reason: Any) -> None:
+        """Apply bindings now, or mark them for the next frame when running."""
+        scheduler = self.scheduler
+        if scheduler is not None and not scheduler.running:
+            scheduler = None
+        for binding in bindings:
+            if binding.widget is reason:
+                # La modifica arriva da questo widget: evita il loop
+                continue
+            if scheduler is not None:
+                scheduler.mark(binding)
+            else:
+                self.apply(binding)
+
+    def apply(self, binding: Binding) -> None:
+        """Push the current data value into a bound widget property.
+
+        A value still being resolved leaves the widget as it is: it is applied
+        again when the resolver completes.
+        """
+        ready, value = self._read(binding.path)
+        if ready:
+            set_widget_property(binding.widget, binding.prop, value)
+
+    # -------------------------------------------------------------------------
+    # Resolvers
+    # -------------------------------------------------------------------------
+
+    def _read(self, path: str) -> tuple[bool, Any]:
+        """(ready, value) at path; resolvers go to the pool when there is one."""
+        if self.resolvers is None:
+            return True, self._data[path]
+        return self.resolvers.read(self._data, path, self._on_resolved)
+
+    def _on_resolved(self, node: BagNode, value: Any, error: Exception | None) -> None:
+        """ResolverPool callback (worker thread): queue the node's data path."""
+        labels = []
+        while node is not None and node.parent_bag is not None:
+            labels.append(node.label)
+            if node.parent_bag is self._data:
+                break
+            node = node.parent_bag.parent_node
+        else:
+            # Nodo non più nella Bag dei dati
+            return
+        with self._resolved_lock:
+            self._resolved_paths.append(".".join(reversed(labels)))
+
+    def drain_resolved(self) -> int:
+        """Refresh bindings whose resolver completed (scheduler source, UI thread)."""
+        with self._resolved_lock:
+            if not self._resolved_paths:
+                return 0
+            paths = self._resolved_paths
+            self._resolved_paths = []
+        scheduler = self.scheduler
+        if scheduler is not None and not scheduler.running:
+            scheduler = None
+        count = 0
+        for path in dict.fromkeys(paths):
+            for binding in self.affected(path):
+                count += 1
+                if scheduler is not None:
+                    scheduler.mark(binding)
+                else:
+                    self.apply(binding)
+        return count
+
+    def widget_changed(self, widget: Widget, prop: str, value: Any) -> None:
+        """Write a user edit back to the data Bag (two-way bindings)."""
+        for binding in self._by_widget.get(id(widget), ()):
+            if binding.prop != prop:
+                continue
+            ready, current = self._read(binding.path)
+            if ready and current == value:
+                continue
+            self._data.set_item(binding.path, value, _reason=widget)
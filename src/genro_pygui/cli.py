@@ -4,15 +4,22 @@
 Usage:
     pygui run examples/basic/hello_world.py
     pygui run examples/basic/hello_world.py -c   # run and connect
-    pygui run examples/basic/hello_world.py -r   # run with autoreload
+    pygui run examples/basic/hello_world.py -r   # run with autoreload (restart)
+    pygui run examples/basic/hello_world.py -H   # run with in-process hot reload
+    pygui run examples/basic/hello_world.py -w   # run through the warm server
+    pygui run examples/basic/hello_world.py -p   # print a compile profile on exit
+    pygui run examples/basic/hello_world.py --cache  # reuse the built recipe across launches
+    pygui run examples/basic/hello_world.py --trace trace.json  # Chrome trace on exit
+    pygui serve                                  # start the warm server
+    pygui clear-cache                            # delete cached recipes
     pygui list
     pygui connect hello_world
+    pygui loadtest hello_world --clients 8 --duration 10 --output run.json
 """
 
 from __future__ import annotations
 
 import argparse
-import importlib.util
 import os
 import subprocess
 import sys
@@ -42,14 +49,38 @@ def _run_with_reload(file_path: str) -> None:
     run_process(watch_dir, target=target)
 
 
-def run_app(file_path: str, connect: bool = False, reload: bool = False) -> None:
+def run_app(
+    file_path: str,
+    connect: bool = False,
+    reload: bool = False,
+    warm: bool = False,
+    hot: bool = False,
+    profile: bool = False,
+    cache: bool = False,
+    trace: str | None = None,
+) -> None:
     """Run a TextualApp from file path. Expects class Application."""
     app_name = os.path.basename(file_path).replace(".py", "")
 
+    if cache:
+        from genro_pygui.recipe_cache import RECIPE_CACHE_ENV
+
+        # Via environment, so reload and connect subprocesses inherit it
+        os.environ[RECIPE_CACHE_ENV] = "1"
+
     if reload:
         _run_with_reload(file_path)
         return
 
+    if warm:
+        from genro_pygui.warm import run_warm
+
+        options = {"connect": connect, "hot": hot, "profile": profile, "trace": trace}
+        code = run_warm(file_path, options)
+        if code is not None:
+            sys.exit(code)
+        # Nessun warm server attivo: avvio normale
+
     if connect:
         # Lancia l'app in background e poi connetti
         env = os.environ.copy()
@@ -68,21 +99,31 @@ def run_app(file_path: str, connect: bool = False, reload: bool = False) -> None
         connect_repl(app_name)
         return
 
-    # Carica il modulo dal file
-    spec = importlib.util.spec_from_file_location(app_name, file_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    if profile:
+        from genro_pygui import profiling
+
+        profiling.enable()
 
-    # Cerca classe Main
-    app_class = getattr(module, "Application", None)
-    if app_class is None:
-        print(f"Error: {file_path} must have a class named 'Application'")
+    if trace:
+        from genro_pygui import tracing
+
+        tracing.enable()
+
+    # Carica il modulo dal file e cerca la classe Application
+    from genro_pygui.hot_reload import load_application
+
+    try:
+        app_class = load_application(file_path)
+    except ImportError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
     port = find_free_port()
 
     # Create app first to get token from remote server
     app = app_class(remote_port=port)
+    if hot:
+        app.enable_hot_reload(os.path.abspath(file_path))
 
     # Get token from remote server (created during app init)
     token = ""
@@ -96,6 +137,11 @@ def run_app(file_path: str, connect: bool = False, reload: bool = False) -> None
         app.run()
     finally:
         unregister_app(app_name)
+        if profile:
+            print(profiling.active.report())
+        if trace:
+            tracing.active.dump(trace)
+            print(f"Trace written to {trace}")
 
 
 def list_running() -> None:
@@ -143,6 +189,27 @@ def main() -> None:
     run_parser.add_argument(
         "-r", "--reload", action="store_true", help="Run with autoreload on file changes"
     )
+    run_parser.add_argument(
+        "-H", "--hot", action="store_true", help="Reload recipe in-process, keeping app data"
+    )
+    run_parser.add_argument(
+        "-p", "--profile", action="store_true", help="Profile compile and print a report on exit"
+    )
+    run_parser.add_argument(
+        "--trace", metavar="FILE", help="Write Chrome trace events of remote calls to FILE on exit"
+    )
+    run_parser.add_argument(
+        "-w", "--warm", action="store_true", help="Run through the warm server if available"
+    )
+    run_parser.add_argument(
+        "--cache", action="store_true", help="Load the built recipe from the recipe cache"
+    )
+
+    # serve command
+    subparsers.add_parser("serve", help="Start the warm server for fast app launches")
+
+    # clear-cache command
+    subparsers.add_parser("clear-cache", help="Delete cached recipes")
 
     # list command
     subparsers.add_parser("list", help="List running apps")
@@ -151,14 +218,91 @@ def main() -> None:
     connect_parser = subparsers.add_parser("connect", help="Connect to an app")
     connect_parser.add_argument("name", help="App name")
 
+    # loadtest command
+    loadtest_parser = subparsers.add_parser(
+        "loadtest", help="Drive a running app with remote load and report JSON stats"
+    )
+    loadtest_parser.add_argument("name", help="App name")
+    loadtest_parser.add_argument("-n", "--clients", type=int, default=4, help="Concurrent clients")
+    loadtest_parser.add_argument(
+        "-d", "--duration", type=float, default=10.0, help="Seconds to run"
+    )
+    loadtest_parser.add_argument(
+        "-m",
+        "--mix",
+        default="call=1,setitem=4,getitem=4,keys=1",
+        help="Operation weights, e.g. setitem=4,getitem=4,keys=1",
+    )
+    loadtest_parser.add_argument("-k", "--keys", type=int, default=100, help="Paths per client")
+    loadtest_parser.add_argument(
+        "--lane", choices=("interactive", "bulk"), default="bulk", help="Remote lane to use"
+    )
+    loadtest_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    loadtest_parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+
     args = parser.parse_args()
 
     if args.command == "run":
-        run_app(args.file, connect=args.connect, reload=args.reload)
+        run_app(
+            args.file,
+            connect=args.connect,
+            reload=args.reload,
+            warm=args.warm,
+            hot=args.hot,
+            profile=args.profile,
+            cache=args.cache,
+            trace=args.trace,
+        )
+    elif args.command == "serve":
+        from genro_pygui.warm import serve
+
+        serve()
+    elif args.command == "clear-cache":
+        from genro_pygui.recipe_cache import clear
+
+        print(f"Removed {clear()} cached recipes")
     elif args.command == "list":
         list_running()
     elif args.command == "connect":
         connect_repl(args.name)
+    elif args.command == "loadtest":
+        loadtest(args)
+
+
+def loadtest(args: argparse.Namespace) -> None:
+    """Run pygui loadtest and print (or write) the JSON report."""
+    import json
+
+    from genro_pygui.loadtest import parse_mix, run_loadtest
+
+    if get_app_info(args.name) is None:
+        print(f"App '{args.name}' not found")
+        sys.exit(1)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    report = run_loadtest(
+        {"name": args.name},
+        clients=args.clients,
+        duration=args.duration,
+        mix=mix,
+        keys=args.keys,
+        lane=args.lane,
+        seed=args.seed,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        total = report["total"]
+        print(
+            f"{total['count']} ops, {total['per_second']}/s, p99 {total['p99_ms']} ms"
+            f" -> {args.output}"
+        )
+    else:
+        print(text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Process-wide pool of connections to remote apps.
+
+Without a pool every remote call opens a TCP connection and every
+connect(name) reads the registry. connect() uses the shared pool instead:
+
+    - registry lookups are cached per app name, and trusted as long as the
+      registry file is unchanged (one stat() instead of lock + read + parse)
+    - connections are kept open after a response and reused by any proxy
+      to the same host and port, from any thread; the server keeps them
+      open too (keepalive requests, see remote.py)
+    - an idle connection is checked before reuse (closed by the server, or
+      with unexpected bytes pending: discarded) and evicted after
+      idle_timeout seconds; at most max_idle are kept per endpoint
+
+    app = connect("myapp")           # shared_pool() by default
+    app = connect("myapp", pool=False)
+    shared_pool().stats()            # created, reused, discarded, evicted...
+
+A connection in use belongs to one call: it goes back to the pool only after
+a complete response, so a timed out or cancelled call never leaves a
+half-read connection behind.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import socket
+import threading
+import time
+from typing import Any
+
+DEFAULT_MAX_IDLE = 8
+# Più corto del keepalive del server: i client chiudono per primi
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+def _registry_stamp() -> tuple[int, int, int] | None:
+    """Identity of the registry file's current content, or None if missing."""
+    from genro_pygui.registry import REGISTRY_FILE
+
+    try:
+        stat = os.stat(REGISTRY_FILE)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+
+def _is_alive(sock: socket.socket) -> bool:
+    """True if an idle connection is still open and has nothing to read."""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    # Una connessione inattiva non deve avere dati: EOF o byte estranei
+    return not readable
+
+
+class ConnectionPool:
+    """Idle connections per (host, port) and cached registry lookups."""
+
+    def __init__(
+        self, max_idle: int = DEFAULT_MAX_IDLE, idle_timeout: float = DEFAULT_IDLE_TIMEOUT
+    ) -> None:
+        if max_idle < 0:
+            raise ValueError(f"max_idle must not be negative, got {max_idle}")
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # (host, port) -> [(socket, idle since)], most recent last
+        self._idle: dict[tuple[str, int], list[tuple[socket.socket, float]]] = {}
+        # name -> (registry stamp, port, token)
+        self._apps: dict[str, tuple[Any, int, str]] = {}
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.evicted = 0
+        self.lookups = 0
+        self.lookup_hits = 0
+
+    # -------------------------------------------------------------------------
+    # Registry
+    # -------------------------------------------------------------------------
+
+    def resolve(self, name: str) -> tuple[int, str]:
+        """(port, token) of a registered app, re-read only if the registry changed."""
+        from genro_pygui.registry import get_app_info
+
+        stamp = _registry_stamp()
+        with self._lock:
+            self.lookups += 1
+            cached = self._apps.get(name)
+            if cached is not None and stamp is not None and cached[0] == stamp:
+                self.lookup_hits += 1
+                return cached[1], cached[2]
+        info = get_app_info(name)
+        if info is None:
+            raise ValueError(f"App '{name}' not found in registry")
+        port, token = info["port"], info.get("token", "")
+        with self._lock:
+            self._apps[name] = (stamp, port, token)
+        return port, token
+
+    # -------------------------------------------------------------------------
+    # Connections
+    # -------------------------------------------------------------------------
+
+    def acquire(
+        self, host: str, port: int, timeout: float | None = None
+    ) -> tuple[socket.socket, bool]:
+        """A connection to host:port: (socket, True) if reused, (socket, False) if new."""
+        now = time.monotonic()
+        stale = []
+        sock = None
+        with self._lock:
+            idle = self._idle.get((host, port))
+            while idle:
+                candidate, since = idle.pop()
+                if now - since > self.idle_timeout:
+                    self.evicted += 1
+                    stale.append(candidate)
+                elif not _is_alive(candidate):
+                    self.discarded += 1
+                    stale.append(candidate)
+                else:
+                    self.reused += 1
+                    sock = candidate
+                    break
+        for candidate in stale:
+            candidate.close()
+        if sock is not None:
+            sock.settimeout(timeout)
+            return sock, True
+        sock = socket.create_connection((host, port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.created += 1
+        return sock, False
+
+    def release(self, host: str, port: int, sock: socket.socket) -> None:
+        """Give back a connection after a complete response."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            idle = self._idle.setdefault((host, port), [])
+            # Le più vecchie sono in testa: si scartano quelle scadute o in eccesso
+            while idle and (now - idle[0][1] > self.idle_timeout or len(idle) >= self.max_idle):
+                evicted.append(idle.pop(0)[0])
+            if self.max_idle:
+                idle.append((sock, now))
+            else:
+                evicted.append(sock)
+            self.evicted += len(evicted)
+        for candidate in evicted:
+            candidate.close()
+
+    def clear(self) -> None:
+        """Close every idle connection and forget the registry lookups."""
+        with self._lock:
+            idle = [sock for conns in self._idle.values() for sock, _ in conns]
+            self._idle.clear()
+            self._apps.clear()
+        for sock in idle:
+            sock.close()
+
+    def stats(self) -> dict[str, int]:
+        """Counters: connections created, reused, discarded, evicted, idle; lookups."""
+        with self._lock:
+            idle = sum(len(conns) for conns in self._idle.values())
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "evicted": self.evicted,
+            "idle": idle,
+            "lookups": self.lookups,
+            "lookup_hits": self.lookup_hits,
+        }
+
+
+_shared: ConnectionPool | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool() -> ConnectionPool:
+    """The process-wide pool used by connect()."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ConnectionPool()
+        return _shared
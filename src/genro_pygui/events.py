@@ -0,0 +1,169 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""UI event stream: what the user does, for local and remote subscribers.
+
+TextualWrapperApp publishes widget events (button presses, input changes,
+selections, keys) to the app's EventHub as UIEvent records, each carrying
+the page node it comes from (id attribute, tag, label). Subscribers filter
+by event name, node id and tag, and read the events in batches:
+
+    sub = app.events.subscribe(events={"button_pressed"}, tags={"button"})
+    for event in sub.get_batch(timeout=1.0):
+        print(event.event, event.node_id, event.value)
+
+Remote clients get the same stream over one persistent connection, pushed
+by the server as events happen (see RemoteProxy.subscribe in remote.py):
+
+    with app.subscribe(ids={"save", "name"}) as stream:
+        for batch in stream:
+            ...
+
+Publishing costs nothing while nobody is subscribed. Each subscription
+queues at most maxlen events: a slow reader loses the oldest ones, counted
+in dropped. Event names:
+
+    button_pressed, input_changed, input_submitted, checkbox_changed,
+    radio_button_changed, radio_set_changed, switch_changed, select_changed,
+    text_area_changed, option_selected, list_selected, tree_selected,
+    row_selected, cell_selected, tab_activated, key
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+DEFAULT_MAXLEN = 10000
+MAX_BATCH = 1000
+
+
+class UIEvent(NamedTuple):
+    """A user action on a page widget (node fields are None if not from a node)."""
+
+    seq: int
+    time: float
+    event: str
+    node_id: str | None
+    tag: str | None
+    label: str | None
+    widget_id: str | None
+    value: Any
+
+
+class Subscription:
+    """Queue of the events matching a filter; None accepts everything."""
+
+    def __init__(
+        self,
+        events: Iterable[str] | None = None,
+        ids: Iterable[str] | None = None,
+        tags: Iterable[str] | None = None,
+        maxlen: int = DEFAULT_MAXLEN,
+    ) -> None:
+        self.events = frozenset(events) if events is not None else None
+        self.ids = frozenset(ids) if ids is not None else None
+        self.tags = frozenset(tags) if tags is not None else None
+        self._queue: deque[UIEvent] = deque(maxlen=maxlen)
+        self._ready = threading.Event()
+        self.dropped = 0
+        self.closed = False
+
+    def matches(self, event: UIEvent) -> bool:
+        """True if event passes the filter."""
+        if self.events is not None and event.event not in self.events:
+            return False
+        if self.ids is not None and event.node_id not in self.ids:
+            return False
+        return self.tags is None or event.tag in self.tags
+
+    def push(self, event: UIEvent) -> None:
+        """Queue event (UI thread), dropping the oldest one if full."""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(event)
+        self._ready.set()
+
+    def get_batch(self, timeout: float | None = None, max_size: int = MAX_BATCH) -> list[UIEvent]:
+        """Queued events, waiting up to timeout for the first one ([] if none)."""
+        if not self._queue and not self._ready.wait(timeout):
+            return []
+        # Prima si azzera il segnale: un evento che arriva durante il drain lo riaccende
+        self._ready.clear()
+        batch = []
+        while self._queue and len(batch) < max_size:
+            batch.append(self._queue.popleft())
+        if self._queue:
+            self._ready.set()
+        return batch
+
+    def close(self) -> None:
+        """Wake up a reader waiting in get_batch()."""
+        self.closed = True
+        self._ready.set()
+
+
+class EventHub:
+    """Fan-out of UI events to subscriptions (published on the UI thread)."""
+
+    def __init__(self) -> None:
+        self._subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.published = 0
+
+    def __bool__(self) -> bool:
+        return bool(self._subscriptions)
+
+    def subscribe(
+        self,
+        events: Iterable[str] | None = None,
+        ids: Iterable[str] | None = None,
+        tags: Iterable[str] | None = None,
+        maxlen: int = DEFAULT_MAXLEN,
+    ) -> Subscription:
+        """New subscription to the events matching the filters."""
+        subscription = Subscription(events, ids, tags, maxlen)
+        with self._lock:
+            # Lista nuova a ogni modifica: publish() la scorre senza lock
+            self._subscriptions = [*self._subscriptions, subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove subscription and wake up its reader."""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close()
+
+    def publish(
+        self,
+        event: str,
+        node_id: str | None = None,
+        tag: str | None = None,
+        label: str | None = None,
+        widget_id: str | None = None,
+        value: Any = None,
+    ) -> UIEvent | None:
+        """Deliver an event to the matching subscriptions (None if nobody listens)."""
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return None
+        record = UIEvent(
+            next(self._seq), time.time(), event, node_id, tag, label, widget_id, value
+        )
+        self.published += 1
+        for subscription in subscriptions:
+            if subscription.matches(record):
+                subscription.push(record)
+        return record
+
+    def stats(self) -> dict[str, int]:
+        """Counters: published events, subscriptions, events dropped by them."""
+        subscriptions = self._subscriptions
+        return {
+            "published": self.published,
+            "subscriptions": len(subscriptions),
+            "dropped": sum(s.dropped for s in subscriptions),
+        }
@@ -0,0 +1,354 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Formula engine for ==expr attributes and dataformula nodes.
+
+A formula is a Python expression whose variables are the other attributes of
+the same node (see docs/data-binding-architecture.md):
+
+    root.static("==f'{nome} {cognome}'", nome="^.nome", cognome="^.cognome")
+    root.dataformula(".totale", formula="prezzo * quantita",
+                     prezzo="^.prezzo", quantita="^.quantita")
+
+Variables bound with ^path are dependencies (a change triggers recompute),
+=path variables are read at evaluation time, anything else is a literal.
+A dataformula writes its result into the data Bag, so formulas can feed
+other formulas: the engine keeps a DAG from data paths to formulas and
+assigns each formula a level (1 + level of the formulas producing its
+inputs). register() rejects a dataformula closing a cycle with ValueError.
+
+Data changes only mark formulas dirty. recompute() - called once per frame
+by the UpdateScheduler while the app runs - evaluates the dirty formulas
+and everything downstream of them in level order, so each affected formula
+runs exactly once however many inputs changed. Expressions are compiled
+once (shared by every node using the same text) and a formula whose inputs
+did not change returns its memoized value without being evaluated.
+
+A formula that raises evaluates to None: the exception is kept in
+formula.error and logged as a warning by the genro_pygui.formula logger.
+"""
+
+from __future__ import annotations
+
+import builtins
+import heapq
+import logging
+import threading
+from types import CodeType
+from typing import TYPE_CHECKING, Any
+
+from genro_pygui.binding import TRIGGER, set_widget_property
+
+if TYPE_CHECKING:
+    from genro_bag import Bag
+    from genro_bag.bagnode import BagNode
+    from textual.widget import Widget
+
+    from genro_pygui.scheduler import UpdateScheduler
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class Formula:
+    """A compiled expression with its variables and its target."""
+
+    __slots__ = (
+        "expr",
+        "code",
+        "variables",
+        "deps",
+        "widget",
+        "prop",
+        "path",
+        "level",
+        "inputs",
+        "value",
+        "error",
+    )
+
+    def __init__(
+        self, expr: str, code: CodeType, variables: dict[str, tuple[str | None, Any]]
+    ) -> None:
+        self.expr = expr
+        self.code = code
+        # name -> ("^" | "=", absolute path) or (None, literal)
+        self.variables = variables
+        self.deps = frozenset(v for mode, v in variables.values() if mode == TRIGGER)
+        self.widget: Widget | None = None
+        self.prop: str | None = None
+        self.path: str | None = None
+        self.level = 0
+        self.inputs: Any = _UNSET
+        self.value: Any = None
+        self.error: Exception | None = None
+
+    def __repr__(self) -> str:
+        target = self.path if self.path is not None else self.prop
+        return f"<Formula {target}: {self.expr!r}>"
+
+
+class FormulaEngine:
+    """Dependency graph of formulas over the data Bag."""
+
+    def __init__(self, data: Bag) -> None:
+        self._data = data
+        self._codes: dict[str, CodeType] = {}
+        self._by_dep: dict[str, set[Formula]] = {}
+        self._by_prefix: dict[str, set[str]] = {}
+        self._producers: dict[str, Formula] = {}
+        # prefix -> data paths prodotti sotto di esso
+        self._producer_prefix: dict[str, set[str]] = {}
+        self._formulas: set[Formula] = set()
+        self._dirty: set[Formula] = set()
+        self._lock = threading.Lock()
+        self._levels_valid = True
+        self.scheduler: UpdateScheduler | None = None
+        self.evaluations = 0
+        data.subscribe("_formulaengine", any=self._on_data_change)
+
+    def __len__(self) -> int:
+        return len(self._formulas)
+
+    # -------------------------------------------------------------------------
+    # Compile time
+    # -------------------------------------------------------------------------
+
+    def compile(self, expr: str) -> CodeType:
+        """Compile an expression once; the code object is shared by text."""
+        code = self._codes.get(expr)
+        if code is None:
+            try:
+                code = compile(expr, f"<formula {expr!r}>", "eval")
+            except SyntaxError as e:
+                raise ValueError(f"Invalid formula {expr!r}: {e.msg}") from None
+            self._codes[expr] = code
+        return code
+
+    def create(self, expr: str, variables: dict[str, tuple[str | None, Any]]) -> Formula:
+        """Build an unregistered formula (evaluate() works, no recompute yet)."""
+        return Formula(expr, self.compile(expr), variables)
+
+    def register(self, formula: Formula) -> None:
+        """Add a formula to the dependency graph; ValueError if it closes a cycle."""
+        if formula.path is not None:
+            other = self._producers.get(formula.path)
+            if other is not None and other is not formula:
+                raise ValueError(f"Data path '{formula.path}' already computed by {other!r}")
+            self._producers[formula.path] = formula
+            parts = formula.path.split(".")
+            for i in range(1, len(parts)):
+                self._producer_prefix.setdefault(".".join(parts[:i]), set()).add(formula.path)
+        self._formulas.add(formula)
+        for path in formula.deps:
+            self._by_dep.setdefault(path, set()).add(formula)
+            parts = path.split(".")
+            for i in range(1, len(parts)):
+                self._by_prefix.setdefault(".".join(parts[:i]), set()).add(path)
+        self._levels_valid = False
+        if formula.path is not None and self._reaches_itself(formula):
+            # Rifiutato qui, non al prossimo frame: l'errore arriva a chi lo crea
+            self.unregister(formula)
+            raise ValueError(f"Formula cycle involving {formula!r}")
+
+    def unregister(self, formula: Formula) -> None:
+        """Remove a formula from the dependency graph."""
+        if formula not in self._formulas:
+            return
+        self._formulas.discard(formula)
+        self._dirty.discard(formula)
+        if formula.path is not None and self._producers.get(formula.path) is formula:
+            del self._producers[formula.path]
+            parts = formula.path.split(".")
+            for i in range(1, len(parts)):
+                prefix = ".".join(parts[:i])
+                paths = self._producer_prefix.get(prefix)
+                if paths is not None:
+                    paths.discard(formula.path)
+                    if not paths:
+                        del self._producer_prefix[prefix]
+        for path in formula.deps:
+            formulas = self._by_dep.get(path)
+            if formulas is None:
+                continue
+            formulas.discard(formula)
+            if formulas:
+                continue
+            del self._by_dep[path]
+            parts = path.split(".")
+            for i in range(1, len(parts)):
+                prefix = ".".join(parts[:i])
+                paths = self._by_prefix.get(prefix)
+                if paths is not None:
+                    paths.discard(path)
+                    if not paths:
+                        del self._by_prefix[prefix]
+        self._levels_valid = False
+
+    # -------------------------------------------------------------------------
+    # Graph
+    # -------------------------------------------------------------------------
+
+    def affected(self, path: str) -> set[Formula]:
+        """Formulas depending on path, on a descendant or on an ancestor of it."""
+        result = set(self._by_dep.get(path, ()))
+        for dep in self._by_prefix.get(path, ()):
+            result.update(self._by_dep.get(dep, ()))
+        parts = path.split(".")
+        for i in range(1, len(parts)):
+            result.update(self._by_dep.get(".".join(parts[:i]), ()))
+        return result
+
+    def _upstream(self, formula: Formula) -> list[Formula]:
+        """Formulas writing a data path that formula depends on (or above or below it)."""
+        producers = self._producers
+        result = set()
+        for dep in formula.deps:
+            # Il path stesso e i suoi antenati, poi i path prodotti sotto di esso
+            parts = dep.split(".")
+            for i in range(1, len(parts) + 1):
+                producer = producers.get(".".join(parts[:i]))
+                if producer is not None:
+                    result.add(producer)
+            for produced in self._producer_prefix.get(dep, ()):
+                result.add(producers[produced])
+        result.discard(formula)
+        return list(result)
+
+    def _reaches_itself(self, formula: Formula) -> bool:
+        """True if formula's result flows back into its own inputs (a cycle)."""
+        # Un nuovo ciclo passa per forza dal formula appena registrato
+        seen = {formula}
+        stack = [f for f in self.affected(formula.path) if f is not formula]
+        while stack:
+            current = stack.pop()
+            if current is formula:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            if current.path is not None:
+                stack.extend(f for f in self.affected(current.path) if f is not current)
+        return False
+
+    def _compute_levels(self) -> None:
+        """Assign topological levels; raise ValueError on cycles."""
+        levels: dict[Formula, int] = {}
+        visiting: set[Formula] = set()
+
+        def visit(formula: Formula) -> int:
+            if formula in levels:
+                return levels[formula]
+            if formula in visiting:
+                raise ValueError(f"Formula cycle involving {formula!r}")
+            visiting.add(formula)
+            level = 1 + max((visit(up) for up in self._upstream(formula)), default=-1)
+            visiting.discard(formula)
+            levels[formula] = level
+            return level
+
+        for formula in self._formulas:
+            formula.level = visit(formula)
+        self._levels_valid = True
+
+    # -------------------------------------------------------------------------
+    # Run time
+    # -------------------------------------------------------------------------
+
+    def evaluate(self, formula: Formula) -> Any:
+        """Evaluate formula with the current data (memoized on its inputs)."""
+        data = self._data
+        inputs = tuple(
+            data[value] if mode is not None else value
+            for mode, value in formula.variables.values()
+        )
+        if inputs == formula.inputs:
+            return formula.value
+
+        formula.inputs = inputs
+        self.evaluations += 1
+        try:
+            # Un solo namespace: le variabili restano visibili nelle comprehension
+            namespace = dict(zip(formula.variables, inputs))
+            namespace["__builtins__"] = builtins
+            formula.value = eval(formula.code, namespace)
+            formula.error = None
+        except Exception as e:
+            formula.value = None
+            formula.error = e
+            logger.warning("Formula %r failed: %s: %s", formula, type(e).__name__, e)
+        return formula.value
+
+    def _on_data_change(
+        self, node: BagNode, pathlist: list | None, evt: str, reason: Any = None, **kw: Any
+    ) -> None:
+        """Data Bag subscriber: mark downstream formulas dirty."""
+        if evt == "upd_attrs":
+            return
+        if isinstance(node, list):
+            # Bag.clear(): un solo del con la lista dei nodi rimossi
+            formulas = set()
+            for removed in node:
+                formulas.update(self.affected(".".join([*(pathlist or []), removed.label])))
+        elif evt in ("ins", "del"):
+            formulas = self.affected(".".join([*(pathlist or []), node.label]))
+        else:
+            formulas = self.affected(".".join(pathlist or []))
+        if not formulas:
+            return
+        with self._lock:
+            self._dirty.update(formulas)
+        scheduler = self.scheduler
+        if reason is not self and (scheduler is None or not scheduler.running):
+            # Nessun frame in corso: ricalcolo immediato
+            self.recompute()
+
+    def dirty(self, formula: Formula) -> None:
+        """Schedule formula for recompute (immediately if no frame is running)."""
+        with self._lock:
+            self._dirty.add(formula)
+        if self.scheduler is None or not self.scheduler.running:
+            self.recompute()
+
+    def _take_dirty(self) -> set[Formula]:
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+        return dirty
+
+    def recompute(self) -> int:
+        """Evaluate dirty formulas and their downstream, in level order.
+
+        Returns the number of formulas processed.
+        """
+        dirty = self._take_dirty()
+        if not dirty:
+            return 0
+        if not self._levels_valid:
+            self._compute_levels()
+
+        heap: list[tuple[int, int, Formula]] = []
+        queued: set[Formula] = set()
+
+        def push(formulas: set[Formula]) -> None:
+            for formula in formulas:
+                if formula not in queued and formula in self._formulas:
+                    queued.add(formula)
+                    heapq.heappush(heap, (formula.level, len(queued), formula))
+
+        push(dirty)
+        while heap:
+            _, _, formula = heapq.heappop(heap)
+            self._apply(formula)
+            # I dataformula scritti sopra hanno marcato i loro dipendenti
+            push(self._take_dirty())
+        return len(queued)
+
+    def _apply(self, formula: Formula) -> None:
+        """Evaluate formula and push its value to its target if it changed."""
+        old_value = formula.value
+        value = self.evaluate(formula)
+        if formula.path is not None:
+            if self._data[formula.path] != value:
+                self._data.set_item(formula.path, value, _reason=self)
+        elif formula.widget is not None and value != old_value:
+            set_widget_property(formula.widget, formula.prop, value)
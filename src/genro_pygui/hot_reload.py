@@ -0,0 +1,100 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""In-process hot reload for TextualApp.
+
+Instead of restarting the process, the app module is re-imported on save,
+the methods of the new Application class are copied onto the running app's
+class, the new recipe() builds a fresh page Bag and only the widgets that
+changed are patched. TextualApp.data and Textual state are preserved.
+
+Usage:
+    pygui run examples/basic/hello_world.py --hot
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import types
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from textual.app import App
+
+    from genro_pygui.textual_app import TextualApp
+
+
+def load_application(file_path: str) -> type:
+    """Import file_path as a fresh module and return its Application class."""
+    app_name = os.path.basename(file_path).replace(".py", "")
+    spec = importlib.util.spec_from_file_location(app_name, file_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {file_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    app_class = getattr(module, "Application", None)
+    if app_class is None:
+        raise ImportError(f"{file_path} must have a class named 'Application'")
+    return app_class
+
+
+# Attributes of a class that are code: dropped on reload if no longer defined
+_METHOD_TYPES = (types.FunctionType, classmethod, staticmethod, property)
+
+
+def _rebind(func: types.FunctionType, cls: type) -> types.FunctionType:
+    """func with its zero-argument super() (the __class__ cell) pointing to cls."""
+    code = func.__code__
+    if "__class__" not in code.co_freevars:
+        return func
+    closure = list(func.__closure__)
+    closure[code.co_freevars.index("__class__")] = types.CellType(cls)
+    rebound = types.FunctionType(
+        code, func.__globals__, func.__name__, func.__defaults__, tuple(closure)
+    )
+    rebound.__kwdefaults__ = func.__kwdefaults__
+    rebound.__qualname__ = func.__qualname__
+    rebound.__doc__ = func.__doc__
+    rebound.__dict__.update(func.__dict__)
+    return rebound
+
+
+def update_class(cls: type, new_cls: type) -> None:
+    """Copy the methods and attributes defined by new_cls (a reload of cls) onto cls.
+
+    Instances of cls keep their state and get the new code: methods keep
+    the globals of the reloaded module, and super() inside them refers to
+    cls. Methods removed from the new version are deleted; other removed
+    attributes are left in place (they may hold state).
+    """
+    if new_cls.__name__ != cls.__name__:
+        raise ValueError(f"Cannot reload {cls.__name__} from class {new_cls.__name__}")
+    new_names = vars(new_cls)
+    for name, value in list(vars(cls).items()):
+        if name not in new_names and isinstance(value, _METHOD_TYPES):
+            delattr(cls, name)
+    for name, value in new_names.items():
+        if name.startswith("__") and name.endswith("__"):
+            continue
+        updated: Any = value
+        if isinstance(value, types.FunctionType):
+            updated = _rebind(value, cls)
+        elif isinstance(value, (classmethod, staticmethod)) and isinstance(
+            value.__func__, types.FunctionType
+        ):
+            updated = type(value)(_rebind(value.__func__, cls))
+        setattr(cls, name, updated)
+
+
+async def watch_and_reload(owner: TextualApp, textual_app: App, file_path: str) -> None:
+    """Watch file_path and hot-patch owner's page on every change."""
+    from watchfiles import awatch
+
+    async for _ in awatch(file_path):
+        try:
+            app_class = load_application(file_path)
+            changed = owner.reload_recipe(app_class)
+        except Exception as e:
+            textual_app.notify(f"Reload failed: {e}", severity="error", timeout=8)
+            continue
+        textual_app.notify(f"Reloaded ({changed} nodes updated)", timeout=2)
@@ -0,0 +1,130 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Thread-safe bulk ingestion of data into TextualApp.data.
+
+Producers (threads or asyncio tasks) never touch the data Bag: they append
+(path, value) pairs to a DataWriter, which never blocks. On every frame the
+UI thread drains the writers in batches, keeps only the last value of each
+path, and writes them into the data Bag in the order of their last write
+(so a later write of an ancestor still replaces its descendants); bound
+widgets are then refreshed by the same frame's UpdateScheduler flush.
+
+    writer = app.data_writer()
+
+    def telemetry():                 # any thread
+        while True:
+            writer.write(f"sensors.{name}", read_sensor(name))
+
+    writer.close()                   # stop draining this writer
+
+With maxlen the queue is bounded: when producers outpace the UI the oldest
+pending updates are discarded (counted in writer.stats()["dropped"]).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from genro_bag import Bag
+
+    from genro_pygui.scheduler import UpdateScheduler
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+class DataWriter:
+    """Non-blocking queue of (path, value) updates for the data Bag."""
+
+    def __init__(
+        self,
+        data: Bag,
+        scheduler: UpdateScheduler,
+        maxlen: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self._data = data
+        self._scheduler = scheduler
+        # deque.append/popleft sono atomici: nessun lock lato producer
+        self._queue: deque[tuple[str, Any]] = deque(maxlen=maxlen)
+        self.batch_size = batch_size
+        self.written = 0
+        self.applied = 0
+        self.drained = 0
+        self.dropped = 0
+        self.closed = False
+        scheduler.add_source(self.drain)
+
+    def __enter__(self) -> DataWriter:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def write(self, path: str, value: Any) -> None:
+        """Queue one update (any thread, never blocks)."""
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append((path, value))
+        self.written += 1
+
+    def write_many(self, items: Iterable[tuple[str, Any]]) -> None:
+        """Queue several (path, value) updates."""
+        items = items if isinstance(items, list) else list(items)
+        queue = self._queue
+        if queue.maxlen is not None:
+            # Gli aggiornamenti più vecchi che extend() spingerà fuori dalla coda
+            self.dropped += max(len(queue) + len(items) - queue.maxlen, 0)
+        queue.extend(items)
+        self.written += len(items)
+
+    def close(self) -> None:
+        """Stop draining once what is still queued has been applied."""
+        self.closed = True
+
+    def drain(self) -> int:
+        """Write up to batch_size queued updates into the data Bag (UI thread).
+
+        Returns the number of distinct paths written.
+        """
+        queue = self._queue
+        latest: dict[str, Any] = {}
+        count = min(len(queue), self.batch_size)
+        for _ in range(count):
+            path, value = queue.popleft()
+            # Reinserito in coda: le scritture seguono l'ordine dell'ultima
+            # (a.b, poi a, poi di nuovo a.b: a.b va scritto dopo a)
+            latest.pop(path, None)
+            latest[path] = value
+        self.drained += count
+
+        data = self._data
+        for path, value in latest.items():
+            data.set_item(path, value, _reason=self)
+        self.applied += len(latest)
+        if self.closed and not queue:
+            self._scheduler.remove_source(self.drain)
+        return len(latest)
+
+    @property
+    def pending(self) -> int:
+        """Updates queued and not yet drained."""
+        return len(self._queue)
+
+    def stats(self) -> dict[str, int]:
+        """Counters: written, drained, applied (distinct paths), pending, dropped.
+
+        written and dropped are not locked, so with concurrent producers they
+        are approximate.
+        """
+        return {
+            "written": self.written,
+            "drained": self.drained,
+            "applied": self.applied,
+            "pending": len(self._queue),
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,215 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Remote load generator for a running TextualApp.
+
+Drives an app started with remote control from N concurrent clients, each
+running a weighted mix of operations for a fixed time:
+
+    call     data.set_item(path, n) through __call__ (UI thread)
+    setitem  data[path] = n                           (UI thread)
+    getitem  data[path]                               (server thread)
+    keys     keys of the client's container, paginated (server thread)
+
+Every client writes and reads its own loadtest.c<i>.k<j> paths in the data
+Bag (removed at the end). The report gives throughput, latency percentiles
+and a histogram per operation, together with the app's frame stats over the
+same interval (see scheduler.py), so that runs can be compared:
+
+    pygui loadtest myapp --clients 8 --duration 10 --mix setitem=4,getitem=4,keys=1
+    pygui loadtest myapp --output before.json
+
+    from genro_pygui.loadtest import run_loadtest
+    report = run_loadtest(connect_kwargs={"name": "myapp"}, clients=4)
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import random
+import threading
+import time
+from typing import Any
+
+from genro_bag import Bag
+
+from genro_pygui.remote import BULK, RemoteProxy, connect
+
+OPERATIONS = ("call", "setitem", "getitem", "keys")
+DEFAULT_MIX = {"call": 1, "setitem": 4, "getitem": 4, "keys": 1}
+ROOT = "loadtest"
+# Limiti superiori (ms) delle classi dell'istogramma; l'ultima è aperta
+BUCKETS_MS = (0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    """Parse "setitem=4,getitem=4,keys=1" into operation weights."""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {OPERATIONS}")
+        mix[name] = int(weight) if weight else 1
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return mix
+
+
+def histogram(latencies: list[float]) -> dict[str, int]:
+    """Latencies (s) per bucket, keyed by the bucket's upper bound in ms."""
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for latency in latencies:
+        counts[bisect.bisect_left(BUCKETS_MS, latency * 1000)] += 1
+    labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+    return {label: count for label, count in zip(labels, counts) if count}
+
+
+def _summary(latencies: list[float], errors: int, duration: float) -> dict[str, Any]:
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(count - 1, int(p * count))] * 1000, 3)
+
+    return {
+        "count": count,
+        "errors": errors,
+        "per_second": round(count / duration, 1) if duration else 0.0,
+        "mean_ms": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "histogram_ms": histogram(latencies),
+    }
+
+
+class _Client(threading.Thread):
+    """One load test client: runs the mix until the deadline."""
+
+    def __init__(
+        self,
+        index: int,
+        remote: RemoteProxy,
+        mix: dict[str, int],
+        keys: int,
+        stop_at: float,
+        seed: int,
+    ) -> None:
+        super().__init__(name=f"loadtest-{index}", daemon=True)
+        self.remote = remote
+        self.base = f"{ROOT}.c{index}"
+        self.keys = keys
+        self.stop_at = stop_at
+        self.random = random.Random(seed + index)
+        self.operations = [name for name in mix if mix[name] > 0]
+        self.weights = [mix[name] for name in self.operations]
+        self.latencies: dict[str, list[float]] = {name: [] for name in self.operations}
+        self.errors: dict[str, int] = dict.fromkeys(self.operations, 0)
+
+    def run(self) -> None:
+        data = self.remote.data
+        n = 0
+        while time.monotonic() < self.stop_at:
+            operation = self.random.choices(self.operations, self.weights)[0]
+            path = f"{self.base}.k{self.random.randrange(self.keys)}"
+            n += 1
+            start = time.perf_counter()
+            try:
+                if operation == "call":
+                    data.set_item(path, n)
+                elif operation == "setitem":
+                    data[path] = n
+                elif operation == "getitem":
+                    data[path]
+                else:
+                    list(data.iter_keys(self.base))
+            except Exception:
+                # Anche le eccezioni inattese contano come errori, senza fermare il client
+                self.errors[operation] += 1
+                continue
+            self.latencies[operation].append(time.perf_counter() - start)
+
+
+def run_loadtest(
+    connect_kwargs: dict[str, Any],
+    clients: int = 4,
+    duration: float = 10.0,
+    mix: dict[str, int] | None = None,
+    keys: int = 100,
+    lane: str = BULK,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run the load test and return the report (JSON-serializable).
+
+    connect_kwargs are passed to remote.connect() (name or port, token).
+    """
+    if clients <= 0:
+        raise ValueError(f"clients must be positive, got {clients}")
+    if duration <= 0:
+        raise ValueError(f"duration must be positive, got {duration}")
+    mix = mix or DEFAULT_MIX
+    monitor = connect(**connect_kwargs)
+    workers: list[_Client] = []
+    try:
+        # Chiavi create prima della misura, in un solo invio
+        initial = Bag()
+        for index in range(clients):
+            for key in range(keys):
+                initial[f"c{index}.k{key}"] = 0
+        monitor.data[ROOT] = initial
+        monitor.stats(reset=True)
+
+        start = time.monotonic()
+        for index in range(clients):
+            remote = connect(**connect_kwargs, lane=lane)
+            workers.append(_Client(index, remote, mix, keys, start + duration, seed))
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - start
+        app_stats = monitor.stats()
+    finally:
+        for worker in workers:
+            # Interrotto a metà: i client avviati si fermano alla prossima operazione
+            worker.stop_at = 0.0
+            if worker.is_alive():
+                worker.join()
+            with contextlib.suppress(OSError, RuntimeError):
+                worker.remote.close()
+        try:
+            monitor.data.pop(ROOT)
+        finally:
+            with contextlib.suppress(OSError, RuntimeError):
+                monitor.close()
+
+    operations = {}
+    all_latencies: list[float] = []
+    all_errors = 0
+    for name in mix:
+        if mix[name] <= 0:
+            continue
+        latencies = [lat for worker in workers for lat in worker.latencies[name]]
+        errors = sum(worker.errors[name] for worker in workers)
+        operations[name] = _summary(latencies, errors, elapsed)
+        all_latencies.extend(latencies)
+        all_errors += errors
+    return {
+        "config": {
+            "clients": clients,
+            "duration": duration,
+            "mix": mix,
+            "keys": keys,
+            "lane": lane,
+            "seed": seed,
+        },
+        "elapsed": round(elapsed, 3),
+        "total": _summary(all_latencies, all_errors, elapsed),
+        "operations": operations,
+        "app": app_stats,
+    }
@@ -0,0 +1,166 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Incremental index over the page Bag and its compiled widgets.
+
+Replaces full walk()s of the page (see _refresh_node_index in
+docs/implementation-plan-structure.md) with maps kept up to date from page
+events and from the builder:
+
+    node id   -> BagNode    (the node's "id" attribute)
+    widget id -> BagNode    (the compiled widget's Textual id)
+    node      -> widget     (node.compiled["widget"], registered by compile)
+
+Nodes inserted in the page are queued and indexed on the next lookup: the
+builder fills tag and attributes only after the ins event, so they cannot
+be read when it fires. Each node is indexed once, lookups are O(1)
+amortized.
+
+    app.get_node_by_id("greeting")        # -> BagNode | None
+    app.get_widget("greeting")            # -> Widget | None
+    app.get_node_for_widget(widget)       # -> BagNode | None
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from genro_bag import Bag
+
+if TYPE_CHECKING:
+    from genro_bag.bagnode import BagNode
+    from textual.widget import Widget
+
+
+def is_attached(node: BagNode) -> bool:
+    """True if node is still in its parent Bag (deleted nodes keep parent_bag)."""
+    parent_bag = node.parent_bag
+    # get_node(label) scorre la lista dei nodi: il contenitore ha un dict per label
+    return parent_bag is not None and parent_bag._nodes[node.label] is node
+
+
+class NodeIndex:
+    """node id / widget id lookups over a page Bag."""
+
+    def __init__(self) -> None:
+        self._by_id: dict[str, BagNode] = {}
+        self._by_widget_id: dict[str, BagNode] = {}
+        # id(node) -> id attribute indicizzato: upd_attrs non porta il vecchio valore
+        self._node_ids: dict[int, str] = {}
+        self._pending: list[BagNode] = []
+
+    def __len__(self) -> int:
+        self._settle()
+        return len(self._by_id)
+
+    def rebuild(self, page: Bag) -> None:
+        """Index a whole page from scratch (used when the page is replaced)."""
+        self._by_id = {}
+        self._by_widget_id = {}
+        self._node_ids = {}
+        self._pending = []
+        for node in page:
+            self.add(node)
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def inserted(self, node: BagNode) -> None:
+        """Queue a node just inserted in the page (attributes not set yet)."""
+        self._pending.append(node)
+
+    def _settle(self) -> None:
+        """Index the queued nodes that are still in the page."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        for node in pending:
+            if is_attached(node):
+                self.add(node)
+
+    def add(self, node: BagNode) -> None:
+        """Index node and its subtree."""
+        self._index_id(node)
+        widget = node.compiled.get("widget")
+        if widget is not None and widget.id:
+            self._by_widget_id[widget.id] = node
+        value = node.get_value(static=True)
+        if isinstance(value, Bag):
+            for child_node in value:
+                self.add(child_node)
+
+    def remove(self, node: BagNode) -> None:
+        """Drop node and its subtree from the index."""
+        value = node.get_value(static=True)
+        if isinstance(value, Bag):
+            for child_node in value:
+                self.remove(child_node)
+        self._unindex_id(node)
+        widget = node.compiled.get("widget")
+        if widget is not None and self._by_widget_id.get(widget.id) is node:
+            del self._by_widget_id[widget.id]
+
+    def _index_id(self, node: BagNode) -> None:
+        node_id = node.attr.get("id")
+        if node_id:
+            self._by_id[node_id] = node
+            self._node_ids[id(node)] = node_id
+
+    def _unindex_id(self, node: BagNode) -> None:
+        node_id = self._node_ids.pop(id(node), None)
+        if node_id and self._by_id.get(node_id) is node:
+            del self._by_id[node_id]
+
+    def widget_compiled(self, node: BagNode, widget: Widget) -> None:
+        """Register the widget created for node (called by the builder)."""
+        if widget.id:
+            self._by_widget_id[widget.id] = node
+
+    def widget_removed(self, widget: Widget) -> None:
+        """Forget a widget destroyed by the builder."""
+        self._by_widget_id.pop(widget.id, None)
+
+    def on_page_change(
+        self, node: BagNode, evt: str, oldvalue: Any = None, **kw: Any
+    ) -> None:
+        """Page Bag subscriber."""
+        if evt == "ins":
+            self.inserted(node)
+        elif evt == "del":
+            # Bag.clear() manda un solo del con la lista dei nodi rimossi
+            for removed in node if isinstance(node, list) else (node,):
+                self.remove(removed)
+        elif evt == "upd_attrs":
+            if self._node_ids.get(id(node)) != node.attr.get("id"):
+                self._unindex_id(node)
+                self._index_id(node)
+        elif evt == "upd_value" and isinstance(oldvalue, Bag):
+            for child_node in oldvalue:
+                self.remove(child_node)
+            value = node.get_value(static=True)
+            if isinstance(value, Bag):
+                for child_node in value:
+                    self.add(child_node)
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def node_by_id(self, node_id: str) -> BagNode | None:
+        """Page node whose id attribute is node_id."""
+        self._settle()
+        return self._by_id.get(node_id)
+
+    def node_for_widget(self, widget: Widget | str) -> BagNode | None:
+        """Page node that compiled to widget (or to the widget with that id)."""
+        self._settle()
+        widget_id = widget if isinstance(widget, str) else widget.id
+        return self._by_widget_id.get(widget_id)
+
+    def widget_for(self, node: BagNode | str) -> Widget | None:
+        """Widget compiled from node (a BagNode, a node id or a widget id)."""
+        if isinstance(node, str):
+            node = self.node_by_id(node) or self._by_widget_id.get(node)
+            if node is None:
+                return None
+        return node.compiled.get("widget")
@@ -0,0 +1,151 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Opt-in profiling of TextualBuilder compile.
+
+Enable with the GENRO_PYGUI_PROFILE=1 environment variable, with
+`pygui run --profile`, or programmatically:
+
+    from genro_pygui import profiling
+    profiler = profiling.enable()
+    ...
+    print(profiler.report())
+
+Each compiled node is timed separately (self time, children excluded) and
+split into phases:
+    lookup    - widget class lookup
+    kwargs    - building constructor kwargs
+    construct - widget construction
+    mount     - mount() / compose queueing
+    other     - anything else done by dedicated compile methods
+
+The report is also available remotely: `connect(name).profile()`.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any
+
+PROFILE_ENV = "GENRO_PYGUI_PROFILE"
+PHASES = ("lookup", "kwargs", "construct", "mount", "other")
+
+# Profiler in use, None when profiling is disabled (checked on every node)
+active: CompileProfiler | None = None
+
+
+class _Frame:
+    """Timing state of the node being compiled."""
+
+    __slots__ = ("tag", "path", "last", "phases")
+
+    def __init__(self, tag: str, path: str, now: float) -> None:
+        self.tag = tag
+        self.path = path
+        self.last = now
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+
+class CompileProfiler:
+    """Collects per-tag and per-node-path compile timings."""
+
+    def __init__(self) -> None:
+        self._stack: list[_Frame] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all collected timings."""
+        self._tags: dict[str, dict[str, float]] = {}
+        self._nodes: dict[str, tuple[str, float]] = {}
+
+    def enter(self, tag: str, path: str) -> None:
+        """Start timing a node."""
+        self._stack.append(_Frame(tag, path, time.perf_counter()))
+
+    def mark(self, phase: str) -> None:
+        """Attribute the time since the previous mark to phase."""
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        now = time.perf_counter()
+        frame.phases[phase] += now - frame.last
+        frame.last = now
+
+    def exit(self) -> None:
+        """Stop timing the current node and fold it into the totals."""
+        frame = self._stack.pop()
+        now = time.perf_counter()
+        frame.phases["other"] += now - frame.last
+
+        stats = self._tags.get(frame.tag)
+        if stats is None:
+            stats = {"count": 0, "total": 0.0, **dict.fromkeys(PHASES, 0.0)}
+            self._tags[frame.tag] = stats
+        self_time = 0.0
+        for phase, seconds in frame.phases.items():
+            stats[phase] += seconds
+            self_time += seconds
+        stats["count"] += 1
+        stats["total"] += self_time
+        self._nodes[frame.path] = (frame.tag, self_time)
+
+        # Il tempo dei figli non va attribuito al parent
+        if self._stack:
+            self._stack[-1].last = now
+
+    def as_dict(self) -> dict[str, Any]:
+        """Collected timings in seconds: {"tags": {...}, "nodes": {path: (tag, s)}}."""
+        return {
+            "tags": {tag: dict(stats) for tag, stats in self._tags.items()},
+            "nodes": dict(self._nodes),
+        }
+
+    def report(self, limit: int = 20) -> str:
+        """Sorted text report: per tag, then the slowest node paths."""
+        total = sum(stats["total"] for stats in self._tags.values())
+        count = sum(int(stats["count"]) for stats in self._tags.values())
+        lines = [f"Compile profile: {count} nodes, {total * 1000:.1f} ms"]
+        header = f"{'tag':<20}{'count':>7}{'total ms':>11}" + "".join(
+            f"{phase:>11}" for phase in PHASES
+        )
+        lines.append(header)
+        for tag, stats in sorted(self._tags.items(), key=lambda item: -item[1]["total"]):
+            row = f"{tag:<20}{int(stats['count']):>7}{stats['total'] * 1000:>11.2f}"
+            row += "".join(f"{stats[phase] * 1000:>11.2f}" for phase in PHASES)
+            lines.append(row)
+
+        slowest = sorted(self._nodes.items(), key=lambda item: -item[1][1])[:limit]
+        if slowest:
+            lines.append("")
+            lines.append(f"Slowest nodes (self time, top {len(slowest)}):")
+            for path, (tag, seconds) in slowest:
+                lines.append(f"  {seconds * 1000:>9.3f} ms  {tag:<16} {path}")
+        return "\n".join(lines)
+
+
+def enable() -> CompileProfiler:
+    """Enable compile profiling and return the active profiler."""
+    global active
+    if active is None:
+        active = CompileProfiler()
+    return active
+
+
+def disable() -> None:
+    """Disable compile profiling."""
+    global active
+    active = None
+
+
+def enable_from_env() -> CompileProfiler | None:
+    """Apply GENRO_PYGUI_PROFILE: a fresh profiler if set, else profiling disabled.
+
+    Run at import, and again in the children of the warm server, which
+    imported this module before their environment was known.
+    """
+    disable()
+    if os.environ.get(PROFILE_ENV):
+        return enable()
+    return None
+
+
+enable_from_env()
@@ -0,0 +1,229 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""On-disk cache of built recipes.
+
+For large, mostly static recipes, running recipe() and validating every
+element on each launch dominates startup. With the cache enabled the built
+page Bag is stored, with the compile plans of the tags it uses, in a file
+keyed by:
+
+    - the source of the module defining recipe()
+    - the Textual, genro-bag and genro-pygui versions
+    - the app class name
+
+A fresh process with the same key rebuilds the page from the file (no
+recipe code, no builder validation, no signature introspection) and only
+runs compile().
+
+Enable it per app, for every app, or from the CLI:
+
+    class MyApp(TextualApp):
+        use_recipe_cache = True
+
+    GENRO_PYGUI_RECIPE_CACHE=1 python myapp.py
+    pygui run myapp.py --cache
+    pygui clear-cache
+
+Only enable it for recipes that depend on their own source alone: a recipe
+that reads files, the environment, the date or helpers defined in other
+modules will be served stale (edit the app module, or clear the cache, to
+invalidate). Pages whose attributes cannot be pickled (lambdas, open
+resources) are simply not cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from genro_bag import Bag
+
+if TYPE_CHECKING:
+    from genro_pygui.textual_app import TextualApp
+
+RECIPE_CACHE_ENV = "GENRO_PYGUI_RECIPE_CACHE"
+CACHE_DIR_ENV = "GENRO_PYGUI_CACHE_DIR"
+CACHE_DIR = Path(
+    os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "genro_pygui" / "recipes"
+)
+# Bump when the file layout changes
+FORMAT_VERSION = 1
+
+
+def enabled(app_class: type[TextualApp]) -> bool:
+    """True if app_class opted in, or the cache is enabled by environment."""
+    return bool(getattr(app_class, "use_recipe_cache", False)) or os.environ.get(
+        RECIPE_CACHE_ENV, ""
+    ) not in ("", "0")
+
+
+def _package_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def cache_key(app_class: type[TextualApp]) -> str | None:
+    """Key of app_class's cache file, None if its source cannot be read."""
+    try:
+        source_file = inspect.getsourcefile(app_class.recipe)
+        source = Path(source_file).read_bytes() if source_file else None
+    except (OSError, TypeError):
+        source = None
+    if source is None:
+        return None
+
+    h = hashlib.sha256(source)
+    for part in (
+        app_class.__module__,
+        app_class.__qualname__,
+        _package_version("textual"),
+        _package_version("genro-bag"),
+        _package_version("genro-pygui"),
+        str(FORMAT_VERSION),
+    ):
+        h.update(b"\0" + part.encode())
+    return h.hexdigest()
+
+
+def _cache_file(key: str) -> Path:
+    return CACHE_DIR / f"{key}.pkl"
+
+
+# -----------------------------------------------------------------------------
+# Page <-> plain tree
+# -----------------------------------------------------------------------------
+#
+# Una Bag con builder non si può pickleare direttamente: __getstate__ stacca i
+# parent_node della pagina viva e serializza anche il builder (schema, binder).
+# Si salva quindi un albero di tuple (label, tag, attr, value | [figli]).
+# Usato anche da remote.py per trasferire sottoalberi (attach).
+
+
+def dump_page(bag: Bag) -> list[tuple[str, str | None, dict[str, Any], Any, bool]]:
+    """Plain, picklable tree of a page Bag: (label, tag, attr, value | rows, is_bag)."""
+    rows = []
+    for node in bag:
+        value = node.get_value(static=True)
+        is_bag = isinstance(value, Bag)
+        rows.append(
+            (node.label, node.tag, dict(node.attr), dump_page(value) if is_bag else value, is_bag)
+        )
+    return rows
+
+
+def restore_page(bag: Bag, rows: list, builder: Any) -> None:
+    """Append the nodes of a dump_page() tree to bag (no builder validation)."""
+    for label, tag, attr, value, is_bag in rows:
+        if is_bag:
+            # Figli riempiti prima di agganciarli: gli ins non risalgono l'albero
+            child = Bag()
+            child.builder = builder
+            restore_page(child, value, builder)
+            node = bag.set_item(label, child, _attributes=attr)
+        else:
+            node = bag.set_item(label, value, _attributes=attr)
+        node.tag = tag
+
+
+def _page_tags(rows: list, tags: set[str]) -> set[str]:
+    for _label, tag, _attr, value, is_bag in rows:
+        if tag:
+            tags.add(tag)
+        if is_bag:
+            _page_tags(value, tags)
+    return tags
+
+
+def _compile_plans(page: Bag, tags: set[str]) -> dict[str, tuple[type, Any]]:
+    """Widget class and compile plan of each tag (tags without a class skipped)."""
+    builder = page.builder
+    plans = {}
+    for tag in tags:
+        try:
+            widget_class = builder.get_widget_class(tag)
+        except (AttributeError, ImportError, KeyError, ValueError):
+            continue
+        plans[tag] = (widget_class, builder._get_compile_plan(widget_class))
+    return plans
+
+
+# -----------------------------------------------------------------------------
+# Load / save
+# -----------------------------------------------------------------------------
+
+
+def load(app_class: type[TextualApp], page: Bag) -> bool:
+    """Fill the empty page from app_class's cache file. Returns True on a hit."""
+    key = cache_key(app_class)
+    if key is None:
+        return False
+    try:
+        with open(_cache_file(key), "rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception:
+        # File corrotto o classi non più importabili: si ricostruisce
+        return False
+    if entry.get("format") != FORMAT_VERSION or entry.get("key") != key:
+        return False
+
+    builder = page.builder
+    for tag, (widget_class, plan) in entry["plans"].items():
+        builder._widget_classes.setdefault(tag, widget_class)
+        builder._compile_plans.setdefault(widget_class, plan)
+    restore_page(page, entry["page"], builder)
+    return True
+
+
+def save(app_class: type[TextualApp], page: Bag) -> bool:
+    """Write page (just built by recipe()) to app_class's cache file.
+
+    Returns False if the key cannot be computed or the page is not picklable.
+    """
+    key = cache_key(app_class)
+    if key is None:
+        return False
+    rows = dump_page(page)
+    entry = {
+        "format": FORMAT_VERSION,
+        "key": key,
+        "page": rows,
+        "plans": _compile_plans(page, _page_tags(rows, set())),
+    }
+    try:
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, _cache_file(key))
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+        return False
+    return True
+
+
+def clear() -> int:
+    """Delete every cached recipe. Returns the number of files removed."""
+    if not CACHE_DIR.exists():
+        return 0
+    count = 0
+    for path in CACHE_DIR.glob("*.pkl"):
+        path.unlink(missing_ok=True)
+        count += 1
+    return count
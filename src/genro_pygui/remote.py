@@ -8,23 +8,115 @@ Client side:
     from genro_pygui.remote import connect
     app = connect()
     app.page.static("Hello!")
+    app.page["#greeting"]        # node addressed by id attribute
+    tabs = app.page.tabbedcontent()
+    tabs.tabpane("Tab 1").button("Click me")
+
+A whole subtree can be built locally and sent in one round trip; the server
+grafts it and compiles it in a single batch:
+
+    panel = Bag(builder=TextualBuilder)
+    for i in range(500):
+        panel.static(f"row {i}")
+    app.page.attach("main", panel)      # path relative to the proxy, "#id" ok
+
+Tables for a datatable skip pickling on the same host: the columns are
+written in shared memory and only a descriptor is sent (see shm_table.py):
+
+    app.page.load_table("#orders", {"id": ids, "total": totals})
+
+Large containers are read a page at a time; each call does bounded work on
+the server (at most MAX_PAGE_SIZE nodes):
+
+    for label in app.page.iter_keys():            # lazy, page_size per call
+        ...
+    for node in app.data.iter_nodes("clienti"):  # RemoteNode tuples
+        print(node.label, node.attr, node.value)
+
+With cache=True, reads (items, keys, node attributes, iteration pages) are
+cached on the client, tagged with the server's change counter, which every
+response carries. Within max_age seconds of the last exchange a cached read
+costs no round trip; after that one tiny version check revalidates the whole
+cache. Writes made through the proxy return the new version, so they are
+always seen by the next read; changes made by others are seen within max_age.
+A read carries the version from before it ran, so one racing a write is
+never cached as valid for the newer version:
+
+    app = connect("myapp", cache=True, max_age=1.0)
+    app.page["main"]; app.page["main"]          # one round trip
+    app.cache_stats                             # {"hits": 1, "misses": 1, ...}
+
+Bags and BagNodes are never copied to the client: the server keeps them in a
+handle table and returns a RemoteRef, wrapped by the client in a PageProxy
+(Bag) or NodeProxy (BagNode) whose calls target the live object by handle.
+Each reference handed out counts once; when a proxy is garbage collected
+(or release() is called) the release is sent with the next command.
+References belong to the client that received them (the client id prefix
+of the request id): close() - also run at exit - gives back all of a
+client's references, and the server reclaims those of a client that sent
+nothing for HANDLE_IDLE_TIMEOUT seconds (crashed, or a response it never
+read because the call timed out).
 
 Protocol:
     - Each message is prefixed with 4 bytes (big-endian) indicating length
     - Messages are pickle-serialized Python objects
-    - Client sends: (command, *args)
-    - Server responds: (status, result) where status is "ok" or "error"
+    - Client sends: (token, (command, *args), released handles, meta)
+      meta: {"id": request id, "timeout": seconds | None, "lane": lane,
+             "keepalive": True to keep the connection open for the next one}
+    - Server responds: ("ok", result, version) or ("error", message)
+    - connect() reuses connections through a process-wide pool (see
+      connection_pool.py); RemoteProxy(...) alone opens one per call. A
+      reused connection found closed is retried on a new one only if the
+      request was not fully sent, or is a read carrying no released handles
+    - with tracing enabled, meta["trace"] carries the trace id (tracing.py)
     - Token authentication required for all commands
+
+UI events (button presses, changes, selections, keys) are pushed to
+subscribers over one persistent connection, in batches (see events.py):
+
+    with app.subscribe(events={"button_pressed"}, ids={"save"}) as stream:
+        for batch in stream:
+            for event in batch:
+                print(event.event, event.node_id, event.value)
+
+Deadlines, cancellation and lanes:
+    - every request carries a timeout (RemoteProxy.timeout, default 30 s):
+      the client stops waiting after it, the server drops the request if it
+      expires while queued, before it reaches the UI thread
+    - proxy.cancel() from another thread aborts the calls in flight and
+      tells the server to drop them
+    - requests are served by one worker per lane: "interactive" (default,
+      REPL) never waits behind "bulk" (connect(lane="bulk") in scripts;
+      attach() always uses it)
+    - request frames are read by READERS reader threads, not by the thread
+      accepting connections: a slow client or a large upload does not hold
+      back the requests of the other lanes
 """
 
 from __future__ import annotations
 
+import atexit
+import itertools
 import pickle
+import queue
 import secrets
+import selectors
 import socket
 import struct
 import threading
-from typing import TYPE_CHECKING, Any, Callable
+import time
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from genro_bag import Bag
+from genro_bag.bagnode import BagNode
+
+from genro_pygui import tracing
+from genro_pygui.connection_pool import ConnectionPool, shared_pool
+from genro_pygui.events import Subscription, UIEvent
+from genro_pygui.recipe_cache import dump_page, restore_page
 
 if TYPE_CHECKING:
     from genro_pygui.textual_app import TextualApp
@@ -33,6 +125,36 @@ if TYPE_CHECKING:
 FRAME_HEADER_SIZE = 4
 FRAME_HEADER_FORMAT = ">I"  # unsigned int, big-endian
 MAX_MESSAGE_SIZE = 16 * 1024 * 1024  # 16MB max
+# Cursor iteration: default and maximum entries per call
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+# Handle of the data Bag (None is the page)
+DATA_HANDLE = 0
+# Client read cache: seconds a cached read is trusted without a version check
+DEFAULT_MAX_AGE = 1.0
+# Seconds a request may take, from the client's point of view
+DEFAULT_TIMEOUT = 30.0
+# Seconds allowed to a client to send its request frame
+READ_TIMEOUT = 10.0
+# Threads reading request frames: a slow client holds only one of them
+READERS = 8
+# Seconds an idle keepalive connection is kept open by the server
+KEEPALIVE_TIMEOUT = 60.0
+# Seconds without requests after which the server reclaims a client's handles
+HANDLE_IDLE_TIMEOUT = 600.0
+# Seconds allowed to the close() of each proxy at interpreter exit
+EXIT_TIMEOUT = 2.0
+# Read-only commands: answered with the version read before running them
+READ_COMMANDS = frozenset(
+    {"__keys__", "__len__", "__iter_keys__", "__iter_nodes__", "__getitem__", "__get__"}
+)
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+# Seconds between two batches of an idle event stream (empty: keep-alive)
+HEARTBEAT = 5.0
+# Hosts for which load_table() uses shared memory by default
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
 
 
 def _send_framed(sock: socket.socket, data: bytes) -> None:
@@ -65,81 +187,626 @@ def _recv_exact(sock: socket.socket, n: int) -> bytes | None:
     return bytes(data)
 
 
+def _client_of(request_id: str) -> str:
+    """Client id of a request id ("{client id}:{n}")."""
+    return request_id.rpartition(":")[0]
+
+
+class RemoteRef(NamedTuple):
+    """Reference to a server-side object: a handle (None = the page) and its kind."""
+
+    handle: int | None
+    kind: str
+
+
+class RemoteNode(NamedTuple):
+    """A node as listed by iter_nodes(): children is None for leaves."""
+
+    label: str
+    tag: str | None
+    attr: dict[str, Any]
+    value: Any
+    children: int | None
+
+
 class RemoteProxy:
     """Proxy that sends method calls to remote TextualApp."""
 
-    def __init__(self, host: str = "localhost", port: int = 9999, token: str = "") -> None:
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 9999,
+        token: str = "",
+        cache: bool = False,
+        max_age: float = DEFAULT_MAX_AGE,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        lane: str = INTERACTIVE,
+        pool: ConnectionPool | None = None,
+    ) -> None:
+        if lane not in LANES:
+            raise ValueError(f"lane must be one of {LANES}, got {lane!r}")
         self._host = host
         self._port = port
         self._token = token
+        self.timeout = timeout
+        self.lane = lane
+        # Con un pool le connessioni restano aperte tra una chiamata e l'altra
+        self._pool = pool
+        # Richieste in corso (anche da più thread): id -> socket, per cancel()
+        # Id univoci tra client diversi: il server riceve le cancellazioni di tutti
+        self._client_id = secrets.token_hex(8)
+        self._ids = itertools.count(1)
+        self._inflight: dict[str, socket.socket] = {}
+        self._cancelled: set[str] = set()
+        # Handle rilasciati dai proxy (anche dal GC): partono col comando successivo
+        self._released: deque[int] = deque()
+        # Vero dopo il primo handle ricevuto: close() ha qualcosa da restituire
+        self._holds_handles = False
+        _proxies.add(self)
+        # Read cache: command -> (server version, result)
+        self.cache = cache
+        self.max_age = max_age
+        self._cache: dict[tuple, tuple[int, Any]] = {}
+        self._version: int | None = None
+        self._seen_at = 0.0
+        # Versione dell'ultima risposta ricevuta da ciascun thread
+        self._response = threading.local()
+        self.cache_stats = {"hits": 0, "misses": 0, "checks": 0}
 
-    def _send(self, cmd: tuple) -> Any:
-        """Send command and receive result."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    def _send(self, cmd: tuple, lane: str | None = None) -> Any:
+        """Send command and receive result (TimeoutError after self.timeout)."""
+        released = []
+        # popleft è atomico: un finalizer di un altro thread non perde rilasci
+        while self._released:
+            released.append(self._released.popleft())
+        request_id = f"{self._client_id}:{next(self._ids)}"
+        timeout = self.timeout
+        meta = {"id": request_id, "timeout": timeout, "lane": lane or self.lane}
+        if self._pool is not None:
+            meta["keepalive"] = True
+        tracer = tracing.active
+        if tracer is not None:
+            meta["trace"] = request_id
+            started = tracing.now()
+        # Send auth token + command + released handles + deadline/lane
+        message = pickle.dumps((self._token, cmd, released, meta))
+        # Letture senza rilasci: eseguirle due volte non cambia nulla sul server
+        replayable = cmd[0] in READ_COMMANDS and not released
+        sock = None
         try:
-            sock.connect((self._host, self._port))
-            # Send auth token + command
-            message = (self._token, cmd)
-            _send_framed(sock, pickle.dumps(message))
-            # Receive response
-            response_data = _recv_framed(sock)
+            while True:
+                try:
+                    sock, reused = self._open(timeout)
+                except OSError:
+                    self._released.extend(released)
+                    raise
+                self._inflight[request_id] = sock
+                sent = False
+                try:
+                    _send_framed(sock, message)
+                    sent = True
+                    response_data = _recv_framed(sock)
+                except (BrokenPipeError, ConnectionResetError):
+                    if not reused or request_id in self._cancelled:
+                        raise
+                    response_data = None
+                # Connessione riusata chiusa dal server: si riprova su un'altra solo
+                # se la richiesta non è arrivata intera, o se ripeterla è innocuo
+                if (
+                    response_data is None
+                    and reused
+                    and request_id not in self._cancelled
+                    and (not sent or replayable)
+                ):
+                    sock.close()
+                    continue
+                break
             if response_data is None:
                 raise ConnectionError("Connection closed by server")
-            status, result = pickle.loads(response_data)  # noqa: S301
+            status, result, *version = pickle.loads(response_data)  # noqa: S301
+            if self._pool is not None:
+                # Risposta letta per intero: la connessione è riutilizzabile
+                self._inflight.pop(request_id, None)
+                self._pool.release(self._host, self._port, sock)
+                sock = None
             if status == "error":
                 raise RuntimeError(f"Remote error: {result}")
-            return result
+            self._response.version = version[0] if version else None
+            if version:
+                self._seen(version[0])
+            return self._wrap(result)
+        except socket.timeout:
+            raise TimeoutError(f"Remote call {cmd[0]} timed out after {timeout}s") from None
+        except OSError:
+            if request_id in self._cancelled:
+                raise RuntimeError(f"Remote call {cmd[0]} cancelled") from None
+            raise
         finally:
+            self._inflight.pop(request_id, None)
+            self._cancelled.discard(request_id)
+            if sock is not None:
+                sock.close()
+            if tracer is not None:
+                name = f"remote {tracing.command_name(cmd)}"
+                ended = tracing.now()
+                tracer.complete(name, "client", started, ended, request_id, lane=meta["lane"])
+                tracer.flow(request_id, started, start=True)
+
+    def _open(self, timeout: float | None) -> tuple[socket.socket, bool]:
+        """A connection for one request: (socket, reused from the pool)."""
+        if self._pool is not None:
+            return self._pool.acquire(self._host, self._port, timeout)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect((self._host, self._port))
+        except OSError:
             sock.close()
+            raise
+        return sock, False
+
+    def cancel(self) -> int:
+        """Abort the calls in flight (from another thread). Returns how many.
+
+        The waiting callers get RuntimeError; the server drops the requests
+        that have not reached the UI thread yet.
+        """
+        inflight = dict(self._inflight)
+        if not inflight:
+            return 0
+        self._cancelled.update(inflight)
+        for sock in inflight.values():
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        try:
+            self._send(("__cancel__", list(inflight)), lane=INTERACTIVE)
+        except (OSError, RuntimeError):
+            pass
+        return len(inflight)
+
+    def _seen(self, version: int) -> None:
+        """Record the server version carried by a response.
+
+        The version only moves forward: a read answered before a write of
+        another thread carries the older one and must not roll it back.
+        """
+        if self._version is None or version > self._version:
+            self._version = version
+            self._cache.clear()
+        self._seen_at = time.monotonic()
+
+    def _read(self, cmd: tuple) -> Any:
+        """Send a read-only command, answering from the cache when still valid."""
+        if not self.cache:
+            return self._send(cmd)
+        entry = self._cache.get(cmd)
+        if entry is not None and time.monotonic() - self._seen_at > self.max_age:
+            # Una sola verifica di versione rivalida tutta la cache
+            self.cache_stats["checks"] += 1
+            self._send(("__version__",))
+            entry = self._cache.get(cmd)
+        if entry is not None and entry[0] == self._version:
+            self.cache_stats["hits"] += 1
+            return entry[1]
+        self.cache_stats["misses"] += 1
+        result = self._send(cmd)
+        version = getattr(self._response, "version", None)
+        if version is not None and version == self._version:
+            # Letta a una versione più vecchia: non vale per quella corrente
+            self._cache[cmd] = (version, result)
+        return result
+
+    def clear_cache(self) -> None:
+        """Forget every cached read."""
+        self._cache.clear()
+
+    def _wrap(self, result: Any) -> Any:
+        """Turn a RemoteRef in a result into a proxy owning that reference."""
+        if not isinstance(result, RemoteRef) or result.handle is None:
+            return result
+        self._holds_handles = True
+        proxy_class = NodeProxy if result.kind == "node" else PageProxy
+        return proxy_class(self, result.handle)
 
     @property
     def page(self) -> PageProxy:
         """Return proxy for page Bag."""
         return PageProxy(self)
 
+    @property
+    def data(self) -> PageProxy:
+        """Return proxy for the data Bag."""
+        return PageProxy(self, DATA_HANDLE)
+
+    def _release_handle(self, handle: int) -> None:
+        """Queue the release of a handle (proxy finalizer, any thread)."""
+        self._released.append(handle)
+
+    def release(self) -> None:
+        """Send the pending handle releases now (they normally ride on the next command)."""
+        if self._released:
+            self._send(("__release__",))
+
+    def close(self) -> None:
+        """Give back every handle this client holds, pending releases included.
+
+        Proxies obtained before close() stop working; the RemoteProxy itself
+        can still be used. Called at exit for the proxies holding handles.
+        The read cache is emptied: its proxies point at released handles.
+        """
+        self._cache.clear()
+        if self._holds_handles:
+            self._send(("__close__",))
+            self._holds_handles = False
+            self._released.clear()
+
+    def stats(self, reset: bool = False) -> dict[str, Any]:
+        """The app's update, frame, resolver and server counters."""
+        return self._send(("__stats__", reset))
+
+    def handles(self) -> int:
+        """Number of handles held by the server (all clients)."""
+        return self._send(("__handles__",))
+
+    def profile(self, reset: bool = False) -> str:
+        """Return the remote app's compile profile report (empty if disabled)."""
+        return self._send(("__profile__", reset))
 
-class PageProxy:
-    """Proxy for page Bag - forwards all method calls."""
+    def start_trace(self) -> None:
+        """Enable tracing in the app, discarding the events recorded so far."""
+        self._send(("__trace__", True, True))
 
-    def __init__(self, remote: RemoteProxy) -> None:
+    def trace(self, reset: bool = False) -> list[dict[str, Any]]:
+        """The app's trace events (Chrome format, see tracing.py)."""
+        return self._send(("__trace__", None, reset))
+
+    def stop_trace(self) -> list[dict[str, Any]]:
+        """Disable tracing in the app and return its trace events."""
+        return self._send(("__trace__", False, True))
+
+    def subscribe(
+        self,
+        events: Iterable[str] | None = None,
+        ids: Iterable[str] | None = None,
+        tags: Iterable[str] | None = None,
+        callback: Callable[[list[UIEvent]], Any] | None = None,
+    ) -> EventStream:
+        """Open a persistent connection receiving the app's UI events in batches.
+
+        Filters by event name, node id and tag (None = any, see events.py).
+        Iterate the stream, or pass callback(batch) to have it called on a
+        background thread. close() ends the subscription.
+        """
+        filters = {
+            "events": list(events) if events is not None else None,
+            "ids": list(ids) if ids is not None else None,
+            "tags": list(tags) if tags is not None else None,
+        }
+        return EventStream(self, filters, callback)
+
+
+# RemoteProxy vivi, chiusi all'uscita se hanno handle sul server
+_proxies: weakref.WeakSet[RemoteProxy] = weakref.WeakSet()
+
+
+@atexit.register
+def _close_proxies() -> None:
+    """Give back the handles of the live proxies (the server may be gone already)."""
+    for proxy in list(_proxies):
+        if not proxy._holds_handles:
+            continue
+        proxy.timeout = EXIT_TIMEOUT
+        try:
+            proxy.close()
+        except (OSError, RuntimeError):
+            pass
+
+
+class EventStream:
+    """Persistent connection on which the server pushes UI event batches."""
+
+    def __init__(
+        self,
+        remote: RemoteProxy,
+        filters: dict[str, Any],
+        callback: Callable[[list[UIEvent]], Any] | None = None,
+    ) -> None:
+        self.filters = filters
+        self.dropped = 0
+        self.closed = False
+        self.error: Exception | None = None
+        sock = socket.create_connection((remote._host, remote._port), timeout=remote.timeout)
+        try:
+            meta = {"id": "", "timeout": None, "lane": INTERACTIVE}
+            _send_framed(sock, pickle.dumps((remote._token, ("__subscribe__", filters), [], meta)))
+            response = _recv_framed(sock)
+            if response is None:
+                raise ConnectionError("Connection closed by server")
+            status, result, *_ = pickle.loads(response)  # noqa: S301
+            if status == "error":
+                raise RuntimeError(f"Remote error: {result}")
+        except BaseException:
+            sock.close()
+            raise
+        # Il server manda un heartbeat ogni HEARTBEAT secondi: oltre, è caduto
+        sock.settimeout(HEARTBEAT * 3)
+        self._sock = sock
+        self._thread: threading.Thread | None = None
+        if callback is not None:
+            self._thread = threading.Thread(
+                target=self._run, args=(callback,), name="remote-events", daemon=True
+            )
+            self._thread.start()
+
+    def __enter__(self) -> EventStream:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[list[UIEvent]]:
+        """Non-empty batches until close() (heartbeats are skipped)."""
+        while not self.closed:
+            try:
+                batch = self.read()
+            except ConnectionError:
+                if self.closed:
+                    return
+                raise
+            if batch:
+                yield batch
+
+    def read(self) -> list[UIEvent]:
+        """Next batch, [] for a heartbeat. ConnectionError when the stream ends."""
+        try:
+            data = _recv_framed(self._sock)
+        except socket.timeout:
+            raise TimeoutError("No heartbeat from the event stream") from None
+        except OSError:
+            if self.closed:
+                raise ConnectionError("Event stream closed") from None
+            raise
+        if data is None:
+            raise ConnectionError("Event stream closed by server")
+        _, batch, self.dropped = pickle.loads(data)  # noqa: S301
+        return batch
+
+    def _run(self, callback: Callable[[list[UIEvent]], Any]) -> None:
+        try:
+            for batch in self:
+                callback(batch)
+        except Exception as e:
+            self.error = e
+
+    def close(self) -> None:
+        """End the subscription (the server notices at its next send)."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+def _encode(value: Any) -> Any:
+    """Proxies passed as arguments travel as references to their object."""
+    if isinstance(value, _HandleProxy):
+        return value._ref
+    return value
+
+
+class _HandleProxy:
+    """Client side of a server object: calls are forwarded by handle."""
+
+    _kind = "bag"
+
+    def __init__(self, remote: RemoteProxy, handle: int | None = None) -> None:
         self._remote = remote
+        self._ref = RemoteRef(handle, self._kind)
+        self._finalizer = None
+        if handle is not None and handle != DATA_HANDLE:
+            self._finalizer = weakref.finalize(self, remote._release_handle, handle)
 
     def __getattr__(self, name: str) -> Any:
-        """Forward method calls to remote page."""
+        """Forward method calls to the remote object."""
+        if name.startswith("__"):
+            raise AttributeError(name)
 
         def method(*args: Any, **kwargs: Any) -> Any:
-            return self._remote._send(("__call__", name, args, kwargs))
+            args = tuple(_encode(arg) for arg in args)
+            kwargs = {key: _encode(arg) for key, arg in kwargs.items()}
+            return self._remote._send(("__call__", self._ref.handle, name, args, kwargs))
 
         return method
 
+    def __repr__(self) -> str:
+        target = "page" if self._ref.handle is None else f"#{self._ref.handle}"
+        return f"<{type(self).__name__} {target}>"
+
+    def _get(self, name: str) -> Any:
+        return self._remote._read(("__get__", self._ref.handle, name))
+
+    def attach(self, path: str, bag: Bag) -> list[str]:
+        """Append bag's nodes under the container at path, in one round trip.
+
+        path is relative to this proxy ("" = itself) or "#id". bag is built
+        locally, usually Bag(builder=TextualBuilder). Returns the labels the
+        nodes got on the server (renamed if already taken).
+        """
+        return self._remote._send(
+            ("__attach__", self._ref.handle, path, dump_page(bag)), lane=BULK
+        )
+
+    def load_table(
+        self, path: str, columns: dict[str, Any], replace: bool = True, shared: bool | None = None
+    ) -> int:
+        """Load columns (label -> values) into the datatable at path; returns its rows.
+
+        On the same host the table goes through shared memory and only a small
+        descriptor is sent (see shm_table.py); otherwise it is pickled in the
+        request, within MAX_MESSAGE_SIZE. shared=None picks by host. With
+        replace the table's columns and rows are cleared first, otherwise
+        rows are appended (columns are added if the table has none).
+        """
+        if shared is None:
+            shared = self._remote._host in LOCAL_HOSTS
+        if not shared:
+            table = {str(label): list(values) for label, values in columns.items()}
+            return self._remote._send(
+                ("__load_table__", self._ref.handle, path, "columns", table, replace), lane=BULK
+            )
+        from genro_pygui.shm_table import write_table
+
+        shm, descriptor = write_table(columns)
+        try:
+            return self._remote._send(
+                ("__load_table__", self._ref.handle, path, "shm", descriptor, replace),
+                lane=BULK,
+            )
+        finally:
+            # Il server ha già letto il blocco quando risponde (o non lo leggerà più)
+            shm.close()
+            shm.unlink()
+
+    def release(self) -> None:
+        """Drop this reference (the server frees the object after the last one)."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+class PageProxy(_HandleProxy):
+    """Proxy for the page Bag, or one of its sub-Bags - forwards all method calls."""
+
     def keys(self) -> list[str]:
-        """Get keys from remote Bag."""
-        return self._remote._send(("__keys__",))
+        """Get keys from remote Bag (fetched page by page, see iter_keys)."""
+        return list(self.iter_keys())
+
+    def __len__(self) -> int:
+        return self._remote._read(("__len__", self._ref.handle))
+
+    def __iter__(self) -> Iterator[RemoteNode]:
+        return self.iter_nodes()
+
+    def _iterate(self, command: str, path: str, page_size: int) -> Iterator[Any]:
+        cursor = None
+        while True:
+            items, cursor = self._remote._read(
+                (command, self._ref.handle, path, cursor, page_size)
+            )
+            yield from items
+            if cursor is None:
+                return
+
+    def iter_keys(self, path: str = "", page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[str]:
+        """Labels of the container at path ("" = this Bag), page_size per request."""
+        return self._iterate("__iter_keys__", path, page_size)
+
+    def iter_nodes(
+        self, path: str = "", page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[RemoteNode]:
+        """Nodes of the container at path as RemoteNode, page_size per request.
+
+        Sub-Bags are not sent: their size is in children, use proxy[label]
+        to descend. Resolvers are not evaluated (value is the cached one).
+        """
+        return self._iterate("__iter_nodes__", path, page_size)
 
     def __getitem__(self, key: str) -> Any:
-        """Get item from remote Bag."""
-        return self._remote._send(("__getitem__", key))
+        """Get item from remote Bag (sub-Bags come back as PageProxy)."""
+        return self._remote._read(("__getitem__", self._ref.handle, key))
 
     def __setitem__(self, key: str, value: Any) -> None:
         """Set item on remote Bag."""
-        self._remote._send(("__setitem__", key, value))
+        self._remote._send(("__setitem__", self._ref.handle, key, _encode(value)))
+
+
+class NodeProxy(_HandleProxy):
+    """Proxy for a page BagNode (e.g. returned by a builder method)."""
+
+    _kind = "node"
+
+    @property
+    def label(self) -> str:
+        """The node's label."""
+        return self._get("label")
+
+    @property
+    def tag(self) -> str | None:
+        """The node's builder tag."""
+        return self._get("tag")
+
+    @property
+    def attr(self) -> dict[str, Any]:
+        """A copy of the node's attributes."""
+        return self._get("attr")
+
+    @property
+    def value(self) -> Any:
+        """The node's value (a sub-Bag comes back as PageProxy)."""
+        return self._get("value")
 
 
 def connect(
-    name: str | None = None, host: str = "localhost", port: int | None = None, token: str = ""
+    name: str | None = None,
+    host: str = "localhost",
+    port: int | None = None,
+    token: str = "",
+    cache: bool = False,
+    max_age: float = DEFAULT_MAX_AGE,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    lane: str = INTERACTIVE,
+    pool: ConnectionPool | bool = True,
 ) -> RemoteProxy:
-    """Connect to a remote TextualApp by name or port."""
+    """Connect to a remote TextualApp by name or port (options: see the module docstring).
+
+    pool=True shares the process-wide connection pool (see connection_pool.py),
+    pool=False opens a connection per call, or pass a ConnectionPool.
+    """
+    connections = shared_pool() if pool is True else pool or None
     if name is not None:
-        from genro_pygui.registry import get_app_info
+        if connections is not None:
+            port, token = connections.resolve(name)
+        else:
+            from genro_pygui.registry import get_app_info
 
-        info = get_app_info(name)
-        if info is None:
-            raise ValueError(f"App '{name}' not found in registry")
-        port = info["port"]
-        token = info.get("token", "")
+            info = get_app_info(name)
+            if info is None:
+                raise ValueError(f"App '{name}' not found in registry")
+            port = info["port"]
+            token = info.get("token", "")
     elif port is None:
         port = 9999
-    return RemoteProxy(host, port, token)
+    return RemoteProxy(
+        host,
+        port,
+        token,
+        cache=cache,
+        max_age=max_age,
+        timeout=timeout,
+        lane=lane,
+        pool=connections,
+    )
+
+
+class _Request(NamedTuple):
+    """A request read from a connection, waiting in its lane."""
+
+    conn: socket.socket
+    token: str
+    cmd: tuple
+    released: list[int]
+    request_id: str
+    deadline: float | None
+    keepalive: bool = False
+    trace: str | None = None
+    # Arrivo (µs, tracing.now()) se il tracing è attivo, per il tempo in coda
+    received: float = 0.0
 
 
 class RemoteServer:
@@ -151,6 +818,31 @@ class RemoteServer:
         self._thread: threading.Thread | None = None
         self._running = False
         self._token = secrets.token_hex(16)
+        # handle -> [Bag | BagNode, {client id: riferimenti consegnati}]
+        self._handles: dict[int, list[Any]] = {}
+        self._handle_of: dict[int, int] = {}
+        # client id -> handle che tiene, e ultima richiesta ricevuta
+        self._client_handles: dict[str, set[int]] = {}
+        self._client_seen: dict[str, float] = {}
+        self._next_handle = 1
+        self._handles_lock = threading.Lock()
+        # Contatore delle modifiche a pagina e dati, inviato con ogni risposta
+        self._version = 0
+        self._watched: tuple[Bag, Bag] | None = None
+        # Una coda e un worker per lane: le chiamate interattive non aspettano i bulk
+        self._lanes: dict[str, queue.Queue[_Request | None]] = {
+            lane: queue.Queue() for lane in LANES
+        }
+        # Connessioni con una richiesta da leggere, per i thread reader
+        self._unread: queue.Queue[socket.socket | None] = queue.Queue()
+        self._cancelled: dict[str, float] = {}
+        self._local = threading.local()
+        self.dropped = 0
+        self._streams: set[Subscription] = set()
+        # Connessioni keepalive servite, da rimettere nel selector
+        self._kept: deque[socket.socket] = deque()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_send.setblocking(False)
 
     @property
     def token(self) -> str:
@@ -162,81 +854,615 @@ class RemoteServer:
         self._running = True
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
+        for lane, requests in self._lanes.items():
+            threading.Thread(
+                target=self._serve_lane, args=(requests,), name=f"remote-{lane}", daemon=True
+            ).start()
+        for _ in range(READERS):
+            threading.Thread(target=self._read_requests, name="remote-reader", daemon=True).start()
 
     def stop(self) -> None:
         """Stop the server."""
         self._running = False
+        for requests in self._lanes.values():
+            requests.put(None)
+        for _ in range(READERS):
+            self._unread.put(None)
+        for subscription in list(self._streams):
+            self._app.events.unsubscribe(subscription)
+
+    def _stream(self, conn: socket.socket, token: str, filters: dict[str, Any]) -> None:
+        """Push UI event batches to a subscribed client until it goes away."""
+        if token != self._token:
+            try:
+                _send_framed(conn, pickle.dumps(("error", "Invalid authentication token")))
+            except OSError:
+                pass
+            conn.close()
+            return
+        events = self._app.events
+        subscription = events.subscribe(**filters)
+        self._streams.add(subscription)
+        try:
+            _send_framed(conn, pickle.dumps(("ok", None, self.version)))
+            # Un client che non legge più non blocca il thread per sempre
+            conn.settimeout(HEARTBEAT * 3)
+            while self._running and not subscription.closed:
+                batch = subscription.get_batch(HEARTBEAT)
+                _send_framed(conn, pickle.dumps(("events", batch, subscription.dropped)))
+        except OSError:
+            pass
+        finally:
+            self._streams.discard(subscription)
+            events.unsubscribe(subscription)
+            conn.close()
 
     def _run(self) -> None:
-        """Run the socket server."""
+        """Run the socket server.
+
+        One selector watches the listening socket and the idle keepalive
+        connections: a connection is handed to the readers when its next
+        request arrives, and closed after KEEPALIVE_TIMEOUT seconds without
+        one. The frames are never read here.
+        """
         server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server.bind(("localhost", self._port))
         server.listen(50)  # Increased backlog
-        server.settimeout(1.0)
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ)
+        selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        idle: dict[socket.socket, float] = {}
 
         while self._running:
             try:
-                conn, _ = server.accept()
-                self._handle_connection(conn)
-            except socket.timeout:
-                continue
+                ready = selector.select(timeout=1.0)
+                for key, _ in ready:
+                    sock = key.fileobj
+                    if sock is server:
+                        conn, _ = server.accept()
+                        self._unread.put(conn)
+                    elif sock is self._wakeup_recv:
+                        # Connessioni servite che tornano in attesa della prossima richiesta
+                        self._wakeup_recv.recv(4096)
+                        while self._kept:
+                            conn = self._kept.popleft()
+                            selector.register(conn, selectors.EVENT_READ)
+                            idle[conn] = time.monotonic()
+                    else:
+                        selector.unregister(sock)
+                        del idle[sock]
+                        self._unread.put(sock)
+                now = time.monotonic()
+                for conn in [c for c, since in idle.items() if now - since > KEEPALIVE_TIMEOUT]:
+                    selector.unregister(conn)
+                    del idle[conn]
+                    conn.close()
+                self._expire_clients(now)
             except Exception:
                 break
 
+        for conn in idle:
+            conn.close()
+        selector.close()
         server.close()
 
+    def _keep(self, conn: socket.socket) -> None:
+        """Hand a served keepalive connection back to the selector loop."""
+        self._kept.append(conn)
+        try:
+            self._wakeup_send.send(b"\0")
+        except BlockingIOError:
+            # Buffer pieno: il loop è già stato svegliato
+            pass
+
+    def _read_requests(self) -> None:
+        """Reader thread: read the request of each connection handed over."""
+        while True:
+            conn = self._unread.get()
+            if conn is None:
+                return
+            self._handle_connection(conn)
+
     def _handle_connection(self, conn: socket.socket) -> None:
-        """Handle a single connection."""
+        """Read a request and queue it in its lane (cancels are applied at once)."""
         try:
+            conn.settimeout(READ_TIMEOUT)
             data = _recv_framed(conn)
             if data is None:
+                conn.close()
+                return
+            token, cmd, released, meta = pickle.loads(data)  # noqa: S301
+            conn.settimeout(None)
+        except Exception:
+            conn.close()
+            return
+        timeout = meta.get("timeout")
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        request = _Request(
+            conn,
+            token,
+            cmd,
+            released,
+            meta.get("id", ""),
+            deadline,
+            bool(meta.get("keepalive")),
+            meta.get("trace"),
+            tracing.now() if tracing.active is not None else 0.0,
+        )
+        if cmd[0] == "__subscribe__":
+            # Connessione persistente: un thread per stream, fuori dalle lane
+            threading.Thread(
+                target=self._stream, args=(conn, token, cmd[1]), name="remote-events", daemon=True
+            ).start()
+            return
+        if cmd[0] == "__cancel__" and token == self._token:
+            self._serve(request)
+            return
+        lane = meta.get("lane")
+        self._lanes[lane if lane in self._lanes else INTERACTIVE].put(request)
+
+    def _serve_lane(self, requests: queue.Queue[_Request | None]) -> None:
+        while True:
+            request = requests.get()
+            if request is None:
                 return
-            token, cmd = pickle.loads(data)  # noqa: S301
+            self._serve(request)
+
+    def _expired(self, request: _Request) -> str | None:
+        """Why request must not run any more, or None."""
+        if request.request_id in self._cancelled:
+            return "cancelled"
+        if request.deadline is not None and time.monotonic() > request.deadline:
+            return "deadline exceeded"
+        return None
+
+    def _serve(self, request: _Request) -> None:
+        """Run a request and send the response (traced if tracing is enabled)."""
+        tracer = tracing.active
+        if tracer is None:
+            self._respond(request)
+            return
+        trace_id = request.trace or request.request_id
+        start = tracing.now()
+        if request.received:
+            tracer.complete("lane wait", "server", request.received, start, trace_id)
+        with tracer.context(trace_id):
+            self._respond(request)
+        tracer.complete(
+            f"serve {tracing.command_name(request.cmd)}", "server", start, tracing.now(), trace_id
+        )
+        tracer.flow(trace_id, start, start=False)
+
+    def _respond(self, request: _Request) -> None:
+        """Run a request and send the response."""
+        conn = request.conn
+        try:
             # Verify token
-            if token != self._token:
+            if request.token != self._token:
                 response = ("error", "Invalid authentication token")
+            elif (reason := self._expired(request)) is not None:
+                # Scaduta in coda: non arriva al thread della UI
+                self.dropped += 1
+                response = ("error", reason)
             else:
-                result = self._handle_command(cmd)
-                response = ("ok", result)
-            _send_framed(conn, pickle.dumps(response))
+                client = _client_of(request.request_id)
+                self._release(request.released, client)
+                # Una lettura porta la versione letta prima di eseguirla: se una
+                # scrittura la supera nel frattempo, il client non la mette in cache
+                # come valida per la versione nuova
+                version = self.version if request.cmd[0] in READ_COMMANDS else None
+                self._local.request = request
+                try:
+                    result = self._export(self._handle_command(request.cmd), client)
+                finally:
+                    self._local.request = None
+                response = ("ok", result, self.version if version is None else version)
+            try:
+                _send_framed(conn, pickle.dumps(response))
+            except OSError:
+                if response[0] == "ok" and isinstance(response[1], RemoteRef):
+                    # Il client non riceverà il riferimento: non resta appeso
+                    self._release([response[1].handle], client)
+                raise
+            sent = True
         except Exception as e:
             try:
                 _send_framed(conn, pickle.dumps(("error", str(e))))
+                sent = True
             except Exception:
-                pass
-        finally:
+                sent = False
+        # Keepalive: la connessione aspetta la prossima richiesta del client
+        if sent and request.keepalive and request.token == self._token:
+            self._keep(conn)
+        else:
             conn.close()
 
+    # -------------------------------------------------------------------------
+    # Version
+    # -------------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every change of the page or data Bag."""
+        page, data = self._app.page, self._app.data
+        watched = self._watched
+        if watched is None or watched[0] is not page or watched[1] is not data:
+            # Prima richiesta, o pagina sostituita da reload_recipe()
+            if watched is not None:
+                for bag in watched:
+                    bag.unsubscribe("_remoteserver", any=True)
+            page.subscribe("_remoteserver", any=self._bump)
+            data.subscribe("_remoteserver", any=self._bump)
+            self._watched = (page, data)
+            self._version += 1
+        return self._version
+
+    def _bump(self, **kw: Any) -> None:
+        self._version += 1
+
+    # -------------------------------------------------------------------------
+    # Handle table
+    # -------------------------------------------------------------------------
+
+    def _export(self, result: Any, client: str) -> Any:
+        """Replace a Bag / BagNode result with a reference counted for client."""
+        if isinstance(result, Bag):
+            if result is self._app.page:
+                return RemoteRef(None, "bag")
+            if result is self._app.data:
+                return RemoteRef(DATA_HANDLE, "bag")
+            kind = "bag"
+        elif isinstance(result, BagNode):
+            kind = "node"
+        else:
+            return result
+        with self._handles_lock:
+            handle = self._handle_of.get(id(result))
+            if handle is None:
+                handle = self._next_handle
+                self._next_handle += 1
+                self._handles[handle] = [result, {}]
+                self._handle_of[id(result)] = handle
+            refs = self._handles[handle][1]
+            refs[client] = refs.get(client, 0) + 1
+            self._client_handles.setdefault(client, set()).add(handle)
+            self._client_seen[client] = time.monotonic()
+        return RemoteRef(handle, kind)
+
+    def _release(self, handles: list[int], client: str) -> None:
+        """Drop one of client's references per handle; the object is forgotten at zero."""
+        with self._handles_lock:
+            if client in self._client_seen:
+                self._client_seen[client] = time.monotonic()
+            for handle in handles:
+                entry = self._handles.get(handle)
+                if entry is None or client not in entry[1]:
+                    continue
+                entry[1][client] -= 1
+                if entry[1][client] <= 0:
+                    self._drop_reference(handle, client)
+
+    def _drop_reference(self, handle: int, client: str) -> None:
+        """Forget all of client's references to handle (lock held)."""
+        entry = self._handles[handle]
+        del entry[1][client]
+        handles = self._client_handles.get(client)
+        if handles is not None:
+            handles.discard(handle)
+            if not handles:
+                del self._client_handles[client]
+                del self._client_seen[client]
+        if not entry[1]:
+            del self._handles[handle]
+            del self._handle_of[id(entry[0])]
+
+    def release_client(self, client: str) -> int:
+        """Drop every reference held by client. Returns how many handles it held."""
+        with self._handles_lock:
+            handles = list(self._client_handles.get(client, ()))
+            for handle in handles:
+                self._drop_reference(handle, client)
+        return len(handles)
+
+    def _expire_clients(self, now: float) -> None:
+        """Reclaim the handles of clients idle for more than HANDLE_IDLE_TIMEOUT."""
+        expired = [
+            client
+            for client, seen in list(self._client_seen.items())
+            if now - seen > HANDLE_IDLE_TIMEOUT
+        ]
+        for client in expired:
+            self.release_client(client)
+
+    def _target(self, handle: int | None) -> Any:
+        """Object addressed by handle (None = the page)."""
+        if handle is None:
+            return self._app.page
+        if handle == DATA_HANDLE:
+            return self._app.data
+        entry = self._handles.get(handle)
+        if entry is None:
+            raise ValueError(f"Unknown or released remote handle {handle}")
+        return entry[0]
+
+    def _decode(self, value: Any) -> Any:
+        return self._target(value.handle) if isinstance(value, RemoteRef) else value
+
+    @property
+    def handle_count(self) -> int:
+        """Number of objects currently referenced by clients."""
+        return len(self._handles)
+
+    # -------------------------------------------------------------------------
+    # Commands
+    # -------------------------------------------------------------------------
+
     def _handle_command(self, cmd: tuple) -> Any:
         """Handle incoming command."""
         cmd_type = cmd[0]
 
         if cmd_type == "__keys__":
-            return list(self._app.page.keys())
+            return list(self._target(cmd[1]).keys())
+
+        if cmd_type == "__len__":
+            return len(self._children(self._target(cmd[1])))
+
+        if cmd_type in ("__iter_keys__", "__iter_nodes__"):
+            bag = self._children(self._resolve_path(self._target(cmd[1]), cmd[2]))
+            nodes, cursor = self._page_of(bag, cmd[3], cmd[4])
+            if cmd_type == "__iter_keys__":
+                return [node.label for node in nodes], cursor
+            return [self._describe(node) for node in nodes], cursor
 
         if cmd_type == "__getitem__":
-            key = cmd[1]
-            return self._app.page[key]
+            target, key = self._target(cmd[1]), cmd[2]
+            if key.startswith("#"):
+                return self._node_by_id(key[1:]).value
+            return target[key]
 
         if cmd_type == "__setitem__":
-            key, value = cmd[1], cmd[2]
-            return self._safe_call(lambda: setattr_item(self._app.page, key, value))
+            target, key, value = self._target(cmd[1]), cmd[2], self._decode(cmd[3])
+            if key.startswith("#"):
+                node = self._node_by_id(key[1:])
+                return self._safe_call(lambda: node.set_value(value))
+            return self._safe_call(lambda: setattr_item(target, key, value))
+
+        if cmd_type == "__get__":
+            value = getattr(self._target(cmd[1]), cmd[2])
+            return dict(value) if cmd[2] == "attr" else value
+
+        if cmd_type == "__attach__":
+            target = self._resolve_path(self._target(cmd[1]), cmd[2])
+            rows = cmd[3]
+            return self._safe_call(lambda: self._attach(target, rows))
+
+        if cmd_type == "__load_table__":
+            node = self._resolve_path(self._target(cmd[1]), cmd[2])
+            if cmd[3] != "shm":
+                labels, columns = list(cmd[4]), list(cmd[4].values())
+                return self._safe_call(lambda: self._load_table(node, labels, columns, cmd[5]))
+            from genro_pygui.shm_table import open_table
+
+            # Le colonne numeriche sono view sul blocco: copiate solo da add_rows
+            with open_table(cmd[4]) as (labels, columns):
+                return self._safe_call(lambda: self._load_table(node, labels, columns, cmd[5]))
+
+        if cmd_type in ("__release__", "__version__"):
+            return None
+
+        if cmd_type == "__close__":
+            return self.release_client(_client_of(self._local.request.request_id))
+
+        if cmd_type == "__cancel__":
+            now = time.monotonic()
+            # Si dimenticano le cancellazioni vecchie: le richieste sono già servite
+            self._cancelled = {
+                request_id: at for request_id, at in self._cancelled.items() if now - at < 60
+            }
+            for request_id in cmd[1]:
+                self._cancelled[request_id] = now
+            return None
+
+        if cmd_type == "__trace__":
+            enable, reset = cmd[1], cmd[2]
+            if enable:
+                tracing.enable()
+            tracer = tracing.active
+            events = tracer.events(reset) if tracer is not None else []
+            if enable is False:
+                tracing.disable()
+            return events
+
+        if cmd_type == "__handles__":
+            return self.handle_count
+
+        if cmd_type == "__stats__":
+            return self._safe_call(lambda: self._stats(cmd[1]))
+
+        if cmd_type == "__profile__":
+            from genro_pygui import profiling
+
+            profiler = profiling.active
+            if profiler is None:
+                return ""
+
+            def report() -> str:
+                # Il profiler è aggiornato dal thread UI: letto e azzerato lì
+                text = profiler.report()
+                if cmd[1]:
+                    profiler.reset()
+                return text
+
+            return self._safe_call(report)
 
         if cmd_type == "__call__":
-            method_name, args, kwargs = cmd[1], cmd[2], cmd[3]
-            return self._safe_call(
-                lambda: getattr(self._app.page, method_name)(*args, **kwargs)
-            )
+            target, method_name = self._target(cmd[1]), cmd[2]
+            args = tuple(self._decode(arg) for arg in cmd[3])
+            kwargs = {key: self._decode(arg) for key, arg in cmd[4].items()}
+            return self._safe_call(lambda: getattr(target, method_name)(*args, **kwargs))
 
         raise ValueError(f"Unknown command: {cmd_type}")
 
+    # -------------------------------------------------------------------------
+    # Paths and cursors
+    # -------------------------------------------------------------------------
+
+    def _resolve_path(self, target: Bag | BagNode, path: str) -> Bag | BagNode:
+        """Bag or node at path, relative to target ("" = target, "#id" = by id)."""
+        if path.startswith("#"):
+            return self._node_by_id(path[1:])
+        if not path:
+            return target
+        base = target.get_value(static=True) if isinstance(target, BagNode) else target
+        node = base.get_node(path) if isinstance(base, Bag) else None
+        if node is None:
+            raise ValueError(f"No page node at '{path}'")
+        return node
+
+    def _children(self, target: Bag | BagNode) -> Bag:
+        """The Bag of target's children (empty for leaves)."""
+        if isinstance(target, BagNode):
+            target = target.get_value(static=True)
+        return target if isinstance(target, Bag) else Bag()
+
+    def _page_of(
+        self, bag: Bag, cursor: tuple[int, str, str] | None, limit: int
+    ) -> tuple[list[BagNode], tuple[int, str, str] | None]:
+        """Up to limit nodes of bag after cursor, and the cursor of the next page.
+
+        The cursor is (index, label of the last node sent, label of the next
+        one): if nodes were inserted or deleted between two pages, the page
+        restarts at the next label, or after the last one if the next was
+        deleted, or at the old index if both were.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        nodes = bag._nodes
+        size = len(bag)
+        start = 0
+        if cursor is not None:
+            start, last_label, next_label = cursor
+            if start >= size or nodes[start].label != next_label:
+                # Bag modificata tra due pagine: si cerca il primo nodo non inviato
+                position = nodes.index(next_label)
+                if position < 0:
+                    position = nodes.index(last_label)
+                    position = position + 1 if position >= 0 else min(start - 1, size)
+                start = position
+        stop = min(start + limit, size)
+        page = [nodes[i] for i in range(start, stop)]
+        next_cursor = (stop, page[-1].label, nodes[stop].label) if page and stop < size else None
+        return page, next_cursor
+
+    def _describe(self, node: BagNode) -> RemoteNode:
+        value = node.get_value(static=True)
+        if isinstance(value, Bag):
+            return RemoteNode(node.label, node.tag, dict(node.attr), None, len(value))
+        return RemoteNode(node.label, node.tag, dict(node.attr), value, None)
+
+    def _attach(self, target: Bag | BagNode, rows: list) -> list[str]:
+        """Graft dump_page() rows into target's children (UI thread)."""
+        builder = self._app.page.builder
+        container = target
+        if isinstance(target, BagNode):
+            container = target.get_value(static=True)
+            if container is None:
+                # Container ancora vuoto: i figli vanno in una Bag nuova
+                container = Bag()
+                container.builder = builder
+                target.set_value(container)
+            elif not isinstance(container, Bag):
+                raise ValueError(f"Page node '{target.label}' is not a container")
+        labels = []
+        for row in rows:
+            label, tag = row[0], row[1]
+            if label in container._nodes:
+                label = builder._auto_label(container, tag or "node")
+            # Un solo ins per nodo di primo livello: il sottoalbero è già completo
+            restore_page(container, [(label, *row[1:])], builder)
+            labels.append(label)
+        return labels
+
+    def _load_table(
+        self, node: Bag | BagNode, labels: list[str], columns: list[list[Any]], replace: bool
+    ) -> int:
+        """Fill the DataTable compiled from node with columns (UI thread)."""
+        widget = self._app.get_widget(node) if isinstance(node, BagNode) else None
+        if widget is None or not hasattr(widget, "add_rows"):
+            raise ValueError("load_table needs a compiled datatable node")
+        if replace:
+            widget.clear(columns=True)
+        if not widget.columns:
+            widget.add_columns(*labels)
+        elif len(widget.columns) != len(labels):
+            raise ValueError(
+                f"The table has {len(widget.columns)} columns, got {len(labels)}"
+            )
+        widget.add_rows(zip(*columns))
+        return widget.row_count
+
+    def _stats(self, reset: bool) -> dict[str, Any]:
+        """App counters for load tests (UI thread)."""
+        app = self._app
+        stats = {
+            "update": app.update_stats,
+            "frames": app.frame_stats,
+            "resolvers": app.resolver_stats,
+            "remote": {
+                "dropped": self.dropped,
+                "handles": self.handle_count,
+                "clients": len(self._client_handles),
+            },
+            "events": app.events.stats(),
+        }
+        if reset:
+            app._scheduler.reset_stats()
+            self.dropped = 0
+        return stats
+
+    def _node_by_id(self, node_id: str) -> Any:
+        """Page node addressed as "#id" (index lookup, no walk)."""
+        node = self._app.get_node_by_id(node_id)
+        if node is None:
+            raise ValueError(f"No page node with id '{node_id}'")
+        return node
+
     def _safe_call(self, func: Callable[[], Any]) -> Any:
-        """Execute function in Textual's main thread and return result."""
+        """Execute function in Textual's main thread and return result.
+
+        The request's deadline and cancellation are checked again on the UI
+        thread: a request that expired while waiting there is not run.
+        """
         textual_app = self._app._textual_app
         if textual_app is None:
             return func()
-        return textual_app.call_from_thread(func)
+        request = getattr(self._local, "request", None)
+        if request is None:
+            return textual_app.call_from_thread(func)
+
+        tracer = tracing.active
+        trace_id = tracer.current if tracer is not None else None
+        queued = tracing.now()
+
+        def guarded() -> Any:
+            reason = self._expired(request)
+            if reason is not None:
+                self.dropped += 1
+                raise TimeoutError(reason)
+            if trace_id is None:
+                return func()
+            started = tracing.now()
+            tracer.complete("ui queue", "server", queued, started, trace_id)
+            try:
+                with tracer.context(trace_id):
+                    return func()
+            finally:
+                name = f"ui {tracing.command_name(request.cmd)}"
+                tracer.complete(name, "ui", started, tracing.now(), trace_id)
+                # Il frame successivo (compile, binding, refresh) appartiene a questa traccia
+                tracer.pending.add(trace_id)
+
+        return textual_app.call_from_thread(guarded)
 
 
 def setattr_item(obj: Any, key: str, value: Any) -> None:
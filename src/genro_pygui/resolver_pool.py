@@ -0,0 +1,233 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Asynchronous evaluation of Bag resolvers on a bounded worker pool.
+
+Reading a node with a resolver (FormulaResolver, UrlResolver, a directory
+listing...) runs its load() on the caller's thread. On the UI thread that
+freezes the app. The ResolverPool evaluates them on at most max_workers
+threads and caches the results:
+
+    ready, value = pool.read(data, "report.totale", callback)
+    # ready False: evaluation queued, show a placeholder; callback(node,
+    # value, error) is called on the worker thread when the value arrives
+
+    - concurrent requests for the same node share one evaluation
+    - values are cached for the resolver's cache_time if positive, forever
+      if negative, otherwise for the pool's ttl
+    - watch(bag) invalidates a node's cached value when its attributes or
+      value change, or when it is removed
+
+TextualApp uses one pool for data bindings (see binding.py) and for bagtree
+branches; app.resolver_stats reports hits, misses and evaluations.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from genro_bag import Bag
+
+from genro_pygui.node_index import is_attached
+
+if TYPE_CHECKING:
+    from genro_bag.bagnode import BagNode
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TTL = 30.0
+
+ResolvedCallback = Callable[["BagNode", Any, "Exception | None"], Any]
+
+
+class ResolverPool:
+    """Bounded thread pool and TTL cache for resolver values."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, ttl: float = DEFAULT_TTL) -> None:
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        # id(node) -> (node, value, expires at)
+        self._cache: dict[int, tuple[BagNode, Any, float]] = {}
+        # id(node) -> callbacks waiting for the evaluation in flight
+        self._pending: dict[int, list[ResolvedCallback]] = {}
+        # Invalidazioni durante una valutazione: il risultato non va in cache
+        self._generation: dict[int, int] = {}
+        self._watched: dict[int, tuple[Bag, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evaluations = 0
+        self.errors = 0
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def _ttl_for(self, node: BagNode) -> float:
+        cache_time = getattr(node.resolver, "cache_time", 0) or 0
+        if cache_time < 0:
+            return float("inf")
+        return cache_time if cache_time > 0 else self.ttl
+
+    def cached(self, node: BagNode) -> tuple[bool, Any]:
+        """(True, value) if node has a valid cached value, else (False, None)."""
+        entry = self._cache.get(id(node))
+        if entry is None or entry[0] is not node:
+            return False, None
+        if entry[2] < time.monotonic() or not is_attached(node):
+            with self._lock:
+                if self._cache.get(id(node)) is entry:
+                    del self._cache[id(node)]
+            return False, None
+        return True, entry[1]
+
+    def invalidate(self, node: BagNode) -> None:
+        """Forget node's cached value (an evaluation in flight is not cached)."""
+        with self._lock:
+            self._cache.pop(id(node), None)
+            if id(node) in self._pending:
+                self._generation[id(node)] = self._generation.get(id(node), 0) + 1
+
+    def clear(self) -> None:
+        """Forget every cached value."""
+        with self._lock:
+            self._cache.clear()
+
+    # -------------------------------------------------------------------------
+    # Evaluation
+    # -------------------------------------------------------------------------
+
+    def submit(self, node: BagNode, callback: ResolvedCallback | None = None) -> None:
+        """Evaluate node's resolver on the pool; callback runs on the worker thread."""
+        with self._lock:
+            waiting = self._pending.get(id(node))
+            if waiting is not None:
+                if callback is not None:
+                    waiting.append(callback)
+                return
+            self._pending[id(node)] = [callback] if callback is not None else []
+            generation = self._generation.get(id(node), 0)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="resolver"
+                )
+        self._executor.submit(self._evaluate, node, generation)
+
+    def _evaluate(self, node: BagNode, generation: int) -> None:
+        value = None
+        error = None
+        try:
+            value = node.get_value()
+        except Exception as e:
+            error = e
+        with self._lock:
+            self.evaluations += 1
+            callbacks = self._pending.pop(id(node), [])
+            current = self._generation.pop(id(node), 0)
+            if error is not None:
+                self.errors += 1
+            elif current == generation:
+                self._cache[id(node)] = (node, value, time.monotonic() + self._ttl_for(node))
+        for callback in callbacks:
+            callback(node, value, error)
+
+    def resolve(self, node: BagNode, callback: ResolvedCallback | None = None) -> tuple[bool, Any]:
+        """Cached value of node, or queue its evaluation: returns (ready, value)."""
+        hit, value = self.cached(node)
+        if hit:
+            self.hits += 1
+            return True, value
+        self.misses += 1
+        self.submit(node, callback)
+        return False, None
+
+    def read(
+        self, bag: Bag, path: str, callback: ResolvedCallback | None = None
+    ) -> tuple[bool, Any]:
+        """Read path like bag[path], without evaluating resolvers on this thread.
+
+        Returns (True, value) when every resolver along the path is cached,
+        (False, None) after queueing the first one that is not.
+        """
+        if not path:
+            return True, bag
+        if "#" in path or "?" in path:
+            # Sintassi speciali dei path: lettura diretta
+            return True, bag[path]
+        value: Any = bag
+        for label in path.split("."):
+            if not isinstance(value, Bag):
+                return True, None
+            node = value._nodes[label]
+            if node is None:
+                return True, None
+            if node.resolver is None:
+                value = node.get_value(static=True)
+                continue
+            ready, value = self.resolve(node, callback)
+            if not ready:
+                return False, None
+        return True, value
+
+    # -------------------------------------------------------------------------
+    # Invalidation from subscriptions
+    # -------------------------------------------------------------------------
+
+    def watch(self, bag: Bag) -> None:
+        """Invalidate cached values of bag's nodes when they change."""
+        if id(bag) in self._watched:
+            return
+        subscriber_id = f"_resolverpool_{hex(object.__hash__(self))}"
+        bag.subscribe(subscriber_id, any=self._on_change)
+        self._watched[id(bag)] = (bag, subscriber_id)
+
+    def unwatch(self, bag: Bag) -> None:
+        """Stop following bag."""
+        entry = self._watched.pop(id(bag), None)
+        if entry is not None:
+            bag.unsubscribe(entry[1], any=True)
+
+    def _on_change(self, node: BagNode, evt: str, **kw: Any) -> None:
+        # Bag.clear() manda un solo del con la lista dei nodi rimossi
+        for changed in node if isinstance(node, list) else (node,):
+            if changed.resolver is not None or id(changed) in self._cache:
+                self.invalidate(changed)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle / stats
+    # -------------------------------------------------------------------------
+
+    def shutdown(self) -> None:
+        """Stop the workers, dropping evaluations not started yet.
+
+        The pool stays usable: the next submit() starts new workers.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int]:
+        """Counters: hits, misses, evaluations, errors, cached, pending."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evaluations": self.evaluations,
+            "errors": self.errors,
+            "cached": len(self._cache),
+            "pending": len(self._pending),
+        }
+
+
+_shared: ResolverPool | None = None
+
+
+def shared_pool() -> ResolverPool:
+    """Process-wide pool for widgets used outside a TextualApp."""
+    global _shared
+    if _shared is None:
+        _shared = ResolverPool()
+    return _shared
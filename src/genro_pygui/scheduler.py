@@ -0,0 +1,218 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Frame-coalesced scheduler for data-driven widget updates.
+
+DataBinder does not touch widgets directly once the app is running: every
+data change marks the bound (widget, property) pairs dirty, and the
+scheduler applies them once per frame, inside a single batch_update(), on
+the UI thread. Sources registered with add_source() (e.g. DataWriter queues)
+are drained at the start of the same frame. The value is read from the data
+Bag at flush time, so any number of writes to the same path within a frame
+costs one property set.
+
+Only mark() may be called from any thread. Writing the data Bag runs its
+subscribers (DataBinder, FormulaEngine, NodeIndex...) on the writing thread,
+so worker threads must not write it directly: they go through
+app.data_writer(), whose queue is drained on the UI thread (see ingest.py).
+
+    app = MyApp(refresh_rate=30)    # flushes per second, default 60
+    ...
+    app.update_stats
+    # {"requested": 10000, "applied": 12, "coalesced": 9988, "discarded": 0,
+    #  "pending": 0, "flushes": 3}
+
+Each frame is also timed: frame_stats() reports how long the frames took
+and how late they started (event loop lag), e.g. under remote load:
+
+    app.frame_stats
+    # {"frames": 600, "frame_ms_avg": 0.4, "frame_ms_max": 12.1,
+    #  "lag_ms_avg": 0.9, "lag_ms_max": 48.0, "late_frames": 3}
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from genro_pygui import tracing
+
+if TYPE_CHECKING:
+    from textual.app import App
+    from textual.timer import Timer
+
+    from genro_pygui.binding import Binding, DataBinder
+    from genro_pygui.tracing import Tracer
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class UpdateScheduler:
+    """Collects dirty bindings and applies them once per frame."""
+
+    def __init__(self, binder: DataBinder, refresh_rate: float = DEFAULT_REFRESH_RATE) -> None:
+        if refresh_rate <= 0:
+            raise ValueError(f"refresh_rate must be positive, got {refresh_rate}")
+        self.binder = binder
+        self.refresh_rate = refresh_rate
+        self._dirty: dict[tuple[int, str], Binding] = {}
+        self._sources: list[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+        self._app: App | None = None
+        self._timer: Timer | None = None
+        self.reset_stats()
+
+    @property
+    def running(self) -> bool:
+        """True once attached to a running Textual app."""
+        return self._timer is not None
+
+    def start(self, app: App) -> None:
+        """Start flushing on app's event loop at refresh_rate Hz."""
+        self._app = app
+        self._timer = app.set_interval(1 / self.refresh_rate, self.tick, name="update_scheduler")
+
+    def stop(self) -> None:
+        """Stop the flush timer and apply what is still pending."""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self.flush()
+        self._app = None
+
+    def add_source(self, source: Callable[[], Any]) -> None:
+        """Call source() on the UI thread at the start of every frame."""
+        with self._lock:
+            self._sources = [*self._sources, source]
+
+    def remove_source(self, source: Callable[[], Any]) -> None:
+        """Stop calling source()."""
+        with self._lock:
+            self._sources = [s for s in self._sources if s != source]
+
+    def tick(self) -> None:
+        """One frame: drain the sources, then flush the dirty bindings."""
+        tracer = tracing.active
+        if tracer is not None and tracer.pending:
+            self._traced_frame(tracer)
+        else:
+            self._frame()
+
+    def _frame(self) -> None:
+        start = time.perf_counter()
+        for source in self._sources:
+            source()
+        self.flush()
+        self._record_frame(start, time.perf_counter())
+
+    def _traced_frame(self, tracer: Tracer) -> None:
+        """A frame recorded as a span of the traces run on the UI thread since
+        the last one, followed by a refresh span ending at the screen refresh.
+        """
+        traces = tracer.take_pending()
+        start = tracing.now()
+        with tracer.context(traces):
+            self._frame()
+        end = tracing.now()
+        tracer.complete("frame", "ui", start, end, traces)
+        if self._app is not None:
+            self._app.call_after_refresh(
+                lambda: tracer.complete("refresh", "ui", end, tracing.now(), traces)
+            )
+
+    def _record_frame(self, start: float, end: float) -> None:
+        interval = 1 / self.refresh_rate
+        if self._last_tick is not None:
+            # Ritardo rispetto al frame atteso: il loop era occupato
+            lag = max(0.0, start - self._last_tick - interval)
+            self._lag_total += lag
+            self._lag_max = max(self._lag_max, lag)
+            if lag > interval:
+                self.late_frames += 1
+        self._last_tick = start
+        duration = end - start
+        self.frames += 1
+        self._frame_total += duration
+        self._frame_max = max(self._frame_max, duration)
+
+    def mark(self, binding: Binding) -> None:
+        """Mark a binding dirty (any thread); repeated marks are coalesced."""
+        key = (id(binding.widget), binding.prop)
+        with self._lock:
+            self.requested += 1
+            self._dirty[key] = binding
+
+    def discard(self, widget: Any) -> None:
+        """Forget pending updates of a widget that is being destroyed."""
+        with self._lock:
+            for key in [key for key in self._dirty if key[0] == id(widget)]:
+                del self._dirty[key]
+                self.discarded += 1
+
+    def flush(self) -> int:
+        """Apply all dirty bindings in one batch. Returns how many were applied."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            dirty = self._dirty
+            self._dirty = {}
+
+        if self._app is not None:
+            with self._app.batch_update():
+                self._apply(dirty.values())
+        else:
+            self._apply(dirty.values())
+        self.applied += len(dirty)
+        self.flushes += 1
+        return len(dirty)
+
+    def _apply(self, bindings: Any) -> None:
+        for binding in bindings:
+            self.binder.apply(binding)
+
+    # -------------------------------------------------------------------------
+    # Stats
+    # -------------------------------------------------------------------------
+
+    def reset_stats(self) -> None:
+        """Reset the update counters."""
+        self.requested = 0
+        self.applied = 0
+        self.discarded = 0
+        self.flushes = 0
+        self.frames = 0
+        self.late_frames = 0
+        self._frame_total = 0.0
+        self._frame_max = 0.0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._last_tick: float | None = None
+
+    @property
+    def coalesced(self) -> int:
+        """Updates requested but absorbed by a later one in the same frame."""
+        return self.requested - self.applied - self.discarded - len(self._dirty)
+
+    def stats(self) -> dict[str, int]:
+        """Counters since the last reset_stats()."""
+        return {
+            "requested": self.requested,
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "discarded": self.discarded,
+            "pending": len(self._dirty),
+            "flushes": self.flushes,
+        }
+
+    def frame_stats(self) -> dict[str, float]:
+        """Frame durations and event loop lag (ms) since the last reset_stats()."""
+        frames = self.frames
+        lagged = max(frames - 1, 1)
+        return {
+            "frames": frames,
+            "frame_ms_avg": round(self._frame_total / max(frames, 1) * 1000, 3),
+            "frame_ms_max": round(self._frame_max * 1000, 3),
+            "lag_ms_avg": round(self._lag_total / lagged * 1000, 3),
+            "lag_ms_max": round(self._lag_max * 1000, 3),
+            "late_frames": self.late_frames,
+        }
@@ -0,0 +1,331 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Incremental search index over a Bag.
+
+Searching by walking the Bag costs O(nodes) per keystroke. BagSearchIndex
+keeps instead:
+
+    token   -> node entries   inverted index of each node's own tokens
+                              (label, attribute values, scalar value)
+    trigram -> tokens         over the vocabulary, for substring matching
+
+A query is split in terms; a term matches a token containing it (terms
+shorter than 3 characters match token prefixes). A node is a result when
+its own tokens match at least one term and every term is matched by the
+node or by one of its ancestors, so "clienti rossi" finds the rossi nodes
+under clienti without storing path tokens on every node.
+
+The index is built in a background thread, in chunks, and kept up to date
+from the Bag's events. Queries can run on any thread while it is building
+(results are then partial, see ready):
+
+    index = BagSearchIndex(bag)
+    index.start()
+    for node in index.search("rossi mi"):      # lazy, document order
+        ...
+
+Nodes inserted after the build are returned after the others.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from genro_bag import Bag
+
+from genro_pygui.node_index import is_attached
+
+if TYPE_CHECKING:
+    from genro_bag.bagnode import BagNode
+
+TOKEN_RE = re.compile(r"\w+")
+# Token per valore: un testo lungo non deve gonfiare l'indice
+MAX_VALUE_TOKENS = 64
+BUILD_CHUNK = 2000
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of text."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(token: str) -> set[str]:
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+class BagSearchIndex:
+    """Token/trigram index over the nodes of a Bag, updated from its events."""
+
+    def __init__(self, bag: Bag, attributes: bool = True, values: bool = True) -> None:
+        self._bag = bag
+        self.attributes = attributes
+        self.values = values
+        self._lock = threading.Lock()
+        self._next_eid = 0
+        self._entries: dict[int, BagNode] = {}
+        self._eid: dict[int, int] = {}
+        self._tokens: dict[int, tuple[str, ...]] = {}
+        # Entry con figli: solo loro possono soddisfare un termine per i discendenti
+        self._branches: set[int] = set()
+        self._postings: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[str]] = {}
+        self._prefixes: dict[str, set[str]] = {}
+        self._subscription = f"_searchindex_{hex(object.__hash__(self))}"
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.ready = threading.Event()
+        self.on_ready: Callable[[], Any] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -------------------------------------------------------------------------
+    # Build
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Subscribe to the Bag and build the index in a background thread."""
+        if self._thread is not None:
+            return
+        # Prima la sottoscrizione: gli eventi durante la build non vanno persi
+        self._bag.subscribe(self._subscription, any=self._on_change)
+        self._thread = threading.Thread(target=self._build, name="bag-search-index", daemon=True)
+        self._thread.start()
+
+    def build(self) -> None:
+        """Subscribe and build synchronously (small Bags, tests)."""
+        self._bag.subscribe(self._subscription, any=self._on_change)
+        self._build()
+
+    def close(self) -> None:
+        """Stop following the Bag (a running build stops at the next chunk)."""
+        self._closed = True
+        self._bag.unsubscribe(self._subscription, any=True)
+
+    def _build(self) -> None:
+        # Visita in preordine: gli id delle entry seguono l'ordine di documento
+        stack: list[tuple[BagNode | None, Iterator[BagNode]]] = [(None, iter(list(self._bag)))]
+        chunk: list[tuple[BagNode | None, BagNode]] = []
+        while stack and not self._closed:
+            parent, nodes = stack[-1]
+            node = next(nodes, None)
+            if node is None:
+                stack.pop()
+                continue
+            chunk.append((parent, node))
+            value = node.get_value(static=True)
+            if isinstance(value, Bag):
+                stack.append((node, iter(list(value))))
+            if len(chunk) >= BUILD_CHUNK:
+                self._index_chunk(chunk)
+                chunk = []
+        self._index_chunk(chunk)
+        self.ready.set()
+        if self.on_ready is not None and not self._closed:
+            self.on_ready()
+
+    def _index_chunk(self, chunk: list[tuple[BagNode | None, BagNode]]) -> None:
+        with self._lock:
+            for parent, node in chunk:
+                if id(node) in self._eid:
+                    continue
+                # Nodo rimosso durante la build: il suo del è già passato
+                if parent is not None and id(parent) not in self._eid:
+                    continue
+                if not is_attached(node):
+                    continue
+                self._add(node)
+
+    # -------------------------------------------------------------------------
+    # Maintenance (lock held)
+    # -------------------------------------------------------------------------
+
+    def node_tokens(self, node: BagNode) -> tuple[str, ...]:
+        """Tokens of node's own label, attribute values and scalar value."""
+        tokens = tokenize(node.label)
+        if self.attributes:
+            for key, attr_value in node.attr.items():
+                if not key.startswith("_") and attr_value is not None:
+                    tokens.extend(tokenize(str(attr_value)))
+        if self.values and node.resolver is None:
+            value = node.get_value(static=True)
+            if value is not None and not isinstance(value, Bag):
+                tokens.extend(tokenize(str(value))[:MAX_VALUE_TOKENS])
+        return tuple(dict.fromkeys(tokens))
+
+    def _add(self, node: BagNode) -> None:
+        eid = self._next_eid
+        self._next_eid += 1
+        tokens = self.node_tokens(node)
+        self._entries[eid] = node
+        self._eid[id(node)] = eid
+        self._tokens[eid] = tokens
+        if isinstance(node.get_value(static=True), Bag):
+            self._branches.add(eid)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                for trigram in _trigrams(token):
+                    self._trigrams.setdefault(trigram, set()).add(token)
+                for prefix in (token[:1], token[:2]):
+                    self._prefixes.setdefault(prefix, set()).add(token)
+            postings.add(eid)
+
+    def _remove(self, node: BagNode) -> None:
+        eid = self._eid.pop(id(node), None)
+        if eid is None:
+            return
+        del self._entries[eid]
+        self._branches.discard(eid)
+        for token in self._tokens.pop(eid):
+            postings = self._postings[token]
+            postings.discard(eid)
+            if postings:
+                continue
+            del self._postings[token]
+            for trigram in _trigrams(token):
+                tokens = self._trigrams[trigram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigrams[trigram]
+            for prefix in {token[:1], token[:2]}:
+                tokens = self._prefixes[prefix]
+                tokens.discard(token)
+                if not tokens:
+                    del self._prefixes[prefix]
+
+    def _add_tree(self, node: BagNode) -> None:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if id(node) not in self._eid:
+                self._add(node)
+            value = node.get_value(static=True)
+            if isinstance(value, Bag):
+                stack.extend(reversed(list(value)))
+
+    def _remove_tree(self, node: BagNode) -> None:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            self._remove(node)
+            value = node.get_value(static=True)
+            if isinstance(value, Bag):
+                stack.extend(value)
+
+    def _on_change(self, node: BagNode, evt: str, oldvalue: Any = None, **kw: Any) -> None:
+        """Bag subscriber: keep the entries of the changed nodes current."""
+        with self._lock:
+            if evt == "ins":
+                self._add_tree(node)
+            elif evt == "del":
+                # Bag.clear() manda un solo del con la lista dei nodi rimossi
+                for removed in node if isinstance(node, list) else (node,):
+                    self._remove_tree(removed)
+            elif id(node) in self._eid:
+                if evt == "upd_value" and isinstance(oldvalue, Bag):
+                    for child in oldvalue:
+                        self._remove_tree(child)
+                self._remove(node)
+                self._add_tree(node)
+
+    # -------------------------------------------------------------------------
+    # Query
+    # -------------------------------------------------------------------------
+
+    def _term_entries(self, term: str) -> set[int]:
+        """Entries whose own tokens match term (lock held)."""
+        if len(term) < 3:
+            tokens = [t for t in self._prefixes.get(term[:2], ()) if t.startswith(term)]
+        else:
+            grams = sorted((self._trigrams.get(g, ()) for g in _trigrams(term)), key=len)
+            if not grams or not grams[0]:
+                return set()
+            tokens = [t for t in grams[0] if term in t]
+        result: set[int] = set()
+        for token in tokens:
+            result.update(self._postings[token])
+        return result
+
+    def _scope_mask(self, bag: Bag, masks: dict[int, int], memo: dict[int, int]) -> int:
+        """Terms matched by the ancestors of bag's nodes (memoized per Bag)."""
+        chain = []
+        mask = 0
+        while bag is not None and bag is not self._bag:
+            cached = memo.get(id(bag))
+            if cached is not None:
+                mask = cached
+                break
+            parent_node = bag.parent_node
+            if parent_node is None:
+                break
+            chain.append((bag, parent_node))
+            bag = parent_node.parent_bag
+        for child_bag, parent_node in reversed(chain):
+            eid = self._eid.get(id(parent_node))
+            if eid is not None:
+                mask |= masks.get(eid, 0)
+            memo[id(child_bag)] = mask
+        return mask
+
+    def search_ids(self, query: str) -> list[int]:
+        """Entry ids matching query, in index (document) order."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            if len(terms) == 1:
+                return sorted(self._term_entries(terms[0]))
+            # Bit i acceso: l'entry soddisfa il termine i con i propri token
+            masks: dict[int, int] = {}
+            # Termini che nessun ramo soddisfa: vanno soddisfatti dai token propri
+            own = 0
+            for bit, term in enumerate(terms):
+                flag = 1 << bit
+                term_entries = self._term_entries(term)
+                if not term_entries:
+                    return []
+                if self._branches.isdisjoint(term_entries):
+                    own |= flag
+                for eid in term_entries:
+                    masks[eid] = masks.get(eid, 0) | flag
+            full = (1 << len(terms)) - 1
+            memo: dict[int, int] = {}
+            entries = self._entries
+            result = [
+                eid
+                for eid, mask in masks.items()
+                if mask & own == own
+                and (
+                    mask == full
+                    or mask | self._scope_mask(entries[eid].parent_bag, masks, memo) == full
+                )
+            ]
+        return sorted(result)
+
+    def nodes(self, eids: list[int]) -> Iterator[BagNode]:
+        """Nodes of eids still in the index (lazy: results can be consumed in pages)."""
+        entries = self._entries
+        for eid in eids:
+            node = entries.get(eid)
+            if node is not None:
+                yield node
+
+    def search(self, query: str) -> Iterator[BagNode]:
+        """Nodes matching query (see the module docstring)."""
+        return self.nodes(self.search_ids(query))
+
+    def path(self, node: BagNode) -> str:
+        """Path of node relative to the indexed Bag."""
+        labels = [node.label]
+        parent_bag = node.parent_bag
+        while parent_bag is not None and parent_bag is not self._bag:
+            parent_node = parent_bag.parent_node
+            if parent_node is None:
+                break
+            labels.append(parent_node.label)
+            parent_bag = parent_node.parent_bag
+        return ".".join(reversed(labels))
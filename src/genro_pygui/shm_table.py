@@ -0,0 +1,213 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Columnar tables in shared memory, for same-host bulk transfers.
+
+A table is a dict of columns (label -> values). write_table() copies it in
+one SharedMemory block and returns a small descriptor; only the descriptor
+travels over the remote channel, the receiving process maps the block and
+reads the columns out of it:
+
+    shm, descriptor = write_table({"id": ids, "price": prices, "name": names})
+    try:
+        send(descriptor)                # a few hundred bytes
+    finally:
+        shm.close()
+        shm.unlink()
+
+    with open_table(descriptor) as (labels, columns):  # other process
+        table.add_rows(zip(*columns))
+
+Layout: every column is a contiguous array aligned to 8 bytes.
+
+    int columns      int64 ("q")
+    float columns    float64 ("d"), ints mixed with floats included
+    buffers          array.array, numpy arrays... copied as they are (one
+                     memcpy); their format code goes in the descriptor
+    anything else    str(value) as UTF-8 in one blob, plus int64 offsets
+                     (rows + 1); None becomes ""
+
+open_table() maps each numeric column with a memoryview cast, so a loader
+like DataTable.add_rows(zip(*columns)) reads the values straight out of the
+block; text columns are decoded once and sliced. The reader only maps the
+block: the writer owns it and unlinks it.
+
+From a client, PageProxy.load_table() does all of this (see remote.py).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any
+
+try:
+    import _posixshmem
+except ImportError:  # Windows: named mappings, no resource tracker
+    _posixshmem = None
+
+ALIGNMENT = 8
+# Formati accettati per le colonne che arrivano come buffer
+BUFFER_FORMATS = frozenset("bBhHiIlLqQfd")
+
+ColumnSpec = dict[str, Any]
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _as_buffer(values: Any) -> memoryview | None:
+    """values as a 1-d memoryview of a supported format, or None."""
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return None
+    if view.ndim != 1 or view.format.lstrip("@=<") not in BUFFER_FORMATS:
+        view.release()
+        return None
+    return view
+
+
+def _encode_column(values: Sequence[Any]) -> tuple[str, bytes | memoryview, bytes | None]:
+    """(format, data, offsets) of a column given as a sequence of values."""
+    kinds = {type(value) for value in values}
+    if kinds <= {int}:
+        return "q", memoryview(array("q", values)).cast("B"), None
+    if kinds <= {int, float}:
+        return "d", memoryview(array("d", values)).cast("B"), None
+    texts = ["" if value is None else str(value) for value in values]
+    blob = "".join(texts).encode()
+    offsets = array("q", [0])
+    position = 0
+    if blob.isascii():
+        for text in texts:
+            position += len(text)
+            offsets.append(position)
+    else:
+        # Testo non ASCII: gli offset si contano in byte
+        for text in texts:
+            position += len(text.encode())
+            offsets.append(position)
+    return "s", blob, memoryview(offsets).cast("B")
+
+
+def write_table(
+    columns: dict[str, Any],
+) -> tuple[shared_memory.SharedMemory, dict[str, Any]]:
+    """Copy columns in a new SharedMemory block: returns (block, descriptor).
+
+    All columns must have the same length. The caller closes and unlinks
+    the block once the receiver has read it.
+    """
+    if not columns:
+        raise ValueError("A table needs at least one column")
+    rows = None
+    parts: list[tuple[str, str, Any, Any]] = []
+    for label, values in columns.items():
+        view = _as_buffer(values)
+        if view is not None:
+            fmt, data, offsets = view.format.lstrip("@=<"), view.cast("B"), None
+            length = len(view)
+        else:
+            values = values if isinstance(values, Sequence) else list(values)
+            fmt, data, offsets = _encode_column(values)
+            length = len(values)
+        if rows is None:
+            rows = length
+        elif length != rows:
+            raise ValueError(f"Column '{label}' has {length} rows, expected {rows}")
+        parts.append((str(label), fmt, data, offsets))
+
+    specs: list[ColumnSpec] = []
+    size = 0
+    for label, fmt, data, offsets in parts:
+        spec: ColumnSpec = {"label": label, "format": fmt, "offset": size, "nbytes": len(data)}
+        size = _aligned(size + len(data))
+        if offsets is not None:
+            spec["offsets"] = size
+            size = _aligned(size + len(offsets))
+        specs.append(spec)
+
+    # SharedMemory non accetta size 0 (tabella senza righe)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    buf = shm.buf
+    for (_, _, data, offsets), spec in zip(parts, specs):
+        buf[spec["offset"] : spec["offset"] + spec["nbytes"]] = data
+        if offsets is not None:
+            buf[spec["offsets"] : spec["offsets"] + len(offsets)] = offsets
+    descriptor = {"name": shm.name, "size": size, "rows": rows, "columns": specs}
+    return shm, descriptor
+
+
+def _map(name: str) -> mmap.mmap | shared_memory.SharedMemory:
+    """Map an existing block read-only, without taking ownership of it.
+
+    SharedMemory(name=...) registers the block with the resource tracker,
+    which would unlink it when this process exits (before Python 3.13) and
+    cannot even be started under Textual (stderr has no file descriptor).
+    On POSIX the block is therefore opened and mapped directly.
+    """
+    if _posixshmem is None:
+        return shared_memory.SharedMemory(name=name)
+    fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0o600)
+    try:
+        return mmap.mmap(fd, os.fstat(fd).st_size, prot=mmap.PROT_READ)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def open_table(descriptor: dict[str, Any]) -> Iterator[tuple[list[str], list[Sequence[Any]]]]:
+    """Map the table described by descriptor: yields (labels, columns).
+
+    Numeric columns are memoryviews over the block (no copy: values are
+    created while they are read); text columns are lists. They are valid
+    only inside the with block, the block is unmapped on exit.
+    """
+    block = _map(descriptor["name"])
+    views: list[memoryview] = []
+    try:
+        shared = block.buf if isinstance(block, shared_memory.SharedMemory) else block
+        if len(shared) < descriptor["size"]:
+            raise ValueError(f"Shared memory block '{descriptor['name']}' is too small")
+        rows = descriptor["rows"]
+        buf = memoryview(shared)
+        views.append(buf)
+        labels = []
+        columns: list[Sequence[Any]] = []
+        for spec in descriptor["columns"]:
+            labels.append(spec["label"])
+            start = spec["offset"]
+            data = buf[start : start + spec["nbytes"]]
+            views.append(data)
+            if spec["format"] != "s":
+                column = data.cast(spec["format"])
+                views.append(column)
+                columns.append(column)
+                continue
+            blob = bytes(data)
+            start = spec["offsets"]
+            with buf[start : start + (rows + 1) * 8] as raw, raw.cast("q") as offsets:
+                bounds = offsets.tolist()
+            if blob.isascii():
+                text = blob.decode()
+                columns.append([text[bounds[i] : bounds[i + 1]] for i in range(rows)])
+            else:
+                columns.append([blob[bounds[i] : bounds[i + 1]].decode() for i in range(rows)])
+        yield labels, columns
+    finally:
+        # Le view vanno rilasciate prima di chiudere la mappatura
+        for view in reversed(views):
+            view.release()
+        block.close()
+
+
+def read_table(descriptor: dict[str, Any]) -> tuple[list[str], list[list[Any]]]:
+    """Labels and columns (as lists, copied out of the block) of a table."""
+    with open_table(descriptor) as (labels, columns):
+        return labels, [
+            column.tolist() if isinstance(column, memoryview) else column for column in columns
+        ]
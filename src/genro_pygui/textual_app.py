@@ -27,19 +27,47 @@ Example:
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+from typing import TYPE_CHECKING, Any
 
 from genro_bag import Bag
 from textual.app import App
 from textual.containers import Vertical
+from textual.events import Key
 from textual.widget import Widget
-from textual.widgets import Button
+from textual.widgets import (
+    Button,
+    Checkbox,
+    DataTable,
+    Input,
+    ListView,
+    OptionList,
+    RadioButton,
+    RadioSet,
+    Select,
+    Switch,
+    TabbedContent,
+    TextArea,
+    Tree,
+)
 
+from genro_pygui import recipe_cache, tracing
+from genro_pygui.binding import DataBinder
+from genro_pygui.events import EventHub
+from genro_pygui.formula import FormulaEngine
+from genro_pygui.ingest import DEFAULT_BATCH_SIZE, DataWriter
+from genro_pygui.node_index import NodeIndex, is_attached
+from genro_pygui.resolver_pool import DEFAULT_MAX_WORKERS, DEFAULT_TTL, ResolverPool
+from genro_pygui.scheduler import DEFAULT_REFRESH_RATE, UpdateScheduler
 from genro_pygui.textual_builder import TextualBuilder
 
 if TYPE_CHECKING:
+    from genro_bag.bagnode import BagNode
+
     from genro_pygui.remote import RemoteServer
 
+logger = logging.getLogger(__name__)
+
 
 class TextualWrapperApp(App):
     """Internal Textual App that wraps TextualApp."""
@@ -57,12 +85,91 @@ class TextualWrapperApp(App):
 
     def on_mount(self) -> None:
         self.owner._page.builder.compile(self.owner._page, self.root)
+        self.owner._compiled = True
+        self.owner._scheduler.start(self)
+        if self.owner._hot_reload_path is not None:
+            from genro_pygui.hot_reload import watch_and_reload
+
+            self.run_worker(
+                watch_and_reload(self.owner, self, self.owner._hot_reload_path),
+                name="hot_reload",
+                exclusive=True,
+            )
+
+    # Widget -> event stream: user actions published to the app's subscribers
+
+    def _publish(self, event: str, widget: Widget | None, value: Any = None) -> None:
+        """Publish a UI event from widget with the page node it was compiled from."""
+        events = self.owner._events
+        if not events:
+            return
+        node = None
+        if widget is not None and widget.id is not None:
+            node = self.owner.get_node_for_widget(widget)
+        if node is None:
+            events.publish(event, widget_id=widget.id if widget else None, value=value)
+            return
+        events.publish(event, node.attr.get("id"), node.tag, node.label, widget.id, value)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
-        pass
+        self._publish("button_pressed", event.button)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self._publish("input_submitted", event.input, event.value)
+
+    def on_radio_set_changed(self, event: RadioSet.Changed) -> None:
+        self._publish("radio_set_changed", event.radio_set, event.index)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        option = event.option
+        self._publish("option_selected", event.option_list, option.id or str(option.prompt))
+
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        self._publish("list_selected", event.list_view, event.item.id if event.item else None)
+
+    def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
+        self._publish("tree_selected", event.control, str(event.node.label))
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        self._publish("row_selected", event.data_table, event.row_key.value)
+
+    def on_data_table_cell_selected(self, event: DataTable.CellSelected) -> None:
+        key = event.cell_key
+        self._publish("cell_selected", event.data_table, (key.row_key.value, key.column_key.value))
+
+    def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        self._publish("tab_activated", event.tabbed_content, event.pane.id)
 
-    def on_key(self, event: any) -> None:
-        pass
+    # Widget -> data: user edits on bound widgets are written to the data Bag
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self.owner._binder.widget_changed(event.input, "value", event.value)
+        self._publish("input_changed", event.input, event.value)
+
+    def on_checkbox_changed(self, event: Checkbox.Changed) -> None:
+        self.owner._binder.widget_changed(event.checkbox, "value", event.value)
+        self._publish("checkbox_changed", event.checkbox, event.value)
+
+    def on_radio_button_changed(self, event: RadioButton.Changed) -> None:
+        self.owner._binder.widget_changed(event.radio_button, "value", event.value)
+        self._publish("radio_button_changed", event.radio_button, event.value)
+
+    def on_switch_changed(self, event: Switch.Changed) -> None:
+        self.owner._binder.widget_changed(event.switch, "value", event.value)
+        self._publish("switch_changed", event.switch, event.value)
+
+    def on_select_changed(self, event: Select.Changed) -> None:
+        self.owner._binder.widget_changed(event.select, "value", event.value)
+        # Select.BLANK non è un valore: i client remoti non hanno textual
+        value = None if event.value is Select.BLANK else event.value
+        self._publish("select_changed", event.select, value)
+
+    def on_text_area_changed(self, event: TextArea.Changed) -> None:
+        self.owner._binder.widget_changed(event.text_area, "text", event.text_area.text)
+        self._publish("text_area_changed", event.text_area, event.text_area.text)
+
+    def on_key(self, event: Key) -> None:
+        self._publish("key", self.focused, event.key)
 
 
 class TextualApp:
@@ -70,16 +177,65 @@ class TextualApp:
 
     Subclass and override recipe(root) to define your UI.
     The root is a Bag with TextualBuilder - use it to add widgets.
+
+    Set use_recipe_cache = True on apps whose recipe depends only on its own
+    source to reuse the built page across launches (see recipe_cache.py).
+
+    Resolvers reached by data bindings and bagtree branches are evaluated on
+    resolver_workers threads, their values cached for resolver_ttl seconds
+    unless the resolver sets its own cache_time (see resolver_pool.py).
     """
 
-    def __init__(self, remote_port: int | None = None) -> None:
+    use_recipe_cache = False
+    resolver_workers = DEFAULT_MAX_WORKERS
+    resolver_ttl = DEFAULT_TTL
+
+    def __init__(
+        self, remote_port: int | None = None, refresh_rate: float = DEFAULT_REFRESH_RATE
+    ) -> None:
         self._page = Bag(builder=TextualBuilder)
         self._data = Bag()
+        self._binder = DataBinder(self._data)
+        self._scheduler = UpdateScheduler(self._binder, refresh_rate)
+        self._binder.scheduler = self._scheduler
+        self._formulas = FormulaEngine(self._data)
+        self._formulas.scheduler = self._scheduler
+        self._binder.formulas = self._formulas
+        self._resolvers = ResolverPool(self.resolver_workers, self.resolver_ttl)
+        self._resolvers.watch(self._data)
+        self._binder.resolvers = self._resolvers
+        self._scheduler.add_source(self._binder.drain_resolved)
+        # I formula vengono ricalcolati una volta per frame, prima del flush
+        self._scheduler.add_source(self._formulas.recompute)
+        self._page.builder.binder = self._binder
+        self._index = NodeIndex()
+        self._page.builder.index = self._index
+        self._events = EventHub()
+        self._compiled = False
+        self._pending_compile: list[tuple[BagNode, Bag | None]] = []
+        self._scheduler.add_source(self._compile_inserted)
+        self._scheduler.add_source(self._expire_pool)
         self._remote_server: RemoteServer | None = None
         self._remote_port = remote_port
         self._compiled_widgets: list[Widget] = []
         self._textual_app: App | None = None
+        self._hot_reload_path: str | None = None
+        self._build_page()
+        self._index.rebuild(self._page)
+        self._page.subscribe("_textualapp", any=self._on_page_change)
+        if remote_port is not None:
+            self._enable_remote(remote_port)
+
+    def _build_page(self) -> None:
+        """Run recipe() on the page, or load it from the recipe cache."""
+        app_class = type(self)
+        if not recipe_cache.enabled(app_class):
+            self.recipe(self._page)
+            return
+        if recipe_cache.load(app_class, self._page):
+            return
         self.recipe(self._page)
+        recipe_cache.save(app_class, self._page)
 
     @property
     def page(self) -> Bag:
@@ -91,6 +247,38 @@ class TextualApp:
         """The data Bag (application data)."""
         return self._data
 
+    @property
+    def events(self) -> EventHub:
+        """Hub of the UI events (button presses, changes, selections, keys)."""
+        return self._events
+
+    @property
+    def update_stats(self) -> dict[str, int]:
+        """Counters of the frame-coalesced widget update scheduler."""
+        return self._scheduler.stats()
+
+    @property
+    def frame_stats(self) -> dict[str, float]:
+        """Duration and event loop lag of the scheduler frames (see scheduler.py)."""
+        return self._scheduler.frame_stats()
+
+    @property
+    def resolver_stats(self) -> dict[str, int]:
+        """Counters of the resolver pool (hits, misses, evaluations...)."""
+        return self._resolvers.stats()
+
+    def data_writer(
+        self, maxlen: int | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> DataWriter:
+        """Create a thread-safe writer for bulk updates of the data Bag.
+
+        Producers call writer.write(path, value) from any thread or task; the
+        UI thread applies up to batch_size queued updates per frame, keeping
+        only the last value of each path. With maxlen the queue is bounded and
+        the oldest updates are dropped when full.
+        """
+        return DataWriter(self._data, self._scheduler, maxlen=maxlen, batch_size=batch_size)
+
     def recipe(self, root: Bag) -> None:
         """Override this method to build your UI.
 
@@ -98,11 +286,126 @@ class TextualApp:
             root: The page Bag. Add widgets by calling methods on it.
         """
 
+    def reload_recipe(self, app_class: type | None = None) -> int:
+        """Rebuild the page from recipe() and patch only the changed widgets.
+
+        The data Bag is left untouched. If app_class is given (a reloaded
+        version of this app's class, with the same name), its methods are
+        copied onto this app's class first so that its new recipe() is used.
+
+        Returns:
+            The number of nodes recompiled.
+        """
+        if app_class is not None and app_class is not type(self):
+            from genro_pygui.hot_reload import update_class
+
+            update_class(type(self), app_class)
+
+        old_page = self._page
+        new_page = Bag(builder=TextualBuilder)
+        new_page.builder.binder = self._binder
+        new_page.builder.index = self._index
+        self.recipe(new_page)
+
+        textual_app = self._textual_app
+        if textual_app is None or textual_app.root is None:
+            changed = len(new_page)
+        else:
+            builder = old_page.builder
+            with textual_app.batch_update():
+                changed = builder.patch(old_page, new_page, textual_app.root)
+            new_page.builder._retiring = builder._retiring
+            # I widget parcheggiati restano nel DOM: li gestisce il nuovo builder
+            new_page.builder._pool = builder._pool
+            new_page.builder.pool_stats = builder.pool_stats
+
+        old_page.unsubscribe("_textualapp", any=True)
+        self._page = new_page
+        self._index.rebuild(new_page)
+        new_page.subscribe("_textualapp", any=self._on_page_change)
+        return changed
+
+    # -------------------------------------------------------------------------
+    # Node index
+    # -------------------------------------------------------------------------
+
+    def get_node_by_id(self, node_id: str) -> BagNode | None:
+        """Page node with the given id attribute (O(1), no walk)."""
+        return self._index.node_by_id(node_id)
+
+    def get_widget(self, node: BagNode | str) -> Widget | None:
+        """Widget compiled from a page node, given as BagNode, node id or widget id."""
+        return self._index.widget_for(node)
+
+    def get_node_for_widget(self, widget: Widget | str) -> BagNode | None:
+        """Page node that compiled to widget (a Widget or its id)."""
+        return self._index.node_for_widget(widget)
+
+    def _on_page_change(self, node: BagNode, evt: str, **kw: Any) -> None:
+        """Page subscriber: keep the index updated, compile/remove live nodes."""
+        self._index.on_page_change(node=node, evt=evt, **kw)
+        if not self._compiled:
+            return
+        if evt == "ins":
+            # Tag e attributi non sono ancora impostati: compila al prossimo frame
+            self._pending_compile.append((node, None))
+        elif evt == "del":
+            # Bag.clear() manda un solo del con la lista dei nodi rimossi
+            removed = node if isinstance(node, list) else [node]
+            if not removed:
+                return
+            for removed_node in removed:
+                self._page.builder.cleanup_node(removed_node)
+            parent_bag = removed[0].parent_bag
+            parent_node = parent_bag.parent_node if parent_bag is not None else None
+            if parent_node is not None and "widget" in parent_node.compiled:
+                # Es. option di un optionlist: il parent va riallineato
+                self._pending_compile.append((parent_node, parent_node.get_value(static=True)))
+        elif evt == "upd_value" and isinstance(kw.get("oldvalue"), Bag):
+            # Figli di un container sostituiti: riconciliazione per chiave
+            self._pending_compile.append((node, kw["oldvalue"]))
+
+    def _compile_inserted(self) -> None:
+        """Scheduler source: compile inserted nodes, reconcile replaced children."""
+        if not self._pending_compile:
+            return
+        pending = self._pending_compile
+        self._pending_compile = []
+        builder = self._page.builder
+        root = self._textual_app.root
+        # Nodi del frame montati in blocco, in un solo aggiornamento dello schermo
+        with self._textual_app.batch_update(), builder.batched_mounts():
+            for node, old_children in pending:
+                if not is_attached(node):
+                    continue
+                if old_children is None:
+                    with tracing.span(f"compile {node.tag}", "ui", label=node.label):
+                        try:
+                            builder.compile_inserted(node, root)
+                        except ValueError as e:
+                            # Es. un dataformula che chiude un ciclo: il frame non
+                            # deve fermare l'app, il nodo resta non compilato
+                            logger.warning("Cannot compile %s node %r: %s", node.tag, node.label, e)
+                else:
+                    # La riconciliazione sposta widget esistenti: prima i mount in attesa
+                    builder.flush_mounts()
+                    builder.reconcile_children(node, old_children, root)
+
+    def _expire_pool(self) -> None:
+        """Scheduler source: remove pooled widgets left unused for too long."""
+        self._page.builder.expire_pool()
+
+    def enable_hot_reload(self, file_path: str) -> None:
+        """Reload recipe() in-process whenever file_path changes."""
+        self._hot_reload_path = file_path
 
     def run(self) -> None:
         """Run the Textual app."""
         self._textual_app = TextualWrapperApp(self)
-        self._textual_app.run()
+        try:
+            self._textual_app.run()
+        finally:
+            self._resolvers.shutdown()
 
     def _enable_remote(self, port: int) -> None:
         """Enable remote control via socket."""
@@ -7,34 +7,135 @@ Each method is decorated with @element and has proper sub_tags and typed paramet
 
 from __future__ import annotations
 
+import hashlib
 import inspect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from importlib import import_module
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from genro_bag import Bag
 from genro_bag.builder import BagBuilderBase, element
+from textual.reactive import Reactive
 from textual.widget import Widget
 
+from genro_pygui import profiling, tracing
+
 if TYPE_CHECKING:
     from genro_bag.bagnode import BagNode
+    from textual.await_remove import AwaitRemove
+
+    from genro_pygui.binding import DataBinder
+    from genro_pygui.node_index import NodeIndex
+
+
+# Max parked widgets per (parent, tag) free-list
+POOL_SIZE = 1024
+# Seconds a parked widget waits for reuse before it is removed
+POOL_MAX_AGE = 30.0
+
+
+def _is_dynamic(value: Any) -> bool:
+    """True for ^path/=path/==formula values, whose resolved value may change."""
+    return isinstance(value, str) and value[:1] in ("^", "=")
+
+
+def _is_settable(widget: Widget, prop: str) -> bool:
+    """True if prop can be assigned on a live widget."""
+    if prop == "content":
+        return hasattr(widget, "update")
+    if prop == "classes":
+        return True
+    descriptor = getattr(type(widget), prop, None)
+    if isinstance(descriptor, Reactive):
+        return True
+    return isinstance(descriptor, property) and descriptor.fset is not None
+
+
+def _navigates_disabled(widget: Widget) -> bool:
+    """True for containers whose keyboard navigation skips only disabled children."""
+    from textual.widgets import ListView
+
+    return isinstance(widget, ListView)
+
+
+class CompilePlan(NamedTuple):
+    """Signature analysis of a widget class (or method), computed once."""
+
+    valid_params: frozenset[str]
+    has_var_keyword: bool
+    first_param: str | None
 
 
 class TextualBuilder(BagBuilderBase):
     """Builder for Textual TUI elements.
 
     All standard Textual widgets are available as methods.
+
+    Widget class lookup and signature introspection are cached at class level
+    (compile plans), so they are paid once per process and shared by every
+    builder instance - and by every child forked from a warm server.
     """
 
+    _widget_classes: dict[str, type] = {}
+    _compile_plans: dict[Any, CompilePlan] = {}
+
     def __init__(self, bag: Bag) -> None:
         super().__init__(bag)
-        self._widget_counter = 0
-
-    @property
-    def widget_counter(self) -> int:
-        """Return current counter and auto-increment for next widget."""
-        current = self._widget_counter
-        self._widget_counter += 1
-        return current
+        # Widgets removed but not yet pruned by Textual, by id
+        self._retiring: dict[str, Widget] = {}
+        # Free-list of parked widgets: (parent widget, tag) -> [(node, parked at)]
+        # Chiave sul widget, non su id(): un id riciclato non riceve widget altrui
+        self._pool: dict[tuple[Widget, str], list[tuple[BagNode, float]]] = {}
+        self.pool_stats = {"parked": 0, "reused": 0, "expired": 0}
+        # Mount differiti dentro batched_mounts(): (parent, widget, kwargs)
+        self._mount_batch: list[tuple[Widget, Widget, dict[str, Any]]] | None = None
+        # Set by TextualApp: resolves ^path/=path attributes against the data Bag
+        self.binder: DataBinder | None = None
+        # Set by TextualApp: node id / widget id lookups
+        self.index: NodeIndex | None = None
+
+    def node_path(self, node: BagNode) -> str:
+        """Path of node in the page Bag, cached in node.compiled."""
+        compiled = node.compiled
+        path = compiled.get("path")
+        if path is None:
+            parent_node = node.parent_node
+            path = f"{self.node_path(parent_node)}.{node.label}" if parent_node else node.label
+            compiled["path"] = path
+        return path
+
+    def widget_id(self, node: BagNode) -> str:
+        """Stable widget id for node: tag + digest of its page path (cached on the node).
+
+        The same page always yields the same ids, across recompiles and
+        processes. Only a widget mounted while the one it replaces is still
+        being removed gets a generation suffix, since Textual ids must stay
+        unique; the suffix is not cached, so the next widget of the node gets
+        the plain id back once that removal has completed.
+        """
+        compiled = node.compiled
+        base_id = compiled.get("widget_id")
+        if base_id is None:
+            digest = hashlib.blake2b(self.node_path(node).encode(), digest_size=5).hexdigest()
+            base_id = compiled["widget_id"] = f"{node.tag or 'static'}_{digest}"
+        widget_id = base_id
+        generation = 0
+        while self._is_retiring(widget_id):
+            generation += 1
+            widget_id = f"{base_id}-{generation}"
+        return widget_id
+
+    def _is_retiring(self, widget_id: str) -> bool:
+        """True if a removed widget still holds widget_id in the DOM."""
+        widget = self._retiring.get(widget_id)
+        if widget is None:
+            return False
+        if widget.parent is None:
+            del self._retiring[widget_id]
+            return False
+        return True
 
     # -------------------------------------------------------------------------
     # Container elements (from textual.containers)
@@ -341,11 +442,16 @@ class TextualBuilder(BagBuilderBase):
         """A masked text input widget."""
         ...
 
-    @element(sub_tags="*", compile_module="textual.widgets", compile_class="OptionList")
+    @element(sub_tags="option", compile_module="textual.widgets", compile_class="OptionList")
     def optionlist(self, markup: bool = True, compact: bool = False):
         """A navigable list of options."""
         ...
 
+    @element(sub_tags="", parent_tags="optionlist")
+    def option(self, disabled: bool = False):
+        """An option of an OptionList (value is the prompt, _key the option id)."""
+        ...
+
     @element(sub_tags="", compile_module="textual.widgets", compile_class="Placeholder")
     def placeholder(self, content: str = "", label: str | None = None, variant: str = "default"):
         """A simple placeholder widget to use before you build your custom widgets."""
@@ -422,11 +528,16 @@ class TextualBuilder(BagBuilderBase):
         """Widget to select from a list of possible options."""
         ...
 
-    @element(sub_tags="*", compile_module="textual.widgets", compile_class="SelectionList")
+    @element(sub_tags="selection", compile_module="textual.widgets", compile_class="SelectionList")
     def selectionlist(self, compact: bool = False):
         """A vertical selection list that allows making multiple selections."""
         ...
 
+    @element(sub_tags="", parent_tags="selectionlist")
+    def selection(self, value: Any = None, initial_state: bool = False, disabled: bool = False):
+        """A selection of a SelectionList (value defaults to the _key)."""
+        ...
+
     @element(sub_tags="", compile_module="textual.widgets", compile_class="Sparkline")
     def sparkline(
         self,
@@ -516,6 +627,24 @@ class TextualBuilder(BagBuilderBase):
         """A widget for displaying and navigating data in a tree."""
         ...
 
+    @element(sub_tags="", compile_module="genro_pygui.bagtree", compile_class="BagTree")
+    def bagtree(
+        self,
+        source: str | None = None,
+        label: str = "",
+        page_size: int = 200,
+        label_attr: str | None = None,
+        show_values: bool = True,
+        release_collapsed: bool = True,
+        search: str = "",
+        resolve_visible: bool = True,
+    ):
+        """Tree over a Bag of the data (value: ^path), expanded lazily.
+
+        Example: root.bagtree("^.catalog", label="Catalog", page_size=500)
+        """
+        ...
+
     @element(sub_tags="", compile_module="textual.widgets", compile_class="Welcome")
     def welcome(
         self, content: str = "", expand: bool = False, shrink: bool = False, markup: bool = True
@@ -523,6 +652,18 @@ class TextualBuilder(BagBuilderBase):
         """A Textual welcome widget."""
         ...
 
+    # -------------------------------------------------------------------------
+    # Data elements (no widget)
+    # -------------------------------------------------------------------------
+
+    @element(sub_tags="")
+    def dataformula(self, formula: str = ""):
+        """Compute formula from the node attributes into the data path given as value.
+
+        Example: root.dataformula(".totale", formula="prezzo * qta", prezzo="^.prezzo", qta="^.qta")
+        """
+        ...
+
     # -------------------------------------------------------------------------
     # Compile: transform Bag to Textual widgets using mount()
     # -------------------------------------------------------------------------
@@ -532,92 +673,618 @@ class TextualBuilder(BagBuilderBase):
         for node in bag:
             self._compile_node(node, parent_widget)
 
-    def _compile_node(self, node: BagNode, parent_widget: Widget) -> None:
-        """Compile a single node and mount it to parent."""
+    def _compile_node(self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any) -> None:
+        """Compile a single node and mount it to parent.
+
+        mount_kwargs (before/after) are forwarded to mount() to place the widget.
+        """
+        profiler = profiling.active
+        if profiler is None:
+            self._compile_node_widget(node, parent_widget, mount_kwargs)
+            return
+
+        profiler.enter(node.tag or "static", node.fullpath or node.label)
+        try:
+            self._compile_node_widget(node, parent_widget, mount_kwargs)
+        finally:
+            profiler.exit()
+
+    def _compile_node_widget(
+        self, node: BagNode, parent_widget: Widget, mount_kwargs: dict[str, Any]
+    ) -> None:
+        """Body of _compile_node: create the widget, mount it, compile children."""
         tag = node.tag or "static"
+        profiler = profiling.active
 
         # Check for dedicated compile method _compile_<tag>
         compile_method = getattr(self, f"_compile_{tag}", None)
         if compile_method:
-            compile_method(node, parent_widget)
+            compile_method(node, parent_widget, **mount_kwargs)
             return
 
         attr = dict(node.attr)
+        textual_class = self.get_widget_class(tag)
+        first_param = self._get_first_positional_param(textual_class)
+        if profiler is not None:
+            profiler.mark("lookup")
 
-        schema_info = self.get_schema_info(tag)
-        compile_kwargs = schema_info.get("compile_kwargs", {})
-
-        module_name = compile_kwargs.get("module", "textual.widgets")
-        class_name = compile_kwargs.get("class")
-
-        if class_name is None:
-            raise ValueError(f"Element '{tag}' missing compile_class in schema")
-
-        module = import_module(module_name)
-        textual_class = getattr(module, class_name)
+        value = node.value
+        pending = None
+        if self.binder is not None:
+            attr, value, pending = self.binder.prepare(node, attr, value, first_param)
 
         kwargs = self._build_widget_kwargs(attr, textual_class)
 
-        # Auto-generate unique widget id
+        # Id stabile derivato dal path del nodo
         if "id" not in kwargs:
-            kwargs["id"] = f"{tag}_{self.widget_counter}"
+            kwargs["id"] = self.widget_id(node)
 
-        if isinstance(node.value, Bag):
+        if isinstance(value, Bag):
             # CONTAINER: ha figli
             content = ""
         else:
             # LEAF: prendi il contenuto
-            content = str(node.value) if node.value else ""
+            content = str(value) if value else ""
 
         # Crea il widget - mappa content sul primo parametro posizionale come keyword
-        first_param = self._get_first_positional_param(textual_class)
         if content and first_param and first_param not in kwargs:
             kwargs[first_param] = content
+        if profiler is not None:
+            profiler.mark("kwargs")
         widget = textual_class(**kwargs)
+        if pending:
+            self.binder.bind(widget, pending)
 
         # Salva il widget nel nodo
-        node.compiled["widget"] = widget
+        self._set_widget(node, widget)
 
         # Monta il widget nel parent
-        parent_widget.mount(widget)
+        self._mount(parent_widget, widget, **mount_kwargs)
 
         # Se è un container, compila ricorsivamente i figli
         if isinstance(node.value, Bag):
             for child_node in node.value:
                 self._compile_node(child_node, widget)
 
-    def _build_widget_kwargs(self, attr: dict[str, Any], widget_class: type) -> dict[str, Any]:
-        """Build kwargs for widget constructor, filtering by signature."""
-        sig = inspect.signature(widget_class.__init__)
-        valid_params = set(sig.parameters.keys()) - {"self"}
-        has_var_keyword = any(
-            p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()
+    def _set_widget(self, node: BagNode, widget: Widget) -> None:
+        """Save the widget in the node and register it in the index."""
+        node.compiled["widget"] = widget
+        if self.index is not None:
+            self.index.widget_compiled(node, widget)
+
+    def _mount(self, parent_widget: Widget, widget: Widget, **mount_kwargs: Any) -> None:
+        """Mount widget to parent, or queue it for compose if parent is not mounted yet."""
+        profiler = profiling.active
+        if profiler is not None:
+            profiler.mark("construct")
+        if parent_widget.is_attached:
+            if self._mount_batch is not None:
+                self._mount_batch.append((parent_widget, widget, mount_kwargs))
+            else:
+                parent_widget.mount(widget, **mount_kwargs)
+        else:
+            parent_widget.compose_add_child(widget)
+        if profiler is not None:
+            profiler.mark("mount")
+
+    @contextmanager
+    def batched_mounts(self) -> Iterator[None]:
+        """Defer the mounts into live parents made in the block, then mount
+        each run of consecutive siblings with a single mount() call.
+
+        Textual's mount() costs O(children of the parent): inserting N
+        siblings one by one is O(N²), in one call it is O(N).
+        """
+        if self._mount_batch is not None:
+            yield
+            return
+        self._mount_batch = []
+        try:
+            yield
+        finally:
+            self.flush_mounts()
+            self._mount_batch = None
+
+    def flush_mounts(self) -> None:
+        """Perform the mounts deferred so far by batched_mounts()."""
+        batch = self._mount_batch
+        if not batch:
+            return
+        self._mount_batch = []
+        with tracing.span("mount", "ui", widgets=len(batch)):
+            self._mount_groups(batch)
+
+    def _mount_groups(self, batch: list[tuple[Widget, Widget, dict[str, Any]]]) -> None:
+        """Mount each run of consecutive siblings in batch with one mount() call."""
+        group: list[Widget] = []
+        group_parent = None
+        group_kwargs: dict[str, Any] = {}
+        for parent_widget, widget, mount_kwargs in batch:
+            if group and parent_widget is group_parent and mount_kwargs.get("after") is group[-1]:
+                group.append(widget)
+                continue
+            if group:
+                group_parent.mount(*group, **group_kwargs)
+            group, group_parent, group_kwargs = [widget], parent_widget, mount_kwargs
+        group_parent.mount(*group, **group_kwargs)
+
+    # -------------------------------------------------------------------------
+    # Incremental patch: reconcile a rebuilt recipe with the live widgets
+    # -------------------------------------------------------------------------
+
+    def cleanup_node(self, node: BagNode) -> AwaitRemove | None:
+        """Remove the node's widget from the DOM and drop compiled references.
+
+        Returns the awaitable removal of the widget, if it was mounted.
+        """
+        value = node.get_value(static=True)
+        if isinstance(value, Bag):
+            for child_node in value:
+                self.cleanup_node(child_node)
+
+        formula = node.compiled.pop("formula", None)
+        if formula is not None:
+            self.binder.formulas.unregister(formula)
+
+        widget = node.compiled.pop("widget", None)
+        node.compiled.pop("widget_id", None)
+        if widget is None:
+            return None
+        if self._pool:
+            for key in [key for key in self._pool if key[0] is widget]:
+                for parked_node, _ in self._pool.pop(key):
+                    self.cleanup_node(parked_node)
+        if self.binder is not None:
+            self.binder.unbind(widget)
+        if self.index is not None:
+            self.index.widget_removed(widget)
+        if widget.parent is not None:
+            if widget.id:
+                if len(self._retiring) > 1024:
+                    self._retiring = {k: w for k, w in self._retiring.items() if w.parent}
+                self._retiring[widget.id] = widget
+            return widget.remove()
+        return None
+
+    def compile_inserted(self, node: BagNode, root_widget: Widget) -> bool:
+        """Compile a node inserted in an already compiled page, in position.
+
+        Children of widgets built by a dedicated compile method are added
+        through _insert_into_<parent tag> (e.g. datatable rows) or, if there
+        is none, by recompiling the parent. Returns False if the node cannot
+        be placed (parent not compiled).
+        """
+        if "widget" in node.compiled or "formula" in node.compiled:
+            return True
+        parent_node = node.parent_node
+        if parent_node is None:
+            parent_widget = root_widget
+        else:
+            parent_widget = parent_node.compiled.get("widget")
+            if parent_widget is None:
+                return False
+            parent_tag = parent_node.tag or "static"
+            insert_method = getattr(self, f"_insert_into_{parent_tag}", None)
+            if insert_method is not None:
+                insert_method(node, parent_widget)
+                return True
+            if getattr(self, f"_compile_{parent_tag}", None) is not None:
+                return self.recompile(parent_node, root_widget)
+
+        previous = None
+        siblings = node.parent_bag.nodes
+        for index in range(node.position - 1, -1, -1):
+            previous = siblings[index].compiled.get("widget")
+            if previous is not None:
+                break
+        self._compile_node(node, parent_widget, **self._mount_position(parent_widget, previous))
+        return True
+
+    def reconcile_children(self, node: BagNode, old_children: Bag, root_widget: Widget) -> int:
+        """Reconcile a compiled container whose children Bag was replaced or edited."""
+        widget = node.compiled.get("widget")
+        new_children = node.get_value(static=True)
+        if widget is None:
+            return 0
+        tag = node.tag or "static"
+        reconcile = getattr(self, f"_reconcile_{tag}", None)
+        if reconcile is not None:
+            reconcile(node, widget)
+            return 1
+        if getattr(self, f"_compile_{tag}", None) is not None or not isinstance(new_children, Bag):
+            self.recompile(node, root_widget)
+            return 1
+        if new_children is old_children:
+            return 0
+        return self.patch(old_children, new_children, widget)
+
+    def recompile(self, node: BagNode, root_widget: Widget) -> bool:
+        """Replace node's widget with a freshly compiled one, in the same place."""
+        removing = self.cleanup_node(node)
+        if removing is None:
+            return self.compile_inserted(node, root_widget)
+
+        async def replace() -> None:
+            # Il vecchio widget deve sparire prima: gli id devono restare unici
+            await removing
+            self.compile_inserted(node, root_widget)
+
+        root_widget.run_worker(replace(), group="recompile")
+        return True
+
+    def patch(self, old_bag: Bag, new_bag: Bag, parent_widget: Widget) -> int:
+        """Reconcile new_bag against the compiled old_bag, touching only what changed.
+
+        Nodes are matched by key (the _key attribute, else the label).
+        Unchanged nodes keep their widget, which is transferred to the
+        matching node of new_bag. A changed node is updated in place when
+        every changed property is settable on its widget, otherwise it is
+        released to the free-list and its replacement is taken from there
+        or compiled. Containers without a dedicated compile method are
+        patched recursively.
+
+        Returns:
+            The number of nodes updated, replaced, added or removed.
+        """
+        new_keys = {self.node_key(node) for node in new_bag}
+        old_nodes = {}
+        changed = 0
+        for old_node in old_bag:
+            key = self.node_key(old_node)
+            if key in new_keys:
+                old_nodes[key] = old_node
+            else:
+                # Rilasciati subito: il pool può servire i nodi nuovi
+                self.release(old_node, parent_widget)
+                changed += 1
+
+        previous: Widget | None = None
+        for new_node in new_bag:
+            old_node = old_nodes.pop(self.node_key(new_node), None)
+            reused = None
+            if old_node is not None:
+                if self._same_node(old_node, new_node) and self._compiled_target(old_node):
+                    reused = self._transfer(old_node, new_node)
+                elif self._reuse(old_node, new_node):
+                    reused = new_node.compiled["widget"]
+                    changed += 1
+                else:
+                    self.release(old_node, parent_widget)
+
+            if reused is None:
+                reused = self._take_pooled(parent_widget, new_node)
+                if reused is None:
+                    self._compile_node(
+                        new_node, parent_widget, **self._mount_position(parent_widget, previous)
+                    )
+                    previous = new_node.compiled.get("widget", previous)
+                    changed += 1
+                    continue
+                changed += 1
+
+            if isinstance(reused, Widget):
+                self._place_after(parent_widget, reused, previous)
+                previous = reused
+            old_value = old_node.get_value(static=True) if old_node is not None else None
+            new_value = new_node.get_value(static=True)
+            if isinstance(old_value, Bag) and isinstance(new_value, Bag) and isinstance(
+                reused, Widget
+            ):
+                if getattr(self, f"_compile_{new_node.tag or 'static'}", None) is None:
+                    changed += self.patch(old_value, new_value, reused)
+
+        return changed
+
+    # -------------------------------------------------------------------------
+    # Keyed reconciliation and widget pooling
+    # -------------------------------------------------------------------------
+
+    def node_key(self, node: BagNode) -> str:
+        """Reconciliation key of a node: its _key attribute, else its label."""
+        return node.attr.get("_key") or node.label
+
+    def _compiled_target(self, node: BagNode) -> Any:
+        """The widget (or data formula) compiled from node, if any."""
+        compiled = node.compiled
+        return compiled.get("widget") or compiled.get("formula")
+
+    def _transfer(self, old_node: BagNode, new_node: BagNode) -> Any:
+        """Move the compiled widget (or formula) of old_node to new_node."""
+        target = self._compiled_target(old_node)
+        widget = old_node.compiled.pop("widget", None)
+        formula = old_node.compiled.pop("formula", None)
+        if formula is not None:
+            new_node.compiled["formula"] = formula
+        if widget is not None:
+            self._set_widget(new_node, widget)
+        return target
+
+    def _reuse(self, old_node: BagNode, new_node: BagNode, force: bool = False) -> bool:
+        """Give old_node's widget to new_node, updating its properties in place."""
+        widget = old_node.compiled.get("widget")
+        if widget is None or not self.update_in_place(old_node, new_node, widget, force):
+            return False
+        self._transfer(old_node, new_node)
+        return True
+
+    def update_in_place(
+        self, old_node: BagNode, new_node: BagNode, widget: Widget, force: bool = False
+    ) -> bool:
+        """Apply new_node's attributes and value to old_node's widget.
+
+        Only the properties that differ are set (all of them with force).
+        Returns False, leaving the widget untouched, if the tag or explicit
+        id differ, an attribute was removed, or a property is not settable.
+        Children of generic containers are left to patch().
+        """
+        tag = new_node.tag or "static"
+        old_attr, new_attr = old_node.attr, new_node.attr
+        if old_node.tag != new_node.tag or old_attr.get("id") != new_attr.get("id"):
+            return False
+        if any(key not in new_attr and not key.startswith("_") for key in old_attr):
+            return False
+
+        old_value = old_node.get_value(static=True)
+        new_value = new_node.get_value(static=True)
+        reconcile_children = None
+        if isinstance(old_value, Bag) or isinstance(new_value, Bag):
+            if not (isinstance(old_value, Bag) and isinstance(new_value, Bag)):
+                return False
+            if getattr(self, f"_compile_{tag}", None) is not None:
+                reconcile_children = getattr(self, f"_reconcile_{tag}", None)
+                if reconcile_children is None and old_value != new_value:
+                    return False
+
+        plan = self._get_compile_plan(type(widget))
+        attr = dict(new_attr)
+        value = None if isinstance(new_value, Bag) else new_value
+        pending = None
+        if self.binder is not None:
+            attr, value, pending = self.binder.prepare(new_node, attr, value, plan.first_param)
+
+        updates = {}
+        for key, resolved in attr.items():
+            if key == "id" or key.startswith("_"):
+                continue
+            if not plan.has_var_keyword and key not in plan.valid_params:
+                continue
+            raw = new_attr.get(key)
+            if not force and old_attr.get(key) == raw and not _is_dynamic(raw):
+                continue
+            if not _is_settable(widget, key):
+                return False
+            updates[key] = resolved
+        if not isinstance(new_value, Bag) and (
+            force or old_value != new_value or _is_dynamic(new_value)
+        ):
+            prop = plan.first_param
+            if prop is None or not _is_settable(widget, prop):
+                return False
+            updates[prop] = str(value) if value else ""
+
+        from genro_pygui.binding import set_widget_property
+
+        if self.binder is not None:
+            self.binder.unbind(widget)
+        for key, resolved in updates.items():
+            set_widget_property(widget, key, resolved)
+        if pending:
+            self.binder.bind(widget, pending)
+        if reconcile_children is not None:
+            reconcile_children(new_node, widget)
+        return True
+
+    def release(self, node: BagNode, parent_widget: Widget) -> None:
+        """Park node's widget in the free-list of parent_widget, or destroy it.
+
+        Parked widgets stay mounted but hidden and disabled (Textual cannot
+        remount a removed widget); _take_pooled() hands them out again, and
+        expire_pool() removes those not reused within POOL_MAX_AGE seconds.
+        """
+        widget = node.compiled.get("widget")
+        if widget is None or widget.parent is not parent_widget or "id" in node.attr:
+            self.cleanup_node(node)
+            return
+        tag = node.tag or "static"
+        if getattr(self, f"_compile_{tag}", None) and not hasattr(self, f"_reconcile_{tag}"):
+            self.cleanup_node(node)
+            return
+        pool = self._pool.setdefault((parent_widget, tag), [])
+        if len(pool) >= POOL_SIZE:
+            self.cleanup_node(node)
+            return
+        if self.binder is not None:
+            self.binder.unbind(widget)
+        if self.index is not None:
+            self.index.widget_removed(widget)
+        widget.display = False
+        if _navigates_disabled(parent_widget):
+            # ListView naviga anche sui figli nascosti: solo disabled li salta
+            widget.disabled = True
+        pool.append((node, time.monotonic()))
+        self.pool_stats["parked"] += 1
+
+    def _take_pooled(self, parent_widget: Widget, new_node: BagNode) -> Widget | None:
+        """Reuse a parked widget of the same tag for new_node, if any."""
+        pool = self._pool.get((parent_widget, new_node.tag or "static"))
+        while pool:
+            old_node, _ = pool.pop()
+            widget = old_node.compiled.get("widget")
+            if widget is None or widget.parent is not parent_widget:
+                continue
+            if widget.disabled and _navigates_disabled(parent_widget):
+                widget.disabled = False
+            if self._reuse(old_node, new_node, force=True):
+                widget.display = True
+                self.pool_stats["reused"] += 1
+                old_value = old_node.get_value(static=True)
+                new_value = new_node.get_value(static=True)
+                tag = new_node.tag or "static"
+                if isinstance(new_value, Bag) and getattr(self, f"_compile_{tag}", None) is None:
+                    self.patch(old_value, new_value, widget)
+                return widget
+            self.cleanup_node(old_node)
+        return None
+
+    def expire_pool(self, max_age: float = POOL_MAX_AGE) -> int:
+        """Remove the widgets parked for more than max_age seconds. Returns how many.
+
+        The widgets parked in a parent that is no longer attached go at once.
+        """
+        if not self._pool:
+            return 0
+        deadline = time.monotonic() - max_age
+        expired = []
+        for key, pool in list(self._pool.items()):
+            # In ordine di parcheggio: i più vecchi sono in testa
+            count = 0 if key[0].is_attached else len(pool)
+            while count < len(pool) and pool[count][1] < deadline:
+                count += 1
+            if not count:
+                continue
+            expired.extend(node for node, _ in pool[:count])
+            del pool[:count]
+            if not pool:
+                del self._pool[key]
+        for node in expired:
+            self.cleanup_node(node)
+        self.pool_stats["expired"] += len(expired)
+        return len(expired)
+
+    def drain_pool(self) -> None:
+        """Destroy every parked widget."""
+        pools = self._pool
+        self._pool = {}
+        for pool in pools.values():
+            for node, _ in pool:
+                self.cleanup_node(node)
+
+    def _same_node(self, old_node: BagNode, new_node: BagNode) -> bool:
+        """True if new_node can reuse old_node's widget (children are diffed apart)."""
+        if old_node.tag != new_node.tag or old_node.attr != new_node.attr:
+            return False
+        old_value = old_node.get_value(static=True)
+        new_value = new_node.get_value(static=True)
+        if isinstance(old_value, Bag) and isinstance(new_value, Bag):
+            # Dedicated compile methods build their children themselves
+            if getattr(self, f"_compile_{new_node.tag or 'static'}", None) is None:
+                return True
+            return old_value == new_value
+        return old_value == new_value
+
+    def _mount_position(self, parent_widget: Widget, previous: Widget | None) -> dict[str, Any]:
+        """mount() kwargs placing a widget right after previous (or first)."""
+        if previous is not None:
+            return {"after": previous}
+        if parent_widget.children:
+            return {"before": 0}
+        return {}
+
+    def _place_after(self, parent_widget: Widget, widget: Widget, previous: Widget | None) -> None:
+        """Move an existing widget right after previous, if it is not there already."""
+        children = list(parent_widget.children)
+        if widget not in children:
+            return
+        index = children.index(widget)
+        if previous is None:
+            if index != 0:
+                parent_widget.move_child(widget, before=0)
+        elif previous in children and children.index(previous) != index - 1:
+            parent_widget.move_child(widget, after=previous)
+
+    # -------------------------------------------------------------------------
+    # Compile plans: cached class lookup and signature introspection
+    # -------------------------------------------------------------------------
+
+    def get_widget_class(self, tag: str) -> type:
+        """Return the Textual class for a tag, importing it on first use."""
+        widget_class = self._widget_classes.get(tag)
+        if widget_class is not None:
+            return widget_class
+
+        schema_info = self.get_schema_info(tag)
+        compile_kwargs = schema_info.get("compile_kwargs", {})
+
+        module_name = compile_kwargs.get("module", "textual.widgets")
+        class_name = compile_kwargs.get("class")
+
+        if class_name is None:
+            raise ValueError(f"Element '{tag}' missing compile_class in schema")
+
+        widget_class = getattr(import_module(module_name), class_name)
+        self._widget_classes[tag] = widget_class
+        return widget_class
+
+    def _get_compile_plan(self, target: Any) -> CompilePlan:
+        """Return the cached CompilePlan for a widget class or a bound method."""
+        key = getattr(target, "__func__", target)
+        plan = self._compile_plans.get(key)
+        if plan is not None:
+            return plan
+
+        if isinstance(target, type):
+            params = list(inspect.signature(target.__init__).parameters.values())[1:]
+        else:
+            params = [p for p in inspect.signature(target).parameters.values() if p.name != "self"]
+
+        first_param = None
+        if params and params[0].kind in (
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.POSITIONAL_ONLY,
+        ):
+            first_param = params[0].name
+
+        plan = CompilePlan(
+            valid_params=frozenset(p.name for p in params),
+            has_var_keyword=any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params),
+            first_param=first_param,
         )
+        self._compile_plans[key] = plan
+        return plan
+
+    def preload(self) -> int:
+        """Import every widget class in the schema and build its compile plan.
+
+        Returns the number of elements preloaded. Used by the warm server so
+        that forked children start with all plans already in memory. Elements
+        whose class is missing in the installed Textual version are skipped.
+        """
+        count = 0
+        for schema_node in self.schema:
+            tag = schema_node.label
+            if tag.startswith("@"):
+                continue
+            compile_kwargs = self.get_schema_info(tag).get("compile_kwargs") or {}
+            if not compile_kwargs.get("class"):
+                continue
+            try:
+                widget_class = self.get_widget_class(tag)
+            except (AttributeError, ImportError):
+                continue
+            self._get_compile_plan(widget_class)
+            count += 1
+        return count
+
+    def _filter_kwargs(self, attr: dict[str, Any], plan: CompilePlan) -> dict[str, Any]:
+        """Keep public attributes accepted by the plan's signature."""
         kwargs = {}
         for key, value in attr.items():
             if key.startswith("_"):
                 continue
-            if has_var_keyword or key in valid_params:
+            if plan.has_var_keyword or key in plan.valid_params:
                 kwargs[key] = value
         return kwargs
 
+    def _build_widget_kwargs(self, attr: dict[str, Any], widget_class: type) -> dict[str, Any]:
+        """Build kwargs for widget constructor, filtering by signature."""
+        return self._filter_kwargs(attr, self._get_compile_plan(widget_class))
+
     def _build_method_kwargs(self, attr: dict[str, Any], method: callable) -> dict[str, Any]:
         """Build kwargs for a method call, filtering by signature.
 
         Similar to _build_widget_kwargs but for methods like add_row(), add_column().
         """
-        sig = inspect.signature(method)
-        valid_params = set(sig.parameters.keys()) - {"self"}
-        has_var_keyword = any(
-            p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()
-        )
-        kwargs = {}
-        for key, value in attr.items():
-            if key.startswith("_"):
-                continue
-            if has_var_keyword or key in valid_params:
-                kwargs[key] = value
-        return kwargs
+        return self._filter_kwargs(attr, self._get_compile_plan(method))
 
     def _get_first_positional_param(self, widget_class: type) -> str | None:
         """Get the name of the first positional parameter (after self).
@@ -625,57 +1292,111 @@ class TextualBuilder(BagBuilderBase):
         Returns the parameter name if it exists and is positional, None otherwise.
         This allows mapping node.value to the appropriate parameter (content, label, text, etc.)
         """
-        sig = inspect.signature(widget_class.__init__)
-        params = list(sig.parameters.values())
-        if len(params) > 1:
-            first_param = params[1]  # Skip 'self'
-            if first_param.kind in (
-                inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                inspect.Parameter.POSITIONAL_ONLY,
-            ):
-                return first_param.name
-        return None
+        return self._get_compile_plan(widget_class).first_param
 
     # -------------------------------------------------------------------------
     # Dedicated compile methods for widgets needing special handling
     # -------------------------------------------------------------------------
 
-    def _compile_static(self, node: BagNode, parent_widget: Widget) -> None:
+    def _compile_static(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
         """Static: semplice widget di testo."""
         from textual.widgets import Static
 
-        content = str(node.value) if node.value else ""
-        # Filtra attributi interni (iniziano con _)
-        attr = {k: v for k, v in node.attr.items() if not k.startswith("_")}
+        attr = dict(node.attr)
+        value = node.value
+        pending = None
+        if self.binder is not None:
+            attr, value, pending = self.binder.prepare(node, attr, value, "content")
 
-        if "id" not in attr:
-            attr["id"] = f"static_{self.widget_counter}"
+        content = str(value) if value else ""
+        # Filtra attributi interni (iniziano con _) e non accettati da Static
+        kwargs = self._build_widget_kwargs(attr, Static)
 
-        widget = Static(content, **attr)
-        node.compiled["widget"] = widget
-        parent_widget.mount(widget)
+        if "id" not in kwargs:
+            kwargs["id"] = self.widget_id(node)
+
+        widget = Static(content, **kwargs)
+        self._set_widget(node, widget)
+        if pending:
+            self.binder.bind(widget, pending)
+        self._mount(parent_widget, widget, **mount_kwargs)
+
+    def _compile_bagtree(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
+        """bagtree: the node value is the source Bag (usually ^path), not a label."""
+        from genro_pygui.bagtree import BagTree
+
+        attr = dict(node.attr)
+        value = node.value
+        pending = None
+        if self.binder is not None:
+            attr, value, pending = self.binder.prepare(node, attr, value, "source")
 
-    def _compile_tabbedcontent(self, node: BagNode, parent_widget: Widget) -> None:
-        """TabbedContent: usa add_pane() per aggiungere i TabPane."""
+        kwargs = self._build_widget_kwargs(attr, BagTree)
+        if "id" not in kwargs:
+            kwargs["id"] = self.widget_id(node)
+        if isinstance(value, Bag):
+            kwargs.setdefault("source", value)
+        if self.binder is not None and self.binder.resolvers is not None:
+            kwargs["resolvers"] = self.binder.resolvers
+
+        widget = BagTree(**kwargs)
+        self._set_widget(node, widget)
+        if pending:
+            self.binder.bind(widget, pending)
+        self._mount(parent_widget, widget, **mount_kwargs)
+
+    def _compile_dataformula(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
+        """dataformula: no widget, registers a formula writing into the data Bag."""
+        if self.binder is None or self.binder.formulas is None:
+            raise RuntimeError("dataformula requires a data binder with a formula engine")
+
+        from genro_pygui.binding import FORMULA, resolve_path
+
+        attr = dict(node.attr)
+        expr = attr.pop("formula", "")
+        if expr.startswith(FORMULA):
+            expr = expr[len(FORMULA) :]
+        datapath = self.binder.node_datapath(node)
+        formula = self.binder.make_formula(expr, attr, datapath)
+        formula.path = resolve_path(str(node.value), datapath)
+        self.binder.formulas.register(formula)
+        node.compiled["formula"] = formula
+        self.binder.formulas.dirty(formula)
+
+    def _compile_tabbedcontent(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
+        """TabbedContent: i TabPane vengono aggiunti prima del mount."""
         from textual.widgets import TabbedContent
 
         attr = dict(node.attr)
         kwargs = self._build_widget_kwargs(attr, TabbedContent)
 
         if "id" not in kwargs:
-            kwargs["id"] = f"tabbedcontent_{self.widget_counter}"
+            kwargs["id"] = self.widget_id(node)
 
         widget = TabbedContent(**kwargs)
-        node.compiled["widget"] = widget
-        parent_widget.mount(widget)
+        self._set_widget(node, widget)
 
-        # I TabPane vanno aggiunti con add_pane(), non mount()
+        # I pane vanno in compose: add_pane() richiede il widget già composto
         if isinstance(node.value, Bag):
             for child_node in node.value:
                 self._compile_tabpane_for_tabbedcontent(child_node, widget)
 
+        self._mount(parent_widget, widget, **mount_kwargs)
+
+    def _insert_into_tabbedcontent(self, node: BagNode, tabbed_content: Widget) -> None:
+        """TabPane inserted in a live TabbedContent."""
+        self._compile_tabpane_for_tabbedcontent(node, tabbed_content)
+
     def _compile_tabpane_for_tabbedcontent(self, node: BagNode, tabbed_content: Widget) -> None:
-        """TabPane: aggiunto a TabbedContent con add_pane()."""
+        """TabPane: aggiunto a TabbedContent (compose se non montato, altrimenti add_pane)."""
         from textual.widgets import TabPane
 
         attr = dict(node.attr)
@@ -683,20 +1404,24 @@ class TextualBuilder(BagBuilderBase):
         kwargs = self._build_widget_kwargs(attr, TabPane)
 
         if "id" not in kwargs:
-            kwargs["id"] = f"tabpane_{self.widget_counter}"
+            kwargs["id"] = self.widget_id(node)
 
         widget = TabPane(title, **kwargs)
-        node.compiled["widget"] = widget
-
-        # Usa add_pane() invece di mount()
-        tabbed_content.add_pane(widget)
+        self._set_widget(node, widget)
 
         # Compila ricorsivamente i figli dentro il TabPane
         if isinstance(node.value, Bag):
             for child_node in node.value:
                 self._compile_node(child_node, widget)
 
-    def _compile_datatable(self, node: BagNode, parent_widget: Widget) -> None:
+        if tabbed_content.is_attached:
+            tabbed_content.add_pane(widget)
+        else:
+            tabbed_content.compose_add_child(widget)
+
+    def _compile_datatable(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
         """DataTable: columns and rows via add_column/add_row."""
         from textual.widgets import DataTable
 
@@ -704,11 +1429,11 @@ class TextualBuilder(BagBuilderBase):
         kwargs = self._build_widget_kwargs(attr, DataTable)
 
         if "id" not in kwargs:
-            kwargs["id"] = f"datatable_{self.widget_counter}"
+            kwargs["id"] = self.widget_id(node)
 
         widget = DataTable(**kwargs)
-        node.compiled["widget"] = widget
-        parent_widget.mount(widget)
+        self._set_widget(node, widget)
+        self._mount(parent_widget, widget, **mount_kwargs)
 
         if isinstance(node.value, Bag):
             columns = []
@@ -719,21 +1444,134 @@ class TextualBuilder(BagBuilderBase):
                 elif child_node.tag == "row":
                     rows.append(child_node)
 
-            for col_node in columns:
-                col_attr = dict(col_node.attr)
-                label = col_attr.get("label", str(col_node.value) if col_node.value else "")
-                # Filter column kwargs based on add_column signature (version-safe)
-                col_kwargs = self._build_method_kwargs(col_attr, widget.add_column)
-                widget.add_column(label, **col_kwargs)
-
-            for row_node in rows:
-                row_attr = dict(row_node.attr)
-                if isinstance(row_node.value, (list, tuple)):
-                    cells = row_node.value
-                elif isinstance(row_node.value, Bag):
-                    cells = [str(c.value) for c in row_node.value]
-                else:
-                    cells = [str(row_node.value)] if row_node.value else []
-                # Filter row kwargs based on add_row signature
-                row_kwargs = self._build_method_kwargs(row_attr, widget.add_row)
-                widget.add_row(*cells, **row_kwargs)
+            for child_node in columns + rows:
+                self._insert_into_datatable(child_node, widget)
+
+    def _insert_into_datatable(self, node: BagNode, widget: Widget) -> None:
+        """Add a column or row node to a DataTable via add_column/add_row."""
+        attr = dict(node.attr)
+        if node.tag == "column":
+            label = attr.get("label", str(node.value) if node.value else "")
+            # Filter column kwargs based on add_column signature (version-safe)
+            col_kwargs = self._build_method_kwargs(attr, widget.add_column)
+            widget.add_column(label, **col_kwargs)
+        elif node.tag == "row":
+            if isinstance(node.value, (list, tuple)):
+                cells = node.value
+            elif isinstance(node.value, Bag):
+                cells = [str(c.value) for c in node.value]
+            else:
+                cells = [str(node.value)] if node.value else []
+            # Filter row kwargs based on add_row signature
+            row_kwargs = self._build_method_kwargs(attr, widget.add_row)
+            widget.add_row(*cells, **row_kwargs)
+
+    def _compile_optionlist(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
+        """OptionList: option children become Option items, not widgets."""
+        from textual.widgets import OptionList
+
+        self._compile_options(node, parent_widget, OptionList, mount_kwargs)
+
+    def _compile_selectionlist(
+        self, node: BagNode, parent_widget: Widget, **mount_kwargs: Any
+    ) -> None:
+        """SelectionList: selection children become Selection items."""
+        from textual.widgets import SelectionList
+
+        self._compile_options(node, parent_widget, SelectionList, mount_kwargs)
+
+    def _compile_options(
+        self,
+        node: BagNode,
+        parent_widget: Widget,
+        widget_class: type,
+        mount_kwargs: dict[str, Any],
+    ) -> None:
+        attr = dict(node.attr)
+        pending = None
+        if self.binder is not None:
+            attr, _, pending = self.binder.prepare(node, attr)
+        kwargs = self._build_widget_kwargs(attr, widget_class)
+        if "id" not in kwargs:
+            kwargs["id"] = self.widget_id(node)
+
+        widget = widget_class(*self._option_items(node), **kwargs)
+        self._set_widget(node, widget)
+        if pending:
+            self.binder.bind(widget, pending)
+        self._mount(parent_widget, widget, **mount_kwargs)
+
+    def _option_items(self, node: BagNode) -> list[Any]:
+        """Option/Selection items for the children of an option list node, keyed by id."""
+        from textual.widgets.option_list import Option
+        from textual.widgets.selection_list import Selection
+
+        items = []
+        value = node.get_value(static=True)
+        if not isinstance(value, Bag):
+            return items
+        for child_node in value:
+            attr = child_node.attr
+            key = self.node_key(child_node)
+            prompt = str(child_node.value) if child_node.value is not None else key
+            disabled = bool(attr.get("disabled", False))
+            if child_node.tag == "selection":
+                selection_value = attr.get("value")
+                items.append(
+                    Selection(
+                        prompt,
+                        key if selection_value is None else selection_value,
+                        bool(attr.get("initial_state", False)),
+                        id=key,
+                        disabled=disabled,
+                    )
+                )
+            else:
+                items.append(Option(prompt, id=key, disabled=disabled))
+        return items
+
+    def _reconcile_optionlist(self, node: BagNode, widget: Widget) -> None:
+        """Bring a live OptionList in line with node's children, by option id.
+
+        Same ids in the same order: only changed prompts/disabled flags are
+        updated. Otherwise the options are replaced, keeping the highlighted
+        option (and, for SelectionList, the selected values) when still present.
+        """
+        from textual.widgets.option_list import OptionDoesNotExist
+
+        items = self._option_items(node)
+        current = [widget.get_option_at_index(i) for i in range(widget.option_count)]
+        if [item.id for item in items] == [option.id for option in current]:
+            for item, option in zip(items, current):
+                if str(item.prompt) != str(option.prompt):
+                    widget.replace_option_prompt(option.id, item.prompt)
+                if item.disabled != option.disabled:
+                    if item.disabled:
+                        widget.disable_option(option.id)
+                    else:
+                        widget.enable_option(option.id)
+            return
+
+        highlighted = widget.highlighted_option
+        selected = set(getattr(widget, "selected", ()))
+        widget.clear_options()
+        widget.add_options(items)
+        if selected:
+            for item in items:
+                if item.value in selected:
+                    widget.select(item)
+        if highlighted is not None and highlighted.id is not None:
+            try:
+                widget.highlighted = widget.get_option_index(highlighted.id)
+            except OptionDoesNotExist:
+                pass
+
+    _reconcile_selectionlist = _reconcile_optionlist
+
+    def _insert_into_optionlist(self, node: BagNode, widget: Widget) -> None:
+        """Option added to a live OptionList."""
+        self._reconcile_optionlist(node.parent_node, widget)
+
+    _insert_into_selectionlist = _insert_into_optionlist
@@ -0,0 +1,238 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Opt-in end-to-end tracing of remote-driven updates, as Chrome trace events.
+
+Enable with the GENRO_PYGUI_TRACE=<file> environment variable (the trace is
+written there at exit), or programmatically:
+
+    from genro_pygui import tracing
+    tracer = tracing.enable()
+    ...
+    tracer.dump("trace.json")       # open in ui.perfetto.dev or chrome://tracing
+
+A remote call made while the client's tracer is enabled sends its request
+id as trace id; the app records its spans when its own tracer is enabled
+(GENRO_PYGUI_TRACE, or app.start_trace() from a client). Spans:
+
+    client   remote <cmd>    RemoteProxy._send: connection to response
+    server   lane wait       request queued in its lane
+             serve <cmd>     the request on its lane worker
+             ui queue        waiting in call_from_thread for the UI thread
+    ui       ui <cmd>        the command on the UI thread
+             frame           the next scheduler frame (compile, bindings)
+             compile <tag>   compile of an inserted node and its subtree
+             mount           the frame's batched mount() calls
+             refresh         from the end of the frame to the screen refresh
+
+Spans carry their trace ids in args.trace, and flow arrows link each client
+span to its server span. With both sides traced, one file shows where the
+time went (network = client span minus server span):
+
+    app = connect("myapp")
+    app.start_trace()
+    ...
+    tracer.dump("trace.json", app.stop_trace())
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any
+
+TRACE_ENV = "GENRO_PYGUI_TRACE"
+DEFAULT_MAX_EVENTS = 200_000
+
+# Tracer in use, None when tracing is disabled (checked on every request)
+active: Tracer | None = None
+
+Trace = str | tuple[str, ...]
+
+
+def now() -> float:
+    """Wall clock in microseconds: comparable between client and app processes."""
+    return time.time_ns() / 1000
+
+
+def command_name(cmd: tuple) -> str:
+    """Short span name of a remote command ("call static", "setitem"...)."""
+    if cmd[0] == "__call__":
+        return f"call {cmd[2]}"
+    return cmd[0].strip("_")
+
+
+class Tracer:
+    """Collects trace events of this process (at most maxlen, oldest dropped)."""
+
+    def __init__(self, maxlen: int = DEFAULT_MAX_EVENTS) -> None:
+        self._events: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self._threads: set[int] = set()
+        self._local = threading.local()
+        self.pid = os.getpid()
+        # Trace id dei comandi eseguiti sul thread UI, in attesa del prossimo frame
+        self.pending: set[str] = set()
+
+    # -------------------------------------------------------------------------
+    # Context
+    # -------------------------------------------------------------------------
+
+    @property
+    def current(self) -> Trace | None:
+        """Trace id(s) of the work running on this thread."""
+        return getattr(self._local, "trace", None)
+
+    @contextmanager
+    def context(self, trace: Trace | None) -> Iterator[None]:
+        """Attribute the spans recorded on this thread in the block to trace."""
+        previous = self.current
+        self._local.trace = trace
+        try:
+            yield
+        finally:
+            self._local.trace = previous
+
+    def take_pending(self) -> tuple[str, ...]:
+        """Trace ids waiting for a frame, emptying the set (UI thread)."""
+        pending = tuple(sorted(self.pending))
+        self.pending.clear()
+        return pending
+
+    # -------------------------------------------------------------------------
+    # Events
+    # -------------------------------------------------------------------------
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads.add(tid)
+            self._events.append(
+                {
+                    "ph": "M",
+                    "name": "thread_name",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                }
+            )
+        return tid
+
+    def complete(
+        self,
+        name: str,
+        cat: str,
+        start: float,
+        end: float,
+        trace: Trace | None = None,
+        **args: Any,
+    ) -> None:
+        """Record a span from start to end (microseconds, see now())."""
+        if trace is None:
+            trace = self.current
+        if trace is not None:
+            args["trace"] = trace if isinstance(trace, str) else list(trace)
+        self._events.append(
+            {
+                "ph": "X",
+                "name": name,
+                "cat": cat,
+                "ts": start,
+                "dur": max(0.0, end - start),
+                "pid": self.pid,
+                "tid": self._tid(),
+                "args": args,
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args: Any) -> Iterator[None]:
+        """Record the block as a span of the current trace."""
+        start = now()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, start, now(), **args)
+
+    def flow(self, trace_id: str, ts: float, start: bool) -> None:
+        """Flow arrow between the spans of trace_id enclosing ts in two processes."""
+        event = {
+            "ph": "s" if start else "f",
+            "name": "request",
+            "cat": "remote",
+            "id": trace_id,
+            "ts": ts,
+            "pid": self.pid,
+            "tid": self._tid(),
+        }
+        if not start:
+            event["bp"] = "e"
+        self._events.append(event)
+
+    def events(self, reset: bool = False) -> list[dict[str, Any]]:
+        """Recorded events (JSON-serializable)."""
+        events = list(self._events)
+        if reset:
+            self.reset()
+        return events
+
+    def reset(self) -> None:
+        """Discard the recorded events."""
+        self._events.clear()
+        # I metadati dei thread vanno riemessi nel prossimo trace
+        self._threads.clear()
+
+    def as_dict(self, *more: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        """Chrome trace-event document with these events and those in more."""
+        events = list(self._events)
+        for extra in more:
+            events.extend(extra)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str | os.PathLike[str], *more: Iterable[dict[str, Any]]) -> None:
+        """Write the Chrome trace-event JSON (more: events of other processes)."""
+        with open(path, "w") as f:
+            json.dump(self.as_dict(*more), f)
+
+
+def span(name: str, cat: str, **args: Any) -> Any:
+    """Span of the active tracer, or a no-op context when tracing is disabled."""
+    tracer = active
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, cat, **args)
+
+
+def enable(maxlen: int = DEFAULT_MAX_EVENTS) -> Tracer:
+    """Enable tracing and return the active tracer."""
+    global active
+    if active is None:
+        active = Tracer(maxlen)
+    return active
+
+
+def disable() -> None:
+    """Disable tracing."""
+    global active
+    active = None
+
+
+def enable_from_env() -> Tracer | None:
+    """Apply GENRO_PYGUI_TRACE: a fresh tracer if set, else tracing disabled.
+
+    Run at import, and again in the children of the warm server, which
+    imported this module before their environment was known. The caller
+    writes the trace to the file named by the variable.
+    """
+    disable()
+    if os.environ.get(TRACE_ENV):
+        return enable()
+    return None
+
+
+_tracer = enable_from_env()
+if _tracer is not None:
+    atexit.register(_tracer.dump, os.environ[TRACE_ENV])
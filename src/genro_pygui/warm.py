@@ -0,0 +1,212 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Warm app server: pre-forked launcher for fast app startup.
+
+The server (zygote) imports Textual, genro_bag and TextualBuilder once and
+preloads every compile plan. Each run request forks a child that inherits the
+warm interpreter and runs the app on the caller's terminal.
+
+Usage:
+    pygui serve                                 # start the warm server
+    pygui run examples/basic/hello_world.py -w  # run through the warm server
+
+Protocol (Unix socket in the registry directory):
+    - Client sends one byte carrying its stdin/stdout/stderr (SCM_RIGHTS)
+    - Client sends a framed JSON request: {file, cwd, env, argv, options}
+      options are the run_app() flags (connect, hot, profile, trace)
+    - Child replies {"pid": ...} when started and {"exit": code} when done
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from typing import Any
+
+from genro_pygui.registry import REGISTRY_DIR, _ensure_registry_dir
+from genro_pygui.remote import _recv_framed, _send_framed
+
+WARM_SOCKET = REGISTRY_DIR / "warm.sock"
+
+# Signals forwarded from the client to the forked child
+FORWARDED_SIGNALS = (signal.SIGWINCH, signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def preload() -> int:
+    """Import the UI stack and build all compile plans. Returns preloaded elements."""
+    import textual.app  # noqa: F401
+    import textual.containers  # noqa: F401
+    import textual.widgets  # noqa: F401
+    from genro_bag import Bag
+
+    import genro_pygui.textual_app  # noqa: F401
+    from genro_pygui.textual_builder import TextualBuilder
+
+    return Bag(builder=TextualBuilder).builder.preload()
+
+
+def serve(socket_path: str | os.PathLike[str] = WARM_SOCKET) -> None:
+    """Run the warm server until interrupted."""
+    count = preload()
+
+    _ensure_registry_dir()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(os.fspath(socket_path))
+    os.chmod(socket_path, 0o600)
+    server.listen(16)
+    server.settimeout(1.0)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Warm server ready ({count} elements preloaded) on {socket_path}")
+
+    try:
+        while True:
+            _reap_children()
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            _fork_child(server, conn)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _reap_children() -> None:
+    """Collect exited children without blocking."""
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _fork_child(server: socket.socket, conn: socket.socket) -> None:
+    """Receive a run request and fork a child to serve it."""
+    try:
+        conn.settimeout(5.0)
+        _, fds, _, _ = socket.recv_fds(conn, 1, 3)
+        data = _recv_framed(conn)
+        conn.settimeout(None)
+    except (OSError, ValueError):
+        conn.close()
+        return
+    if data is None or len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+        return
+
+    pid = os.fork()
+    if pid != 0:
+        # Server: the child owns the terminal fds and the connection now
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+        return
+
+    server.close()
+    code = 1
+    try:
+        code = _run_child(conn, fds, json.loads(data))
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            _send_framed(conn, json.dumps({"exit": code}).encode())
+        except Exception:
+            pass
+        os._exit(code)
+
+
+def _run_child(conn: socket.socket, fds: list[int], request: dict[str, Any]) -> int:
+    """Child side: adopt the caller's terminal and environment, then run the app."""
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    for signum in FORWARDED_SIGNALS:
+        signal.signal(signum, signal.SIG_DFL)
+
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+    sys.argv = request["argv"]
+
+    _send_framed(conn, json.dumps({"pid": os.getpid()}).encode())
+
+    from genro_pygui import profiling, tracing
+    from genro_pygui.cli import run_app
+
+    # Decisi all'import nel server: valgono l'ambiente del client
+    profiling.enable_from_env()
+    tracer = tracing.enable_from_env()
+    try:
+        run_app(request["file"], **request.get("options", {}))
+    finally:
+        # Il figlio esce con os._exit: l'atexit del tracing non viene eseguito
+        if tracer is not None:
+            tracer.dump(os.environ[tracing.TRACE_ENV])
+    return 0
+
+
+def run_warm(
+    file_path: str,
+    options: dict[str, Any] | None = None,
+    socket_path: str | os.PathLike[str] = WARM_SOCKET,
+) -> int | None:
+    """Run an app through the warm server.
+
+    options are passed to run_app() in the child (connect, hot, profile, trace).
+    Returns the child's exit code, or None if no warm server is listening.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(os.fspath(socket_path))
+    except OSError:
+        sock.close()
+        return None
+
+    request = {
+        "file": os.path.abspath(file_path),
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "argv": sys.argv,
+        "options": options or {},
+    }
+    child_pid: int | None = None
+
+    def forward(signum: int, frame: Any) -> None:
+        if child_pid is not None:
+            os.kill(child_pid, signum)
+
+    previous = {signum: signal.signal(signum, forward) for signum in FORWARDED_SIGNALS}
+    try:
+        socket.send_fds(sock, [b"\0"], [0, 1, 2])
+        _send_framed(sock, json.dumps(request).encode())
+        while True:
+            data = _recv_framed(sock)
+            if data is None:
+                return 1
+            message = json.loads(data)
+            if "pid" in message:
+                child_pid = message["pid"]
+            elif "exit" in message:
+                return int(message["exit"])
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        sock.close()
@@ -0,0 +1,98 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for bagtree.py: paged branches, release on collapse and live updates."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from genro_bag import Bag
+from textual.app import App, ComposeResult
+from textual.pilot import Pilot
+
+from genro_pygui.bagtree import BagTree
+
+
+class TreeApp(App):
+    def __init__(self, tree: BagTree) -> None:
+        super().__init__()
+        self.bag_tree = tree
+
+    def compose(self) -> ComposeResult:
+        yield self.bag_tree
+
+
+def run_tree(tree: BagTree, scenario: Callable[[Pilot], Awaitable[Any]]) -> None:
+    async def main() -> None:
+        async with TreeApp(tree).run_test() as pilot:
+            await pilot.pause()
+            await scenario(pilot)
+
+    asyncio.run(main())
+
+
+def catalog(count: int) -> Bag:
+    bag = Bag()
+    for n in range(count):
+        bag[f"item{n}"] = n
+    return bag
+
+
+def labels(tree_node) -> list[str]:
+    return [str(child.label) for child in tree_node.children]
+
+
+def test_page_size_must_be_positive():
+    with pytest.raises(ValueError):
+        BagTree(Bag(), page_size=0)
+
+
+def test_branches_are_loaded_one_page_at_a_time():
+    tree = BagTree(catalog(450), page_size=200)
+    shown = labels(tree.root)
+    assert len(shown) == 201
+    assert shown[0] == "item0 = 0"
+    assert shown[-1] == "… 250 more"
+    tree._load_more(tree.root.children[-1])
+    assert len(tree.root.children) == 401
+    tree._load_more(tree.root.children[-1])
+    assert len(tree.root.children) == 450
+
+
+def test_collapsed_branch_releases_its_children():
+    source = Bag()
+    source["clienti"] = catalog(3)
+    tree = BagTree(source)
+
+    async def scenario(pilot: Pilot) -> None:
+        branch = tree.root.children[0]
+        assert not branch.children
+        branch.expand()
+        await pilot.pause()
+        assert labels(branch) == ["item0 = 0", "item1 = 1", "item2 = 2"]
+        assert id(source["clienti"]) in tree._branches
+        branch.collapse()
+        await pilot.pause()
+        assert not branch.children
+        assert id(source["clienti"]) not in tree._branches
+
+    run_tree(tree, scenario)
+
+
+def test_source_changes_refresh_the_loaded_branch():
+    source = catalog(3)
+    tree = BagTree(source)
+
+    async def scenario(pilot: Pilot) -> None:
+        source["item1"] = 10
+        source["nuovo"] = "x"
+        await pilot.pause()
+        assert labels(tree.root) == ["item0 = 0", "item1 = 10", "item2 = 2", "nuovo = 'x'"]
+        # clear() manda un solo evento con la lista dei nodi rimossi
+        source.clear()
+        await pilot.pause()
+        assert not tree.root.children
+
+    run_tree(tree, scenario)
@@ -0,0 +1,113 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for binding.py: path resolution and the ^path binding index."""
+
+from __future__ import annotations
+
+from genro_bag import Bag
+
+from genro_pygui.binding import DataBinder, parse_binding, resolve_path
+
+
+class FakeWidget:
+    """Stands in for a Textual widget: bound properties are plain attributes."""
+
+    value = "initial"
+
+
+def make_binder(values: dict[str, object] | None = None) -> tuple[Bag, DataBinder]:
+    data = Bag()
+    for path, value in (values or {}).items():
+        data[path] = value
+    return data, DataBinder(data)
+
+
+def test_resolve_path():
+    assert resolve_path(".nome", "cliente") == "cliente.nome"
+    assert resolve_path(".", "cliente") == "cliente"
+    assert resolve_path(".nome") == "nome"
+    assert resolve_path("#DATA.totale", "cliente") == "totale"
+    assert resolve_path("#DATA", "cliente") == ""
+    assert resolve_path("ordine.totale", "cliente") == "ordine.totale"
+
+
+def test_parse_binding():
+    assert parse_binding("^cliente.nome") == ("^", "cliente.nome")
+    assert parse_binding("=.titolo") == ("=", ".titolo")
+    assert parse_binding("==a + b") is None
+    assert parse_binding("plain") is None
+    assert parse_binding(3) is None
+
+
+def test_change_updates_bound_widget():
+    data, binder = make_binder({"cliente.nome": "Mario"})
+    widget = FakeWidget()
+    binder.bind(widget, [("value", "cliente.nome")])
+    data["cliente.nome"] = "Luigi"
+    assert widget.value == "Luigi"
+    assert len(binder) == 1
+
+
+def test_replacing_an_ancestor_updates_descendant_bindings():
+    data, binder = make_binder({"cliente.nome": "Mario"})
+    widget = FakeWidget()
+    binder.bind(widget, [("value", "cliente.nome")])
+    replacement = Bag()
+    replacement["nome"] = "Anna"
+    data["cliente"] = replacement
+    assert widget.value == "Anna"
+
+
+def test_unbind_stops_updates():
+    data, binder = make_binder({"x": 1})
+    widget = FakeWidget()
+    binder.bind(widget, [("value", "x")])
+    binder.unbind(widget)
+    data["x"] = 2
+    assert widget.value == "initial"
+    assert len(binder) == 0
+
+
+def test_change_made_by_the_widget_is_not_echoed():
+    data, binder = make_binder({"x": 1})
+    widget = FakeWidget()
+    binder.bind(widget, [("value", "x")])
+    data.set_item("x", 2, _reason=widget)
+    assert widget.value == "initial"
+
+
+def test_delete_clears_bound_widget():
+    data, binder = make_binder({"x": 1})
+    widget = FakeWidget()
+    binder.bind(widget, [("value", "x")])
+    data.pop("x")
+    assert widget.value == ""
+
+
+def test_clear_of_a_sub_bag_refreshes_each_removed_path():
+    data, binder = make_binder({"a.x": 1, "a.y": 2, "b": 3})
+    first, second, other = FakeWidget(), FakeWidget(), FakeWidget()
+    binder.bind(first, [("value", "a.x")])
+    binder.bind(second, [("value", "a.y")])
+    binder.bind(other, [("value", "b")])
+    data["a"].clear()
+    assert first.value == ""
+    assert second.value == ""
+    assert other.value == "initial"
+
+
+def test_clear_of_the_root_refreshes_nested_bindings():
+    data, binder = make_binder({"a.x": 1, "b": 3})
+    nested, top = FakeWidget(), FakeWidget()
+    binder.bind(nested, [("value", "a.x")])
+    binder.bind(top, [("value", "b")])
+    data.clear()
+    assert nested.value == ""
+    assert top.value == ""
+
+
+def test_clear_of_an_empty_bag_is_harmless():
+    data, binder = make_binder()
+    widget = FakeWidget()
+    binder.bind(widget, [("value", "x")])
+    data.clear()
+    assert widget.value == "initial"
@@ -0,0 +1,141 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for connection_pool.py: registry cache and idle connection reuse."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from genro_pygui import registry
+from genro_pygui.connection_pool import ConnectionPool, shared_pool
+
+
+@pytest.fixture
+def tmp_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "REGISTRY_DIR", tmp_path)
+    monkeypatch.setattr(registry, "REGISTRY_FILE", tmp_path / "registry.json")
+    return registry
+
+
+class Server:
+    """Local listener keeping the accepted connections (close_all() drops them)."""
+
+    def __init__(self) -> None:
+        self.sock = socket.create_server(("localhost", 0))
+        self.port = self.sock.getsockname()[1]
+        self.accepted: list[socket.socket] = []
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.accepted.append(conn)
+
+    def close_all(self) -> None:
+        for conn in self.accepted:
+            conn.close()
+        self.accepted.clear()
+
+    def close(self) -> None:
+        self.close_all()
+        self.sock.close()
+
+
+@pytest.fixture
+def server() -> Iterator[Server]:
+    listener = Server()
+    yield listener
+    listener.close()
+
+
+def test_negative_max_idle_is_rejected():
+    with pytest.raises(ValueError):
+        ConnectionPool(max_idle=-1)
+
+
+def test_resolve_caches_until_the_registry_changes(tmp_registry):
+    tmp_registry.register_app("myapp", 5000, "secret")
+    pool = ConnectionPool()
+    assert pool.resolve("myapp") == (5000, "secret")
+    assert pool.resolve("myapp") == (5000, "secret")
+    assert pool.stats()["lookup_hits"] == 1
+    time.sleep(0.01)
+    tmp_registry.register_app("myapp", 5001, "other")
+    assert pool.resolve("myapp") == (5001, "other")
+    assert pool.stats()["lookups"] == 3
+    assert pool.stats()["lookup_hits"] == 1
+
+
+def test_resolve_unknown_app(tmp_registry):
+    with pytest.raises(ValueError, match="not found"):
+        ConnectionPool().resolve("missing")
+
+
+def test_released_connection_is_reused(server):
+    pool = ConnectionPool()
+    sock, reused = pool.acquire("localhost", server.port, timeout=1.0)
+    assert not reused
+    pool.release("localhost", server.port, sock)
+    again, reused = pool.acquire("localhost", server.port, timeout=1.0)
+    assert reused
+    assert again is sock
+    again.close()
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["reused"] == 1
+
+
+def test_connection_closed_by_the_server_is_discarded(server):
+    pool = ConnectionPool()
+    sock, _ = pool.acquire("localhost", server.port, timeout=1.0)
+    pool.release("localhost", server.port, sock)
+    time.sleep(0.05)
+    server.close_all()
+    time.sleep(0.05)
+    fresh, reused = pool.acquire("localhost", server.port, timeout=1.0)
+    assert not reused
+    assert fresh is not sock
+    fresh.close()
+    assert pool.stats()["discarded"] == 1
+
+
+def test_expired_connection_is_evicted(server):
+    pool = ConnectionPool(idle_timeout=0.0)
+    sock, _ = pool.acquire("localhost", server.port, timeout=1.0)
+    pool.release("localhost", server.port, sock)
+    time.sleep(0.01)
+    fresh, reused = pool.acquire("localhost", server.port, timeout=1.0)
+    assert not reused
+    fresh.close()
+    assert pool.stats()["evicted"] == 1
+
+
+def test_idle_connections_are_bounded(server):
+    pool = ConnectionPool(max_idle=2)
+    socks = [pool.acquire("localhost", server.port, timeout=1.0)[0] for _ in range(3)]
+    for sock in socks:
+        pool.release("localhost", server.port, sock)
+    stats = pool.stats()
+    assert stats["idle"] == 2
+    assert stats["evicted"] == 1
+    pool.clear()
+    assert pool.stats()["idle"] == 0
+
+
+def test_no_idle_connections_kept_with_max_idle_zero(server):
+    pool = ConnectionPool(max_idle=0)
+    sock, _ = pool.acquire("localhost", server.port, timeout=1.0)
+    pool.release("localhost", server.port, sock)
+    assert pool.stats()["idle"] == 0
+    assert sock.fileno() == -1
+
+
+def test_shared_pool_is_a_singleton():
+    assert shared_pool() is shared_pool()
@@ -0,0 +1,82 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for events.py: EventHub fan-out and Subscription queues."""
+
+from __future__ import annotations
+
+import threading
+
+from genro_pygui.events import EventHub, Subscription, UIEvent
+
+
+def make_event(seq: int = 1, event: str = "button_pressed", **fields: object) -> UIEvent:
+    values = {"node_id": None, "tag": None, "label": None, "widget_id": None, "value": None}
+    values.update(fields)
+    return UIEvent(seq, 0.0, event, **values)
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    hub = EventHub()
+    assert not hub
+    assert hub.publish("button_pressed", node_id="save") is None
+    assert hub.stats()["published"] == 0
+
+
+def test_filters():
+    hub = EventHub()
+    by_event = hub.subscribe(events={"input_changed"})
+    by_id = hub.subscribe(ids={"save"})
+    by_tag = hub.subscribe(tags={"button"})
+    everything = hub.subscribe()
+    hub.publish("button_pressed", node_id="save", tag="button")
+    hub.publish("input_changed", node_id="name", tag="input", value="Mario")
+    assert [e.event for e in by_event.get_batch(0)] == ["input_changed"]
+    assert [e.node_id for e in by_id.get_batch(0)] == ["save"]
+    assert [e.tag for e in by_tag.get_batch(0)] == ["button"]
+    assert [e.seq for e in everything.get_batch(0)] == [1, 2]
+
+
+def test_get_batch_respects_max_size():
+    hub = EventHub()
+    subscription = hub.subscribe()
+    for n in range(5):
+        hub.publish("key", value=n)
+    assert [e.value for e in subscription.get_batch(0, max_size=3)] == [0, 1, 2]
+    assert [e.value for e in subscription.get_batch(0)] == [3, 4]
+    assert subscription.get_batch(0) == []
+
+
+def test_full_queue_drops_the_oldest():
+    subscription = Subscription(maxlen=2)
+    for seq in range(1, 5):
+        subscription.push(make_event(seq))
+    assert [e.seq for e in subscription.get_batch(0)] == [3, 4]
+    assert subscription.dropped == 2
+
+
+def test_get_batch_waits_for_an_event():
+    hub = EventHub()
+    subscription = hub.subscribe()
+    timer = threading.Timer(0.05, hub.publish, args=("key",), kwargs={"value": "x"})
+    timer.start()
+    batch = subscription.get_batch(timeout=2.0)
+    timer.join()
+    assert [e.value for e in batch] == ["x"]
+
+
+def test_unsubscribe_wakes_the_reader():
+    hub = EventHub()
+    subscription = hub.subscribe()
+    timer = threading.Timer(0.05, hub.unsubscribe, args=(subscription,))
+    timer.start()
+    assert subscription.get_batch(timeout=2.0) == []
+    timer.join()
+    assert subscription.closed
+    assert not hub
+
+
+def test_stats():
+    hub = EventHub()
+    hub.subscribe(maxlen=1)
+    hub.publish("key")
+    hub.publish("key")
+    assert hub.stats() == {"published": 2, "subscriptions": 1, "dropped": 1}
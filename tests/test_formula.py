@@ -0,0 +1,187 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for formula.py: compile cache, levels, recompute and errors."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+from genro_bag import Bag
+
+from genro_pygui import TextualApp
+from genro_pygui.formula import Formula, FormulaEngine
+from genro_pygui.textual_app import TextualWrapperApp
+
+
+def dataformula(engine: FormulaEngine, path: str, expr: str, **deps: str) -> Formula:
+    """Register a formula writing path, with ^dependencies name=path."""
+    formula = engine.create(expr, {name: ("^", dep) for name, dep in deps.items()})
+    formula.path = path
+    engine.register(formula)
+    return formula
+
+
+def test_compile_is_shared_by_text():
+    engine = FormulaEngine(Bag())
+    assert engine.compile("a + b") is engine.compile("a + b")
+
+
+def test_invalid_expression_raises_value_error():
+    engine = FormulaEngine(Bag())
+    with pytest.raises(ValueError, match="Invalid formula"):
+        engine.compile("a +")
+
+
+def test_dataformula_follows_its_inputs():
+    data = Bag()
+    data["ordine.prezzo"] = 10
+    data["ordine.quantita"] = 3
+    engine = FormulaEngine(data)
+    formula = dataformula(
+        engine,
+        "ordine.totale",
+        "prezzo * quantita",
+        prezzo="ordine.prezzo",
+        quantita="ordine.quantita",
+    )
+    engine.dirty(formula)
+    assert data["ordine.totale"] == 30
+    data["ordine.quantita"] = 4
+    assert data["ordine.totale"] == 40
+
+
+def test_levels_follow_producers_above_and_below_a_dependency():
+    data = Bag()
+    engine = FormulaEngine(data)
+    base = dataformula(engine, "a.x", "1")
+    exact = dataformula(engine, "b", "x + 1", x="a.x")
+    below = dataformula(engine, "c", "len(a)", a="a")
+    above = dataformula(engine, "d", "y", y="a.x.deep")
+    engine._compute_levels()
+    assert base.level == 0
+    assert exact.level == below.level == above.level == 1
+
+
+def test_downstream_formulas_run_once_in_level_order():
+    data = Bag()
+    data["x"] = 1
+    engine = FormulaEngine(data)
+    double = dataformula(engine, "y", "x * 2", x="x")
+    dataformula(engine, "z", "x + y", x="x", y="y")
+    engine.dirty(double)
+    assert data["z"] == 3
+    engine.evaluations = 0
+    data["x"] = 5
+    assert data["y"] == 10
+    assert data["z"] == 15
+    assert engine.evaluations == 2
+
+
+def test_cycle_is_rejected_by_register():
+    data = Bag()
+    engine = FormulaEngine(data)
+    first = dataformula(engine, "a", "b", b="b")
+    dataformula(engine, "b", "c + 1", c="c")
+    with pytest.raises(ValueError, match="cycle"):
+        dataformula(engine, "c.x", "a", a="a")
+    assert len(engine) == 2
+    assert set(engine._producers) == {"a", "b"}
+    engine.dirty(first)
+    assert data["a"] is None
+
+
+class RunningScheduler:
+    """A scheduler whose frames are running: dirty() waits for recompute()."""
+
+    running = True
+
+
+def test_cycle_created_while_the_scheduler_runs():
+    data = Bag()
+    data["x"] = 1
+    engine = FormulaEngine(data)
+    engine.scheduler = RunningScheduler()
+    double = dataformula(engine, "y", "x * 2", x="x")
+    engine.dirty(double)
+    with pytest.raises(ValueError, match="cycle"):
+        dataformula(engine, "x", "y + 1", y="y")
+    # Il grafo resta valido: il frame successivo ricalcola senza errori
+    assert engine.recompute() == 1
+    assert data["y"] == 2
+    data["x"] = 3
+    assert engine.recompute() == 1
+    assert data["y"] == 6
+
+
+class DoubleApp(TextualApp):
+    def recipe(self, root):
+        root.dataformula("y", formula="x * 2", x="^x")
+
+
+def test_cycle_inserted_in_a_running_app_is_logged(caplog):
+    app = DoubleApp()
+    app.data["x"] = 1
+
+    async def run() -> list:
+        textual_app = TextualWrapperApp(app)
+        app._textual_app = textual_app
+        async with textual_app.run_test() as pilot:
+            await pilot.pause()
+            with caplog.at_level(logging.WARNING, logger="genro_pygui.textual_app"):
+                app.page.dataformula("x", formula="y + 1", y="^y")
+                await pilot.pause(0.1)
+            app.data["x"] = 5
+            await pilot.pause(0.1)
+            return [app.data["y"], textual_app.is_running]
+
+    assert asyncio.run(run()) == [10, True]
+    assert "cycle" in caplog.text
+
+
+def test_second_producer_of_a_path_is_rejected():
+    engine = FormulaEngine(Bag())
+    dataformula(engine, "a", "1")
+    with pytest.raises(ValueError, match="already computed"):
+        dataformula(engine, "a", "2")
+
+
+def test_unregister_removes_the_producer():
+    engine = FormulaEngine(Bag())
+    first = dataformula(engine, "a.b", "1")
+    engine.unregister(first)
+    assert len(engine) == 0
+    assert engine._producers == {}
+    assert engine._producer_prefix == {}
+
+
+def test_error_is_stored_and_logged(caplog):
+    data = Bag()
+    data["x"] = 0
+    engine = FormulaEngine(data)
+    formula = dataformula(engine, "inverse", "1 / x", x="x")
+    with caplog.at_level(logging.WARNING, logger="genro_pygui.formula"):
+        engine.dirty(formula)
+    assert isinstance(formula.error, ZeroDivisionError)
+    assert data["inverse"] is None
+    assert "ZeroDivisionError" in caplog.text
+    data["x"] = 2
+    assert formula.error is None
+    assert data["inverse"] == 0.5
+
+
+def test_clear_marks_dependents_dirty():
+    data = Bag()
+    data["a.x"] = 1
+    data["a.y"] = 2
+    engine = FormulaEngine(data)
+    formula = dataformula(engine, "total", "(x or 0) + (y or 0)", x="a.x", y="a.y")
+    engine.dirty(formula)
+    assert data["total"] == 3
+    data["a"].clear()
+    assert data["total"] == 0
+    data["a.x"] = 5
+    assert data["total"] == 5
+    data.clear()
+    # Gli input sono spariti: il risultato viene riscritto
+    assert data["total"] == 0
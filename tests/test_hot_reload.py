@@ -0,0 +1,88 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for hot_reload.py: reloading an app module onto the running app's class."""
+
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from genro_pygui.hot_reload import load_application, update_class
+
+VERSION_1 = """
+from genro_pygui import TextualApp
+
+
+class Application(TextualApp):
+    title = "v1"
+
+    def recipe(self, root):
+        root.static(self.text())
+
+    def text(self):
+        return "version 1"
+
+    def helper(self):
+        return "only in v1"
+"""
+
+VERSION_2 = """
+from genro_pygui import TextualApp
+
+SUFFIX = "!"
+
+
+class Application(TextualApp):
+    def recipe(self, root):
+        super().recipe(root)
+        root.static(self.text())
+
+    def text(self):
+        return "version 2" + SUFFIX
+
+    @classmethod
+    def kind(cls):
+        return cls.__name__
+"""
+
+
+def write_app(path: Path, source: str) -> str:
+    path.write_text(textwrap.dedent(source))
+    return str(path)
+
+
+def test_running_app_picks_up_the_new_recipe(tmp_path):
+    file_path = write_app(tmp_path / "demo.py", VERSION_1)
+    app = load_application(file_path)()
+    app_class = type(app)
+    app.data["kept"] = 1
+    assert app.page.nodes[0].value == "version 1"
+
+    write_app(tmp_path / "demo.py", VERSION_2)
+    assert app.reload_recipe(load_application(file_path)) == 1
+    assert type(app) is app_class
+    assert [node.value for node in app.page.nodes] == ["version 2!"]
+    assert app.data["kept"] == 1
+    assert app.kind() == "Application"
+
+
+def test_removed_methods_are_dropped(tmp_path):
+    file_path = write_app(tmp_path / "demo.py", VERSION_1)
+    app = load_application(file_path)()
+    write_app(tmp_path / "demo.py", VERSION_2)
+    update_class(type(app), load_application(file_path))
+    assert not hasattr(app, "helper")
+    # Gli attributi non di codice restano: possono contenere stato
+    assert app.title == "v1"
+
+
+def test_class_name_must_match():
+    class Application:
+        pass
+
+    class Other:
+        pass
+
+    with pytest.raises(ValueError, match="Cannot reload"):
+        update_class(Application, Other)
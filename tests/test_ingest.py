@@ -0,0 +1,112 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for ingest.py: DataWriter queueing, draining and counters."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from genro_bag import Bag
+
+from genro_pygui.binding import DataBinder
+from genro_pygui.ingest import DataWriter
+from genro_pygui.scheduler import UpdateScheduler
+
+
+def make_writer(**kwargs: int) -> tuple[Bag, UpdateScheduler, DataWriter]:
+    data = Bag()
+    scheduler = UpdateScheduler(DataBinder(data))
+    return data, scheduler, DataWriter(data, scheduler, **kwargs)
+
+
+def test_batch_size_must_be_positive():
+    data = Bag()
+    with pytest.raises(ValueError):
+        DataWriter(data, UpdateScheduler(DataBinder(data)), batch_size=0)
+
+
+def test_frame_applies_the_last_value_of_each_path():
+    data, scheduler, writer = make_writer()
+    writer.write("a", 1)
+    writer.write_many([("a", 2), ("b", 3)])
+    assert writer.pending == 3
+    scheduler.tick()
+    assert data["a"] == 2
+    assert data["b"] == 3
+    assert writer.stats() == {
+        "written": 3,
+        "drained": 3,
+        "applied": 2,
+        "pending": 0,
+        "dropped": 0,
+    }
+
+
+def test_paths_are_written_in_last_write_order():
+    data, scheduler, writer = make_writer()
+    writer.write("a.b", 1)
+    writer.write("a", Bag())
+    writer.write("a.b", 2)
+    scheduler.tick()
+    assert data["a.b"] == 2
+    writer.write("a.b", 3)
+    writer.write("a", Bag())
+    scheduler.tick()
+    assert data["a.b"] is None
+
+
+def test_drain_is_bounded_by_batch_size():
+    data, _, writer = make_writer(batch_size=2)
+    writer.write_many((f"k{i}", i) for i in range(5))
+    assert writer.drain() == 2
+    assert writer.pending == 3
+    assert data["k1"] == 1
+    assert data["k2"] is None
+
+
+def test_bounded_queue_counts_evicted_updates():
+    _, _, writer = make_writer(maxlen=4)
+    writer.write_many([(f"a{i}", i) for i in range(3)])
+    writer.write_many([(f"b{i}", i) for i in range(3)])
+    writer.write("c", 0)
+    stats = writer.stats()
+    assert stats["written"] == 7
+    assert stats["pending"] == 4
+    assert stats["dropped"] == 3
+
+
+def test_write_many_larger_than_the_queue():
+    _, _, writer = make_writer(maxlen=2)
+    writer.write_many([(f"k{i}", i) for i in range(5)])
+    assert writer.stats()["written"] == 5
+    assert writer.stats()["dropped"] == 3
+    assert writer.pending == 2
+
+
+def test_close_stops_draining_once_empty():
+    data, scheduler, writer = make_writer()
+    with writer:
+        writer.write("a", 1)
+    assert writer.closed
+    scheduler.tick()
+    assert data["a"] == 1
+    writer.write("a", 2)
+    scheduler.tick()
+    assert data["a"] == 1
+
+
+def test_concurrent_producers():
+    data, scheduler, writer = make_writer()
+
+    def produce(name: str) -> None:
+        for i in range(1000):
+            writer.write(f"{name}.value", i)
+
+    threads = [threading.Thread(target=produce, args=(f"t{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    scheduler.tick()
+    assert writer.pending == 0
+    assert [data[f"t{n}.value"] for n in range(4)] == [999] * 4
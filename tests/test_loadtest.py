@@ -0,0 +1,44 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for loadtest.py: mix parsing, latency histograms and summaries."""
+
+from __future__ import annotations
+
+import pytest
+
+from genro_pygui.loadtest import _summary, histogram, parse_mix
+
+
+def test_parse_mix():
+    assert parse_mix("setitem=4, getitem=4,keys") == {"setitem": 4, "getitem": 4, "keys": 1}
+    assert parse_mix("call=0,keys=2,") == {"call": 0, "keys": 2}
+
+
+@pytest.mark.parametrize("text", ["delete=1", "call=0", ""])
+def test_parse_mix_rejects_bad_mixes(text):
+    with pytest.raises(ValueError):
+        parse_mix(text)
+
+
+def test_histogram_buckets_by_upper_bound():
+    latencies = [0.0001, 0.00025, 0.0003, 0.0015, 7.0]
+    assert histogram(latencies) == {"<=0.25": 2, "<=0.5": 1, "<=2": 1, ">5000": 1}
+    assert histogram([]) == {}
+
+
+def test_summary():
+    latencies = [n / 1000 for n in range(100, 0, -1)]
+    summary = _summary(latencies, errors=2, duration=2.0)
+    assert summary["count"] == 100
+    assert summary["errors"] == 2
+    assert summary["per_second"] == 50.0
+    assert summary["mean_ms"] == 50.5
+    assert (summary["p50_ms"], summary["p90_ms"], summary["p99_ms"]) == (51.0, 91.0, 100.0)
+    assert summary["max_ms"] == 100.0
+    assert sum(summary["histogram_ms"].values()) == 100
+
+
+def test_summary_of_no_calls():
+    summary = _summary([], errors=3, duration=0.0)
+    assert summary["count"] == 0
+    assert summary["per_second"] == summary["mean_ms"] == summary["max_ms"] == 0.0
+    assert summary["histogram_ms"] == {}
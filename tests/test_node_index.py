@@ -0,0 +1,111 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for node_index.py: id and widget lookups kept current from page events."""
+
+from __future__ import annotations
+
+from genro_bag import Bag
+
+from genro_pygui.node_index import NodeIndex, is_attached
+
+
+class FakeWidget:
+    def __init__(self, widget_id: str) -> None:
+        self.id = widget_id
+
+
+def make_page() -> tuple[Bag, NodeIndex]:
+    """page: box(id=box) > [inner(id=inner), plain], top(id=top)."""
+    page = Bag()
+    box = Bag()
+    box.set_item("inner", 1, id="inner")
+    box.set_item("plain", 2)
+    page.set_item("box", box, id="box")
+    page.set_item("top", 3, id="top")
+    index = NodeIndex()
+    index.rebuild(page)
+    page.subscribe("index", any=index.on_page_change)
+    return page, index
+
+
+def test_rebuild_indexes_nested_ids():
+    page, index = make_page()
+    assert len(index) == 3
+    assert index.node_by_id("inner") is page["box"].get_node("inner")
+    assert index.node_by_id("missing") is None
+
+
+def test_inserted_nodes_are_indexed_on_lookup():
+    page, index = make_page()
+    page.set_item("later", 4, id="later")
+    assert index._pending
+    assert index.node_by_id("later") is page.get_node("later")
+    assert not index._pending
+
+
+def test_node_removed_before_lookup_is_not_indexed():
+    page, index = make_page()
+    page.set_item("gone", 4, id="gone")
+    node = page.get_node("gone")
+    page.pop("gone")
+    assert not is_attached(node)
+    assert index.node_by_id("gone") is None
+
+
+def test_widget_lookups():
+    page, index = make_page()
+    node = page.get_node("top")
+    widget = FakeWidget("static_1")
+    node.compiled["widget"] = widget
+    index.widget_compiled(node, widget)
+    assert index.node_for_widget(widget) is node
+    assert index.node_for_widget("static_1") is node
+    assert index.widget_for("top") is widget
+    assert index.widget_for("static_1") is widget
+    index.widget_removed(widget)
+    assert index.node_for_widget("static_1") is None
+
+
+def test_delete_drops_the_subtree():
+    page, index = make_page()
+    page.pop("box")
+    assert index.node_by_id("box") is None
+    assert index.node_by_id("inner") is None
+    assert len(index) == 1
+
+
+def test_clear_of_a_sub_bag_drops_its_ids():
+    page, index = make_page()
+    page["box"].clear()
+    assert index.node_by_id("inner") is None
+    assert index.node_by_id("box") is not None
+
+
+def test_clear_of_the_page_drops_every_id():
+    page, index = make_page()
+    widget = FakeWidget("static_1")
+    page.get_node("top").compiled["widget"] = widget
+    index.widget_compiled(page.get_node("top"), widget)
+    page.clear()
+    assert len(index) == 0
+    assert index.node_for_widget("static_1") is None
+
+
+def test_id_attribute_change_is_reindexed():
+    page, index = make_page()
+    node = page.get_node("top")
+    node.set_attr(id="renamed")
+    assert index.node_by_id("top") is None
+    assert index.node_by_id("renamed") is node
+    node.set_attr(id=None)
+    assert index.node_by_id("renamed") is None
+    page.get_node("box").get_value(static=True).get_node("plain").set_attr(id="plain")
+    assert index.node_by_id("plain") is not None
+
+
+def test_replaced_container_value_is_reindexed():
+    page, index = make_page()
+    replacement = Bag()
+    replacement.set_item("fresh", 1, id="fresh")
+    page["box"] = replacement
+    assert index.node_by_id("inner") is None
+    assert index.node_by_id("fresh") is replacement.get_node("fresh")
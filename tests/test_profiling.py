@@ -0,0 +1,65 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for profiling.py: self times, phases, compile hooks and the env switch."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from genro_bag import Bag
+from textual.containers import Vertical
+
+from genro_pygui import TextualBuilder, profiling
+from genro_pygui.profiling import CompileProfiler
+
+
+@pytest.fixture
+def profiler() -> Iterator[CompileProfiler]:
+    yield profiling.enable()
+    profiling.disable()
+
+
+def fake_clock(monkeypatch, *ticks: float) -> None:
+    clock = iter(ticks)
+    monkeypatch.setattr(profiling.time, "perf_counter", lambda: next(clock))
+
+
+def test_children_are_excluded_from_the_parent_self_time(monkeypatch):
+    profiler = CompileProfiler()
+    fake_clock(monkeypatch, 0.0, 1.0, 2.0, 5.0, 6.0)
+    profiler.enter("vertical", "form")
+    profiler.mark("lookup")  # 1 s
+    profiler.enter("button", "form.save")
+    profiler.exit()  # 3 s nel figlio
+    profiler.exit()  # 1 s in "other" del parent
+    timings = profiler.as_dict()
+    assert timings["nodes"] == {"form": ("vertical", 2.0), "form.save": ("button", 3.0)}
+    vertical = timings["tags"]["vertical"]
+    assert (vertical["count"], vertical["lookup"], vertical["other"]) == (1, 1.0, 1.0)
+    profiler.reset()
+    assert profiler.as_dict() == {"tags": {}, "nodes": {}}
+
+
+def test_compile_is_profiled_per_tag_and_node(profiler):
+    page = Bag(builder=TextualBuilder)
+    form = page.vertical()
+    for n in range(3):
+        form.button(f"b{n}")
+    page.builder.compile(page, Vertical())
+    tags = profiler.as_dict()["tags"]
+    assert tags["vertical"]["count"] == 1
+    assert tags["button"]["count"] == 3
+    report = profiler.report(limit=2)
+    assert report.startswith("Compile profile: 4 nodes")
+    assert "Slowest nodes (self time, top 2):" in report
+
+
+def test_enable_from_env(monkeypatch):
+    monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+    first = profiling.enable_from_env()
+    assert profiling.active is first
+    # Un nuovo avvio (figlio del warm server) riparte da un profiler vuoto
+    assert profiling.enable_from_env() is not first
+    monkeypatch.delenv(profiling.PROFILE_ENV)
+    assert profiling.enable_from_env() is None
+    assert profiling.active is None
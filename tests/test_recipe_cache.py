@@ -0,0 +1,94 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for recipe_cache.py: page dumps and the on-disk recipe cache."""
+
+from __future__ import annotations
+
+import pytest
+from genro_bag import Bag
+
+from genro_pygui import TextualApp, TextualBuilder, recipe_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(recipe_cache, "CACHE_DIR", tmp_path / "recipes")
+    monkeypatch.delenv(recipe_cache.RECIPE_CACHE_ENV, raising=False)
+    return tmp_path / "recipes"
+
+
+class CachedApp(TextualApp):
+    use_recipe_cache = True
+    recipe_calls = 0
+
+    def recipe(self, root):
+        type(self).recipe_calls += 1
+        box = root.vertical(id="main", datapath="form")
+        box.input(value="^.name", id="name")
+        box.button("Save", id="save")
+
+
+class PlainApp(TextualApp):
+    def recipe(self, root):
+        root.static("hello")
+
+
+def page_rows(app: TextualApp) -> list:
+    return recipe_cache.dump_page(app.page)
+
+
+def test_dump_and_restore_round_trip():
+    page = Bag(builder=TextualBuilder)
+    box = page.vertical(id="main")
+    box.static("hello", classes="title")
+    rows = recipe_cache.dump_page(page)
+    restored = Bag(builder=TextualBuilder)
+    recipe_cache.restore_page(restored, rows, restored.builder)
+    assert recipe_cache.dump_page(restored) == rows
+    node = restored.get_node(rows[0][0])
+    assert node.tag == "vertical"
+    assert node.attr["id"] == "main"
+
+
+def test_enabled(monkeypatch):
+    assert recipe_cache.enabled(CachedApp)
+    assert not recipe_cache.enabled(PlainApp)
+    monkeypatch.setenv(recipe_cache.RECIPE_CACHE_ENV, "1")
+    assert recipe_cache.enabled(PlainApp)
+    monkeypatch.setenv(recipe_cache.RECIPE_CACHE_ENV, "0")
+    assert not recipe_cache.enabled(PlainApp)
+
+
+def test_cache_key_depends_on_the_class():
+    assert recipe_cache.cache_key(CachedApp) != recipe_cache.cache_key(PlainApp)
+    assert recipe_cache.cache_key(CachedApp) == recipe_cache.cache_key(CachedApp)
+
+
+def test_second_instance_is_built_from_the_cache(cache_dir):
+    CachedApp.recipe_calls = 0
+    first = CachedApp()
+    assert CachedApp.recipe_calls == 1
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+    second = CachedApp()
+    assert CachedApp.recipe_calls == 1
+    assert page_rows(second) == page_rows(first)
+    assert second.get_node_by_id("name").attr["value"] == "^.name"
+
+
+def test_disabled_apps_are_not_cached(cache_dir):
+    PlainApp()
+    assert not cache_dir.exists()
+
+
+def test_corrupted_file_is_rebuilt(cache_dir):
+    CachedApp.recipe_calls = 0
+    CachedApp()
+    (cache_file,) = cache_dir.glob("*.pkl")
+    cache_file.write_bytes(b"not a pickle")
+    CachedApp()
+    assert CachedApp.recipe_calls == 2
+
+
+def test_clear(cache_dir):
+    CachedApp()
+    assert recipe_cache.clear() == 1
+    assert recipe_cache.clear() == 0
@@ -0,0 +1,471 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for remote.py: RemoteServer requests, lanes and caching, mostly without a network."""
+
+from __future__ import annotations
+
+import pickle
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from genro_bag import Bag
+
+from genro_pygui import TextualApp, TextualBuilder
+from genro_pygui.recipe_cache import dump_page
+from genro_pygui.registry import find_free_port
+from genro_pygui.remote import (
+    BULK,
+    DATA_HANDLE,
+    HANDLE_IDLE_TIMEOUT,
+    INTERACTIVE,
+    MAX_PAGE_SIZE,
+    RemoteProxy,
+    RemoteRef,
+    RemoteServer,
+    _recv_framed,
+    _Request,
+    _send_framed,
+)
+
+
+class PageApp(TextualApp):
+    def recipe(self, root):
+        root.static("hello", id="hello")
+
+
+def respond(server: RemoteServer, cmd: tuple, request_id: str = "client:1") -> tuple:
+    """Serve one request through a socket pair and return the decoded response."""
+    ours, theirs = socket.socketpair()
+    with ours, theirs:
+        server._respond(_Request(theirs, server.token, cmd, [], request_id, None))
+        return pickle.loads(_recv_framed(ours))
+
+
+def queue_request(
+    server: RemoteServer, cmd: tuple, lane: str, request_id: str = "client:1"
+) -> socket.socket:
+    """Queue a request in a lane; returns the client end of its connection."""
+    ours, theirs = socket.socketpair()
+    ours.settimeout(5.0)
+    server._lanes[lane].put(_Request(theirs, server.token, cmd, [], request_id, None))
+    return ours
+
+
+def read_response(sock: socket.socket) -> tuple:
+    with sock:
+        return pickle.loads(_recv_framed(sock))
+
+
+@pytest.fixture
+def lanes() -> Iterator[RemoteServer]:
+    """A RemoteServer with its lane workers running (no listening socket)."""
+    server = RemoteServer(PageApp())
+    for requests in server._lanes.values():
+        threading.Thread(target=server._serve_lane, args=(requests,), daemon=True).start()
+    yield server
+    server.stop()
+
+
+def test_read_carries_the_version_from_before_it_ran():
+    app = PageApp()
+    server = RemoteServer(app)
+    app.data["x"] = 1
+    handle_command = server._handle_command
+
+    def racing(cmd: tuple) -> Any:
+        result = handle_command(cmd)
+        # Una scrittura del thread UI arriva mentre la lettura è in corso
+        app.data["x"] = 2
+        return result
+
+    server._handle_command = racing
+    status, value, version = respond(server, ("__getitem__", DATA_HANDLE, "x"))
+    assert (status, value) == ("ok", 1)
+    assert version < server.version
+
+
+def test_write_carries_the_version_after_it():
+    app = PageApp()
+    server = RemoteServer(app)
+    before = server.version
+    _, _, version = respond(server, ("__setitem__", DATA_HANDLE, "x", 1))
+    assert version > before
+    assert version == server.version
+
+
+def test_client_does_not_cache_a_read_older_than_its_version():
+    proxy = RemoteProxy(cache=True)
+    responses = iter([(7, "new"), (6, "old"), (7, "fresh")])
+
+    def send(cmd: tuple, lane: str | None = None) -> Any:
+        version, result = next(responses)
+        proxy._response.version = version
+        proxy._seen(version)
+        return result
+
+    proxy._send = send
+    assert proxy._read(("__getitem__", DATA_HANDLE, "a")) == "new"
+    assert proxy._read(("__getitem__", DATA_HANDLE, "b")) == "old"
+    assert proxy._version == 7
+    assert proxy._read(("__getitem__", DATA_HANDLE, "b")) == "fresh"
+    assert proxy._read(("__getitem__", DATA_HANDLE, "a")) == "new"
+    assert proxy.cache_stats["hits"] == 1
+
+
+def test_close_empties_the_read_cache():
+    proxy = RemoteProxy(cache=True)
+    proxy._cache[("__getitem__", DATA_HANDLE, "a")] = (1, "value")
+    proxy.close()
+    assert proxy._cache == {}
+
+
+def test_expired_request_is_dropped_before_running():
+    server = RemoteServer(PageApp())
+    calls = []
+    server._handle_command = calls.append
+    ours, theirs = socket.socketpair()
+    with ours, theirs:
+        expired = _Request(theirs, server.token, ("__len__", None), [], "client:1", 0.0)
+        server._respond(expired)
+        assert pickle.loads(_recv_framed(ours)) == ("error", "deadline exceeded")
+    assert calls == []
+    assert server.dropped == 1
+
+
+def test_cancelled_request_is_dropped():
+    server = RemoteServer(PageApp())
+    server._handle_command(("__cancel__", ["client:2"]))
+    assert respond(server, ("__len__", None), "client:2") == ("error", "cancelled")
+    assert respond(server, ("__len__", None), "client:3")[:2] == ("ok", 1)
+    assert server.dropped == 1
+
+
+def test_interactive_lane_does_not_wait_behind_bulk(lanes):
+    release = threading.Event()
+
+    def handle(cmd: tuple) -> Any:
+        if cmd[0] == "slow":
+            release.wait(5.0)
+        return cmd[0]
+
+    lanes._handle_command = handle
+    bulk = queue_request(lanes, ("slow",), BULK)
+    interactive = queue_request(lanes, ("fast",), INTERACTIVE)
+    assert read_response(interactive)[:2] == ("ok", "fast")
+    assert not release.is_set()
+    release.set()
+    assert read_response(bulk)[:2] == ("ok", "slow")
+
+
+def test_requests_of_a_lane_are_served_in_order(lanes):
+    served = []
+    lanes._handle_command = lambda cmd: served.append(cmd[1])
+    socks = [queue_request(lanes, ("call", n), BULK) for n in range(5)]
+    for sock in socks:
+        read_response(sock)
+    assert served == [0, 1, 2, 3, 4]
+
+
+def test_slow_client_does_not_hold_back_other_requests():
+    app = PageApp()
+    app.data["x"] = 1
+    port = find_free_port()
+    server = RemoteServer(app, port)
+    server.start()
+    slow = None
+    try:
+        deadline = time.monotonic() + 5.0
+        while slow is None:
+            try:
+                slow = socket.create_connection(("localhost", port))
+            except ConnectionRefusedError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
+        # Mezzo header: il reader di questa connessione resta in attesa
+        slow.sendall(b"\0\0")
+        proxy = RemoteProxy(port=port, token=server.token, timeout=2.0)
+        started = time.monotonic()
+        assert proxy.data["x"] == 1
+        assert time.monotonic() - started < 1.0
+    finally:
+        if slow is not None:
+            slow.close()
+        server.stop()
+
+
+class DroppingPool:
+    """Pool whose reused connection is closed after reading one request."""
+
+    def __init__(self) -> None:
+        self.received: list[tuple] = []
+        self.fresh = 0
+
+    def _serve(self, sock: socket.socket, answer: bool) -> None:
+        with sock:
+            token, cmd, released, meta = pickle.loads(_recv_framed(sock))
+            self.received.append(cmd)
+            if answer:
+                _send_framed(sock, pickle.dumps(("ok", 3, 1)))
+
+    def acquire(self, host: str, port: int, timeout: float | None) -> tuple[socket.socket, bool]:
+        ours, theirs = socket.socketpair()
+        reused = not self.received and not self.fresh
+        if not reused:
+            self.fresh += 1
+        # La connessione riusata legge la richiesta e si chiude senza rispondere
+        threading.Thread(target=self._serve, args=(theirs, not reused), daemon=True).start()
+        ours.settimeout(timeout)
+        return ours, reused
+
+    def release(self, host: str, port: int, sock: socket.socket) -> None:
+        sock.close()
+
+
+def test_read_is_retried_on_a_closed_reused_connection():
+    pool = DroppingPool()
+    proxy = RemoteProxy(timeout=2.0, pool=pool)
+    assert len(proxy.page) == 3
+    assert [cmd[0] for cmd in pool.received] == ["__len__", "__len__"]
+
+
+def test_write_is_not_retried_on_a_closed_reused_connection():
+    pool = DroppingPool()
+    proxy = RemoteProxy(timeout=2.0, pool=pool)
+    with pytest.raises(ConnectionError):
+        proxy.page["x"] = 1
+    assert [cmd[0] for cmd in pool.received] == ["__setitem__"]
+    assert pool.fresh == 0
+
+
+def test_read_carrying_releases_is_not_retried():
+    pool = DroppingPool()
+    proxy = RemoteProxy(timeout=2.0, pool=pool)
+    proxy._released.append(7)
+    with pytest.raises(ConnectionError):
+        len(proxy.page)
+    assert len(pool.received) == 1
+
+
+def data_server() -> tuple[PageApp, RemoteServer]:
+    app = PageApp()
+    app.data["ordini.uno.totale"] = 10
+    app.data["ordini.due.totale"] = 20
+    return app, RemoteServer(app)
+
+
+def test_page_and_data_are_not_exported_as_handles():
+    app, server = data_server()
+    assert server._export(app.page, "a") == RemoteRef(None, "bag")
+    assert server._export(app.data, "a") == RemoteRef(DATA_HANDLE, "bag")
+    assert server._export(3, "a") == 3
+    assert server.handle_count == 0
+
+
+def test_handle_is_freed_after_the_last_reference():
+    app, server = data_server()
+    ordini = app.data["ordini"]
+    ref = server._export(ordini, "a")
+    assert server._export(ordini, "a") == ref
+    assert server._export(app.data.get_node("ordini"), "a").kind == "node"
+    server._release([ref.handle], "a")
+    assert server._target(ref.handle) is ordini
+    server._release([ref.handle], "a")
+    assert server.handle_count == 1
+    with pytest.raises(ValueError, match="released"):
+        server._target(ref.handle)
+
+
+def test_references_are_scoped_to_their_client():
+    app, server = data_server()
+    ref = server._export(app.data["ordini"], "a")
+    server._export(app.data["ordini"], "b")
+    # b non può rilasciare due volte, né rilasciare i riferimenti di a
+    server._release([ref.handle, ref.handle], "b")
+    server._release([ref.handle], "c")
+    assert server.handle_count == 1
+    assert server._handles[ref.handle][1] == {"a": 1}
+    server._release([ref.handle], "a")
+    assert server.handle_count == 0
+    assert server._client_handles == {}
+    assert server._client_seen == {}
+
+
+def test_release_client_drops_all_its_references():
+    app, server = data_server()
+    server._export(app.data["ordini.uno"], "a")
+    server._export(app.data["ordini.uno"], "a")
+    server._export(app.data["ordini.due"], "a")
+    shared = server._export(app.data["ordini.due"], "b")
+    assert server.release_client("a") == 2
+    assert server.handle_count == 1
+    assert server._target(shared.handle) is app.data["ordini.due"]
+    assert server.release_client("a") == 0
+
+
+def test_close_command_releases_the_client():
+    app, server = data_server()
+    _, ref, _ = respond(server, ("__getitem__", DATA_HANDLE, "ordini"), "a:1")
+    assert isinstance(ref, RemoteRef)
+    assert respond(server, ("__close__",), "a:2")[:2] == ("ok", 1)
+    assert server.handle_count == 0
+
+
+def test_idle_clients_are_reclaimed():
+    app, server = data_server()
+    server._export(app.data["ordini.uno"], "idle")
+    server._export(app.data["ordini.due"], "busy")
+    now = time.monotonic()
+    server._client_seen["idle"] = now - HANDLE_IDLE_TIMEOUT - 1
+    server._expire_clients(now)
+    assert set(server._client_handles) == {"busy"}
+    assert server.handle_count == 1
+
+
+def test_unsent_reference_is_released():
+    app, server = data_server()
+    ours, theirs = socket.socketpair()
+    ours.close()
+    with theirs:
+        request = _Request(
+            theirs, server.token, ("__getitem__", DATA_HANDLE, "ordini"), [], "a:1", None
+        )
+        server._respond(request)
+    assert server.handle_count == 0
+
+
+def numbered(count: int) -> Bag:
+    bag = Bag()
+    for n in range(count):
+        bag[f"n{n}"] = n
+    return bag
+
+
+def page_labels(server: RemoteServer, bag: Bag, cursor: Any, limit: int) -> tuple[list, Any]:
+    nodes, cursor = server._page_of(bag, cursor, limit)
+    return [node.label for node in nodes], cursor
+
+
+def test_pages_cover_the_bag_once():
+    server = RemoteServer(PageApp())
+    bag = numbered(2500)
+    labels, cursor, pages = [], None, 0
+    while True:
+        page, cursor = page_labels(server, bag, cursor, 5000)
+        labels.extend(page)
+        pages += 1
+        if cursor is None:
+            break
+    assert labels == [f"n{n}" for n in range(2500)]
+    assert pages == -(-2500 // MAX_PAGE_SIZE)
+
+
+def test_cursor_survives_an_insert_before_it():
+    server = RemoteServer(PageApp())
+    bag = numbered(10)
+    first, cursor = page_labels(server, bag, None, 4)
+    bag.set_item("new", -1, node_position="<")
+    second, _ = page_labels(server, bag, cursor, 10)
+    assert first == ["n0", "n1", "n2", "n3"]
+    assert second == ["n4", "n5", "n6", "n7", "n8", "n9"]
+
+
+def test_cursor_survives_a_delete_before_it():
+    server = RemoteServer(PageApp())
+    bag = numbered(10)
+    _, cursor = page_labels(server, bag, None, 4)
+    bag.del_item("n1")
+    second, _ = page_labels(server, bag, cursor, 10)
+    assert second == ["n4", "n5", "n6", "n7", "n8", "n9"]
+
+
+def test_cursor_survives_the_delete_of_its_last_node():
+    server = RemoteServer(PageApp())
+    bag = numbered(10)
+    _, cursor = page_labels(server, bag, None, 4)
+    bag.del_item("n3")
+    second, _ = page_labels(server, bag, cursor, 10)
+    assert second == ["n4", "n5", "n6", "n7", "n8", "n9"]
+
+
+def test_cursor_survives_the_delete_of_the_next_node():
+    server = RemoteServer(PageApp())
+    bag = numbered(10)
+    _, cursor = page_labels(server, bag, None, 4)
+    bag.del_item("n4")
+    bag.set_item("new", -1, node_position="<")
+    second, _ = page_labels(server, bag, cursor, 10)
+    assert second == ["n5", "n6", "n7", "n8", "n9"]
+
+
+def test_cursor_after_deletes_before_it():
+    server = RemoteServer(PageApp())
+    bag = numbered(10)
+    _, cursor = page_labels(server, bag, None, 8)
+    for n in range(8):
+        bag.del_item(f"n{n}")
+    assert page_labels(server, bag, cursor, 10) == (["n8", "n9"], None)
+    bag.clear()
+    assert page_labels(server, bag, cursor, 10) == ([], None)
+
+
+def test_iter_commands_page_through_a_path():
+    app, server = data_server()
+    for n in range(5):
+        app.data[f"ordini.extra{n}"] = n
+    _, (labels, cursor), _ = respond(server, ("__iter_keys__", DATA_HANDLE, "ordini", None, 3))
+    assert labels == ["uno", "due", "extra0"]
+    _, (nodes, cursor), _ = respond(server, ("__iter_nodes__", DATA_HANDLE, "ordini", cursor, 3))
+    assert [node.label for node in nodes] == ["extra1", "extra2", "extra3"]
+    _, (labels, cursor), _ = respond(server, ("__iter_keys__", DATA_HANDLE, "ordini", cursor, 3))
+    assert (labels, cursor) == (["extra4"], None)
+    _, (nodes, _), _ = respond(server, ("__iter_nodes__", DATA_HANDLE, "", None, 10))
+    assert nodes[0].children == 7
+    assert nodes[0].value is None
+
+
+class FormApp(TextualApp):
+    def recipe(self, root):
+        root.vertical(id="form")
+        root.static("note", id="note")
+
+
+def local_subtree() -> Bag:
+    bag = Bag(builder=TextualBuilder)
+    row = bag.horizontal()
+    row.input(value="^.nome")
+    row.button("Save", id="save")
+    return bag
+
+
+def test_attach_grafts_a_locally_built_subtree():
+    app = FormApp()
+    server = RemoteServer(app)
+    status, labels, _ = respond(server, ("__attach__", None, "#form", dump_page(local_subtree())))
+    assert status == "ok"
+    form = app.get_node_by_id("form").value
+    assert list(form.keys()) == labels
+    row = form.get_node(labels[0])
+    assert row.tag == "horizontal"
+    assert [node.tag for node in row.value] == ["input", "button"]
+    assert app.get_node_by_id("save") is row.value.nodes[1]
+
+
+def test_attach_renames_labels_already_taken():
+    app = FormApp()
+    server = RemoteServer(app)
+    rows = dump_page(local_subtree())
+    first = respond(server, ("__attach__", None, "#form", rows))[1]
+    second = respond(server, ("__attach__", None, "#form", rows))[1]
+    assert first != second
+    assert list(app.get_node_by_id("form").value.keys()) == first + second
+
+
+def test_attach_to_a_leaf_is_an_error():
+    server = RemoteServer(FormApp())
+    status, message = respond(server, ("__attach__", None, "#note", dump_page(local_subtree())))
+    assert status == "error"
+    assert "not a container" in message
@@ -0,0 +1,122 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for resolver_pool.py: TTL cache, shared evaluations and the worker bound."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+from genro_bag import Bag
+from genro_bag.resolvers import BagCbResolver
+
+from genro_pygui.resolver_pool import ResolverPool
+
+WAIT = 5.0
+
+
+class Counter:
+    """Resolver callback counting its calls; blocks while gate is closed."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.gate.wait(WAIT)
+        with self._lock:
+            self.running -= 1
+        return self.calls
+
+
+def resolved(pool: ResolverPool, bag: Bag, path: str) -> object:
+    """Read path through the pool, waiting for the evaluation if needed."""
+    done = threading.Event()
+    ready, value = pool.read(bag, path, lambda node, value, error: done.set())
+    if ready:
+        return value
+    assert done.wait(WAIT)
+    ready, value = pool.read(bag, path)
+    assert ready
+    return value
+
+
+@pytest.fixture
+def pool() -> Iterator[ResolverPool]:
+    pool = ResolverPool(max_workers=2, ttl=0.2)
+    yield pool
+    pool.shutdown()
+
+
+def test_max_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        ResolverPool(max_workers=0)
+
+
+def test_values_are_cached_for_the_ttl(pool):
+    counter = Counter()
+    bag = Bag()
+    bag["report.totale"] = BagCbResolver(counter, read_only=True)
+    assert pool.read(bag, "report.totale") == (False, None)
+    assert resolved(pool, bag, "report.totale") == 1
+    assert pool.read(bag, "report.totale") == (True, 1)
+    time.sleep(0.3)
+    assert resolved(pool, bag, "report.totale") == 2
+    stats = pool.stats()
+    assert stats["evaluations"] == 2
+    assert stats["hits"] >= 2
+
+
+def test_resolver_cache_time_overrides_the_ttl(pool):
+    counter = Counter()
+    bag = Bag()
+    bag["forever"] = BagCbResolver(counter, cache_time=-1)
+    assert resolved(pool, bag, "forever") == 1
+    time.sleep(0.3)
+    assert pool.read(bag, "forever") == (True, 1)
+
+
+def test_watched_change_invalidates_the_cache(pool):
+    counter = Counter()
+    bag = Bag()
+    bag["value"] = BagCbResolver(counter, read_only=True)
+    pool.watch(bag)
+    pool.ttl = 60.0
+    assert resolved(pool, bag, "value") == 1
+    bag.set_attr("value", color="red")
+    assert pool.read(bag, "value") == (False, None)
+    pool.unwatch(bag)
+
+
+def test_evaluations_are_shared_and_bounded(pool):
+    counter = Counter()
+    counter.gate.clear()
+    bag = Bag()
+    for n in range(5):
+        bag[f"n{n}"] = BagCbResolver(counter, read_only=True)
+    arrived = []
+    for _ in range(3):
+        # Richieste ripetute dello stesso nodo: una sola valutazione
+        pool.read(bag, "n0", lambda node, value, error: arrived.append(value))
+    for n in range(1, 5):
+        pool.read(bag, f"n{n}")
+    deadline = time.monotonic() + WAIT
+    while counter.running < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert counter.running == 2
+    counter.gate.set()
+    while pool.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert counter.calls == 5
+    assert counter.max_running == 2
+    assert len(arrived) == 3 and len(set(arrived)) == 1
@@ -0,0 +1,134 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for scheduler.py: coalescing, discards, stop() and frame stats."""
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+from typing import Any, NamedTuple
+
+import pytest
+
+from genro_pygui.scheduler import UpdateScheduler
+
+
+class FakeBinding(NamedTuple):
+    widget: object
+    prop: str
+
+
+class FakeBinder:
+    """Records the bindings applied by the scheduler."""
+
+    def __init__(self) -> None:
+        self.applied: list[FakeBinding] = []
+
+    def apply(self, binding: FakeBinding) -> None:
+        self.applied.append(binding)
+
+
+class FakeTimer:
+    stopped = False
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+class FakeApp:
+    """The parts of a Textual app used by the scheduler."""
+
+    def __init__(self) -> None:
+        self.timer = FakeTimer()
+
+    def set_interval(self, interval: float, callback: Any, name: str) -> FakeTimer:
+        return self.timer
+
+    def batch_update(self) -> nullcontext:
+        return nullcontext()
+
+
+def make_scheduler(refresh_rate: float = 60.0) -> tuple[FakeBinder, UpdateScheduler]:
+    binder = FakeBinder()
+    return binder, UpdateScheduler(binder, refresh_rate)
+
+
+def test_refresh_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        make_scheduler(refresh_rate=0)
+
+
+def test_repeated_marks_are_coalesced():
+    binder, scheduler = make_scheduler()
+    widget = object()
+    for _ in range(3):
+        scheduler.mark(FakeBinding(widget, "value"))
+    scheduler.mark(FakeBinding(widget, "disabled"))
+    assert scheduler.flush() == 2
+    assert [binding.prop for binding in binder.applied] == ["value", "disabled"]
+    assert scheduler.stats() == {
+        "requested": 4,
+        "applied": 2,
+        "coalesced": 2,
+        "discarded": 0,
+        "pending": 0,
+        "flushes": 1,
+    }
+    assert scheduler.flush() == 0
+
+
+def test_discarded_updates_are_not_counted_as_coalesced():
+    binder, scheduler = make_scheduler()
+    kept, destroyed = object(), object()
+    scheduler.mark(FakeBinding(kept, "value"))
+    scheduler.mark(FakeBinding(destroyed, "value"))
+    scheduler.mark(FakeBinding(destroyed, "disabled"))
+    scheduler.discard(destroyed)
+    scheduler.flush()
+    assert binder.applied == [FakeBinding(kept, "value")]
+    stats = scheduler.stats()
+    assert stats["discarded"] == 2
+    assert stats["coalesced"] == 0
+
+
+def test_tick_drains_the_sources_before_flushing():
+    binder, scheduler = make_scheduler()
+    binding = FakeBinding(object(), "value")
+
+    def source() -> None:
+        scheduler.mark(binding)
+
+    scheduler.add_source(source)
+    scheduler.tick()
+    assert binder.applied == [binding]
+    scheduler.remove_source(source)
+    scheduler.tick()
+    assert binder.applied == [binding]
+    assert scheduler.frame_stats()["frames"] == 2
+
+
+def test_stop_flushes_what_is_pending():
+    binder, scheduler = make_scheduler()
+    app = FakeApp()
+    scheduler.start(app)
+    assert scheduler.running
+    scheduler.mark(FakeBinding(object(), "value"))
+    scheduler.stop()
+    assert not scheduler.running
+    assert app.timer.stopped
+    assert len(binder.applied) == 1
+
+
+def test_frame_stats_measure_duration_and_lag():
+    _, scheduler = make_scheduler(refresh_rate=10.0)
+    scheduler._record_frame(0.0, 0.002)
+    # Atteso a 0.1 s, parte a 0.15 s: 50 ms di ritardo, meno di un intervallo
+    scheduler._record_frame(0.15, 0.151)
+    # Parte a 0.5 s invece di 0.25 s: in ritardo di più di un frame
+    scheduler._record_frame(0.5, 0.501)
+    stats = scheduler.frame_stats()
+    assert stats["frames"] == 3
+    assert stats["frame_ms_max"] == 2.0
+    assert stats["lag_ms_max"] == 250.0
+    assert stats["lag_ms_avg"] == 150.0
+    assert stats["late_frames"] == 1
+    scheduler.reset_stats()
+    assert scheduler.frame_stats()["frames"] == 0
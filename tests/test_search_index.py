@@ -0,0 +1,91 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for search_index.py: matching rules and incremental maintenance."""
+
+from __future__ import annotations
+
+from genro_bag import Bag
+
+from genro_pygui.search_index import BagSearchIndex, tokenize
+
+
+def make_index() -> tuple[Bag, BagSearchIndex]:
+    bag = Bag()
+    bag.set_item("clienti.c1", "Mario Rossi", city="Milano")
+    bag.set_item("clienti.c2", "Anna Bianchi", city="Roma")
+    bag.set_item("fornitori.f1", "Rossi Forniture", city="Torino")
+    index = BagSearchIndex(bag)
+    index.build()
+    return bag, index
+
+
+def labels(index: BagSearchIndex, query: str) -> list[str]:
+    return [index.path(node) for node in index.search(query)]
+
+
+def test_tokenize():
+    assert tokenize("Mario ROSSI, via Roma 3") == ["mario", "rossi", "via", "roma", "3"]
+
+
+def test_build_indexes_every_node():
+    _, index = make_index()
+    assert index.ready.is_set()
+    assert len(index) == 5
+
+
+def test_substring_and_prefix_terms():
+    _, index = make_index()
+    assert labels(index, "ossi") == ["clienti.c1", "fornitori.f1"]
+    assert labels(index, "mi") == ["clienti.c1"]
+
+
+def test_attribute_values_are_searchable():
+    _, index = make_index()
+    assert labels(index, "torino") == ["fornitori.f1"]
+
+
+def test_terms_can_be_matched_by_ancestors():
+    _, index = make_index()
+    assert labels(index, "clienti rossi") == ["clienti.c1"]
+    assert labels(index, "fornitori bianchi") == []
+
+
+def test_empty_query_matches_nothing():
+    _, index = make_index()
+    assert labels(index, "  ") == []
+
+
+def test_inserted_and_updated_nodes():
+    bag, index = make_index()
+    bag.set_item("clienti.c3", "Luca Verdi")
+    assert labels(index, "verdi") == ["clienti.c3"]
+    bag["clienti.c3"] = "Luca Neri"
+    assert labels(index, "verdi") == []
+    assert labels(index, "neri") == ["clienti.c3"]
+
+
+def test_deleted_subtree_is_dropped():
+    bag, index = make_index()
+    bag.pop("clienti")
+    assert labels(index, "mario") == []
+    assert len(index) == 2
+
+
+def test_clear_of_a_sub_bag_drops_its_nodes():
+    bag, index = make_index()
+    bag["clienti"].clear()
+    assert labels(index, "rossi") == ["fornitori.f1"]
+    assert len(index) == 3
+
+
+def test_clear_of_the_root_empties_the_index():
+    bag, index = make_index()
+    bag.clear()
+    assert len(index) == 0
+    assert labels(index, "rossi") == []
+
+
+def test_close_stops_following_the_bag():
+    bag, index = make_index()
+    index.close()
+    bag.set_item("altro", "Rossi")
+    assert labels(index, "rossi") == ["clienti.c1", "fornitori.f1"]
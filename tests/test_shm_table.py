@@ -0,0 +1,74 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for shm_table.py: columnar tables in shared memory."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+
+from genro_pygui.shm_table import open_table, read_table, write_table
+
+
+@contextmanager
+def shared(columns: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Write columns in a block, yield its descriptor, then free the block."""
+    shm, descriptor = write_table(columns)
+    try:
+        yield descriptor
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_round_trip_of_every_column_kind():
+    columns = {
+        "id": [1, 2, 3],
+        "price": [1.5, 2, 3.25],
+        "name": ["uno", None, "tré"],
+        "qty": array("i", [7, 8, 9]),
+    }
+    with shared(columns) as descriptor:
+        labels, values = read_table(descriptor)
+    assert labels == ["id", "price", "name", "qty"]
+    assert values == [[1, 2, 3], [1.5, 2.0, 3.25], ["uno", "", "tré"], [7, 8, 9]]
+
+
+def test_descriptor_layout():
+    with shared({"id": [1, 2], "name": ["a", "b"]}) as descriptor:
+        assert descriptor["rows"] == 2
+        formats = [spec["format"] for spec in descriptor["columns"]]
+        assert formats == ["q", "s"]
+        assert all(spec["offset"] % 8 == 0 for spec in descriptor["columns"])
+
+
+def test_open_table_maps_numeric_columns():
+    with shared({"id": list(range(100)), "name": ["x"] * 100}) as descriptor:
+        with open_table(descriptor) as (labels, columns):
+            assert isinstance(columns[0], memoryview)
+            assert list(zip(*columns))[42] == (42, "x")
+
+
+def test_empty_table():
+    with shared({"id": [], "name": []}) as descriptor:
+        assert read_table(descriptor) == (["id", "name"], [[], []])
+
+
+def test_columns_must_have_the_same_length():
+    with pytest.raises(ValueError, match="rows"):
+        write_table({"a": [1, 2], "b": [1]})
+
+
+def test_table_needs_a_column():
+    with pytest.raises(ValueError):
+        write_table({})
+
+
+def test_descriptor_larger_than_the_block_is_rejected():
+    with shared({"id": [1]}) as descriptor:
+        with pytest.raises(ValueError, match="too small"):
+            with open_table({**descriptor, "size": 1 << 20}):
+                pass
@@ -0,0 +1,200 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for textual_builder.py: widget ids, keyed reconciliation and the widget pool."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from genro_bag import Bag
+from textual.pilot import Pilot
+
+from genro_pygui import TextualApp, TextualBuilder
+from genro_pygui.textual_app import TextualWrapperApp
+
+
+class ListApp(TextualApp):
+    """A box with one button per item, keyed by the item."""
+
+    items: list[str] = ["a", "b", "c"]
+    classes: dict[str, str] = {}
+
+    def recipe(self, root):
+        box = root.vertical(id="box")
+        for item in self.items:
+            box.button(item, _key=item, classes=self.classes.get(item, "item"))
+
+
+def run_app(app: TextualApp, scenario: Callable[[Pilot], Awaitable[Any]]) -> Any:
+    """Run app headless and return what scenario(pilot) returns."""
+
+    async def main() -> Any:
+        textual_app = TextualWrapperApp(app)
+        app._textual_app = textual_app
+        async with textual_app.run_test() as pilot:
+            await pilot.pause()
+            return await scenario(pilot)
+
+    return asyncio.run(main())
+
+
+def shown(app: TextualApp) -> list:
+    """The box's children that are displayed (parked widgets are hidden)."""
+    return [widget for widget in app.get_widget("box").children if widget.display]
+
+
+def build_form() -> Bag:
+    page = Bag(builder=TextualBuilder)
+    form = page.vertical()
+    for n in range(200):
+        form.input(value=f"^.field{n}")
+    form.button("Save")
+    return page
+
+
+def all_nodes(bag: Bag) -> list:
+    nodes = []
+    for node in bag:
+        nodes.append(node)
+        value = node.get_value(static=True)
+        if isinstance(value, Bag):
+            nodes.extend(all_nodes(value))
+    return nodes
+
+
+def test_widget_ids_depend_only_on_the_page_path():
+    first, second = build_form(), build_form()
+    first_ids = [first.builder.widget_id(node) for node in all_nodes(first)]
+    second_ids = [second.builder.widget_id(node) for node in all_nodes(second)]
+    assert first_ids == second_ids
+    assert first_ids[0].startswith("vertical_")
+    assert first_ids[-1].startswith("button_")
+
+
+def test_sibling_widget_ids_do_not_collide():
+    page = build_form()
+    ids = [page.builder.widget_id(node) for node in all_nodes(page)]
+    assert len(set(ids)) == len(ids) == 202
+
+
+def test_widget_id_is_kept_by_a_recompiled_node():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        builder = app.page.builder
+        node = app.get_node_by_id("box").value.nodes[1]
+        widget = app.get_widget(node)
+        builder.recompile(node, app._textual_app.root)
+        await pilot.pause()
+        await pilot.pause()
+        recompiled = app.get_widget(node)
+        assert recompiled is not widget
+        assert recompiled.id == widget.id
+        assert app.get_node_for_widget(recompiled.id) is node
+
+    run_app(app, scenario)
+
+
+def test_generation_suffix_only_while_the_old_widget_retires():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        builder = app.page.builder
+        node = app.get_node_by_id("box").value.nodes[0]
+        base_id = app.get_widget(node).id
+        removing = builder.cleanup_node(node)
+        # Il vecchio widget è ancora nel DOM: l'id nuovo non deve collidere
+        assert builder.widget_id(node) == f"{base_id}-1"
+        await removing
+        await pilot.pause()
+        assert builder.widget_id(node) == base_id
+
+    run_app(app, scenario)
+
+
+def test_keyed_reorder_moves_the_existing_widgets():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        a, b, c = shown(app)
+        app.items = ["c", "a", "b"]
+        app.reload_recipe()
+        await pilot.pause()
+        assert shown(app) == [c, a, b]
+        assert app.page.builder.pool_stats["parked"] == 0
+
+    run_app(app, scenario)
+
+
+def test_changed_attribute_is_updated_in_place():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        a, b, c = shown(app)
+        app.classes = {"b": "selected"}
+        assert app.reload_recipe() == 1
+        await pilot.pause()
+        assert shown(app) == [a, b, c]
+        assert b.has_class("selected")
+        assert not b.has_class("item")
+
+    run_app(app, scenario)
+
+
+def test_removed_widget_is_parked_and_reused():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        a, b, c = shown(app)
+        app.items = ["a", "c"]
+        app.reload_recipe()
+        await pilot.pause()
+        assert shown(app) == [a, c]
+        assert not b.display
+        app.items = ["a", "c", "d"]
+        app.reload_recipe()
+        await pilot.pause()
+        # Il widget parcheggiato di b diventa quello di d
+        assert shown(app) == [a, c, b]
+        assert app.page.builder.pool_stats == {"parked": 1, "reused": 1, "expired": 0}
+
+    run_app(app, scenario)
+
+
+def test_expire_pool_removes_parked_widgets():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        a, b, c = shown(app)
+        app.items = ["a"]
+        app.reload_recipe()
+        await pilot.pause()
+        builder = app.page.builder
+        assert builder.expire_pool() == 0
+        assert builder.expire_pool(max_age=0.0) == 2
+        await pilot.pause()
+        assert list(app.get_widget("box").children) == [a]
+        assert builder._pool == {}
+        assert builder.pool_stats["expired"] == 2
+
+    run_app(app, scenario)
+
+
+def test_parked_widgets_go_with_their_parent():
+    app = ListApp()
+
+    async def scenario(pilot: Pilot) -> None:
+        box = app.get_widget("box")
+        app.items = ["a"]
+        app.reload_recipe()
+        await pilot.pause()
+        builder = app.page.builder
+        assert [key[0] for key in builder._pool] == [box]
+        # Il parent rimosso porta con sé i suoi widget parcheggiati
+        app.page.del_item(app.page.keys()[0])
+        await pilot.pause()
+        assert builder._pool == {}
+        assert not box.is_attached
+
+    run_app(app, scenario)
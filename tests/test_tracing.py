@@ -0,0 +1,93 @@
+# Copyright 2025 Softwell S.r.l. - SPDX-License-Identifier: Apache-2.0
+"""Tests for tracing.py: spans, trace context, flows and the trace-event document."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from genro_pygui import tracing
+from genro_pygui.tracing import Tracer
+
+
+def spans(tracer: Tracer) -> list[dict]:
+    return [event for event in tracer.events() if event["ph"] == "X"]
+
+
+def test_command_name():
+    assert tracing.command_name(("__call__", 3, "set_item", (), {})) == "call set_item"
+    assert tracing.command_name(("__setitem__", None, "x", 1)) == "setitem"
+
+
+def test_spans_carry_the_trace_of_their_context():
+    tracer = Tracer()
+    tracer.complete("untraced", "ui", 10.0, 5.0)
+    with tracer.context("c:1"):
+        with tracer.span("serve keys", "server", lane="bulk"):
+            pass
+        with tracer.context(("c:2", "c:3")):
+            tracer.complete("frame", "ui", 0.0, 1.0)
+        assert tracer.current == "c:1"
+    assert tracer.current is None
+    untraced, serve, frame = spans(tracer)
+    assert untraced["args"] == {} and untraced["dur"] == 0.0
+    assert serve["args"] == {"lane": "bulk", "trace": "c:1"}
+    assert frame["args"] == {"trace": ["c:2", "c:3"]}
+
+
+def test_thread_names_are_recorded_once_per_trace():
+    tracer = Tracer()
+
+    def record() -> None:
+        tracer.complete("a", "ui", 0.0, 1.0)
+        tracer.complete("b", "ui", 1.0, 2.0)
+
+    worker = threading.Thread(target=record, name="lane-bulk")
+    worker.start()
+    worker.join()
+    names = [event for event in tracer.events() if event["ph"] == "M"]
+    assert [event["args"]["name"] for event in names] == ["lane-bulk"]
+    assert len(tracer.events(reset=True)) == 3
+    tracer.flow("c:1", 5.0, start=False)
+    # Dopo il reset il thread viene dichiarato di nuovo
+    assert [event["ph"] for event in tracer.events()] == ["M", "f"]
+    assert tracer.events()[1]["bp"] == "e"
+
+
+def test_oldest_events_are_dropped():
+    tracer = Tracer(maxlen=3)
+    for n in range(5):
+        tracer.complete(f"s{n}", "ui", n, n + 1)
+    assert [event["name"] for event in tracer.events()] == ["s2", "s3", "s4"]
+
+
+def test_dump_merges_the_events_of_other_processes(tmp_path):
+    client, app = Tracer(), Tracer()
+    client.flow("c:1", 1.0, start=True)
+    app.flow("c:1", 2.0, start=False)
+    path = tmp_path / "trace.json"
+    client.dump(path, app.events())
+    document = json.loads(path.read_text())
+    assert document["displayTimeUnit"] == "ms"
+    flows = [event for event in document["traceEvents"] if event["ph"] in "sf"]
+    assert [(event["ph"], event["id"]) for event in flows] == [("s", "c:1"), ("f", "c:1")]
+
+
+def test_module_span_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(tracing, "active", None)
+    with tracing.span("frame", "ui"):
+        pass
+    tracer = tracing.enable()
+    try:
+        with tracing.span("frame", "ui"):
+            pass
+        assert [event["name"] for event in spans(tracer)] == ["frame"]
+    finally:
+        tracing.disable()
+
+
+def test_take_pending_empties_the_set():
+    tracer = Tracer()
+    tracer.pending.update({"c:2", "c:1"})
+    assert tracer.take_pending() == ("c:1", "c:2")
+    assert tracer.take_pending() == ()